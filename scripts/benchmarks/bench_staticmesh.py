@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmark StaticMesh parser throughput, one stage at a time.
+
+Loads a fixed set of StaticMesh exports once (synthetic fixtures or real .usx
+packages), then times three stages separately over the whole set:
+
+    find_none_terminator  property block scan
+    parse_staticmesh      full parse (bounds, LOD headers, vertices, indices)
+    mesh_to_gltf          ParsedMesh -> one self-contained .gltf, the geometry
+                          buffer embedded as a base64 data URI (temp dir; no
+                          by_hash store, so no separate .bin writes)
+
+Each stage reports meshes/sec, MB/sec (export bytes for the parse stages,
+written .gltf bytes, base64 included, for export) and the process peak RSS after the
+stage. Peak RSS is a high-water mark, so it only grows from stage to stage.
+Results are saved as JSON; --compare prints the change against a saved run.
+
+Usage:
+    python bench_staticmesh.py --synthetic
+    python bench_staticmesh.py --synthetic --count 200 --repeat 5 --json base.json
+    python bench_staticmesh.py --assets /path/to/Meshes --limit 20 --json real.json
+    python bench_staticmesh.py --synthetic --json new.json --compare base.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import struct
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add project root to path (go up 2 levels from scripts/benchmarks)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "extractors"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from staticmesh_construct import find_none_terminator, parse_staticmesh
+from staticmesh_pipeline import ParsedMesh, lod_geometry, mesh_to_gltf
+
+STAGES = ("find_none_terminator", "parse_staticmesh", "mesh_to_gltf")
+
+SYNTHETIC_NAMES = ["None", "LightMapCoordinateIndex", "Scale", "bCollision", "Flags"]
+SYNTHETIC_VERSION = 60482
+# Serial offsets at or above this keep the absolute LOD pointer from matching
+# small ints elsewhere in the export.
+SYNTHETIC_BASE_OFFSET = 1 << 24
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def synthetic_export(serial_offset, lods, rng):
+    """
+    One Vanguard StaticMesh export blob: a few properties + None, FBox + IsValid,
+    FSphere, InternalVersion, the 6-zero padding and absolute LOD pointer, then
+    the LOD block (per LOD: vertex stream header + 56-byte vertices, index
+    header + uint16 indices) and a short unparsed tail.
+    """
+    d = bytearray()
+    d += bytes([1, 0x22]) + struct.pack("<i", 0)          # IntProperty LightMapCoordinateIndex
+    d += bytes([2, 0x24]) + struct.pack("<f", 1.0)        # FloatProperty Scale
+    d += bytes([3, 0x03])                                 # BoolProperty bCollision
+    d += bytes([4, 0x22]) + struct.pack("<I", 0x10)       # IntProperty Flags
+    d += b"\x00"                                          # None
+
+    extent = float(rng.uniform(50, 5000))
+    d += struct.pack("<6f", -extent, -extent, 0.0, extent, extent, 2 * extent) + b"\x01"
+    d += struct.pack("<4f", 0.0, 0.0, extent, extent * 1.8)
+    d += struct.pack("<ii", SYNTHETIC_VERSION, 0)
+    d += b"\x00" * 6
+    pointer_pos = len(d)
+    d += b"\x00" * 4
+    struct.pack_into("<I", d, pointer_pos, serial_offset + len(d))
+
+    d += struct.pack("<iiii", 0, 0, 1, len(lods))
+    for vertex_count, index_count in lods:
+        d += struct.pack("<III", 1, 0, vertex_count)
+        vertices = rng.normal(scale=extent / 2, size=(vertex_count, 14)).astype("<f4")
+        d += vertices.tobytes()
+        d += struct.pack("<6I", 1, 0, 2, 0, 3, index_count)
+        d += rng.integers(0, vertex_count, index_count).astype("<u2").tobytes()
+    d += b"\xAB" * 32
+    return bytes(d)
+
+
+def synthetic_exports(count=64, seed=0):
+    """
+    Deterministic fixture set: vertex counts log-spaced from 24 to 20000 (props
+    to large buildings), two LODs each, second LOD at a quarter of the first.
+    """
+    rng = np.random.default_rng(seed)
+    vertex_counts = np.geomspace(24, 20000, count).astype(int)
+    exports = []
+    serial_offset = SYNTHETIC_BASE_OFFSET
+    for i, vertex_count in enumerate(vertex_counts):
+        vertex_count = int(vertex_count)
+        lod1 = max(vertex_count // 4, 3)
+        lods = ((vertex_count, vertex_count * 3), (lod1, lod1 * 3))
+        data = synthetic_export(serial_offset, lods, rng)
+        exports.append({
+            "name": f"synthetic_{i:03d}",
+            "data": data,
+            "names": SYNTHETIC_NAMES,
+            "serial_offset": serial_offset,
+        })
+        serial_offset += len(data)
+    return exports
+
+
+def package_exports(assets_dir, limit=None):
+    """StaticMesh exports from the .usx packages under assets_dir (sorted, so runs compare)."""
+    from ue2 import UE2Package
+    files = sorted(glob.glob(os.path.join(assets_dir, "**", "*.usx"), recursive=True))
+    exports = []
+    for path in files[:limit]:
+        try:
+            pkg = UE2Package(path)
+        except Exception as e:
+            print(f"  {os.path.basename(path)}: {e}, skipped")
+            continue
+        for exp in pkg.exports:
+            if exp["class_name"] != "StaticMesh":
+                continue
+            exports.append({
+                "name": f"{os.path.basename(path)}:{exp['object_name']}",
+                "data": pkg.get_export_data(exp),
+                "names": pkg.names,
+                "serial_offset": exp["serial_offset"],
+            })
+    return exports
+
+
+# =============================================================================
+# STAGES
+# =============================================================================
+
+def peak_rss_mb():
+    """Process peak RSS (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def parsed_meshes(export, result):
+    """ParsedMesh per LOD of a successful parse (the fields mesh_to_gltf reads)."""
+    core = result["data"].get("core", {})
+    bbox = core.get("bounding_box", {})
+    lo, hi = bbox.get("min", {}), bbox.get("max", {})
+    return [
+        ParsedMesh(
+            name=export["name"], package_path="", export_index=0,
+            bbox_min=(lo.get("x", 0), lo.get("y", 0), lo.get("z", 0)),
+            bbox_max=(hi.get("x", 0), hi.get("y", 0), hi.get("z", 0)),
+            bsphere_center=(0, 0, 0), bsphere_radius=0,
+            lod_index=lod_idx, **lod_geometry(lod), parse_status="complete",
+        )
+        for lod_idx, lod in enumerate(result["data"].get("lods", []))
+    ]
+
+
+def time_stage(fn, items, repeat):
+    """Best wall time of `repeat` passes of fn over items, plus the last pass's outputs."""
+    best = float("inf")
+    outputs = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        outputs = [fn(item) for item in items]
+        best = min(best, time.perf_counter() - t0)
+    return best, outputs
+
+
+def stage_row(stage, seconds, meshes, nbytes):
+    return {
+        "stage": stage,
+        "meshes": meshes,
+        "bytes": nbytes,
+        "seconds": seconds,
+        "meshes_per_sec": meshes / seconds if seconds else 0.0,
+        "mb_per_sec": nbytes / (1024 * 1024) / seconds if seconds else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_benchmark(exports, repeat=3, quantize=False):
+    """Time each stage over every export; returns (rows, parse failures)."""
+    export_bytes = sum(len(e["data"]) for e in exports)
+    rows = []
+
+    seconds, _ = time_stage(lambda e: find_none_terminator(e["data"], e["names"]), exports, repeat)
+    rows.append(stage_row("find_none_terminator", seconds, len(exports), export_bytes))
+
+    seconds, results = time_stage(
+        lambda e: parse_staticmesh(e["data"], e["names"], e["serial_offset"]), exports, repeat)
+    rows.append(stage_row("parse_staticmesh", seconds, len(exports), export_bytes))
+
+    failures = [e["name"] for e, r in zip(exports, results) if r["parse_status"] != "success"]
+    meshes = [m for e, r in zip(exports, results) if r["parse_status"] == "success"
+              for m in parsed_meshes(e, r)]
+
+    with tempfile.TemporaryDirectory(prefix="bench_staticmesh_") as out_dir:
+        paths = [os.path.join(out_dir, f"{m.name}_lod{m.lod_index}.gltf") for m in meshes]
+        seconds, _ = time_stage(
+            lambda item: mesh_to_gltf(item[0], item[1], quantize=quantize), list(zip(meshes, paths)), repeat)
+        written = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir))
+    rows.append(stage_row("mesh_to_gltf", seconds, len(meshes), written))
+    return rows, failures
+
+
+def print_comparison(rows, baseline_path):
+    """Throughput change per stage against a saved run (positive is faster)."""
+    with open(baseline_path) as f:
+        baseline = {r["stage"]: r for r in json.load(f)["stages"]}
+    print(f"\nvs {baseline_path}")
+    print(f"{'stage':<22} {'base meshes/s':>14} {'meshes/s':>10} {'change':>8} {'base RSS':>9} {'RSS':>7}")
+    print("-" * 75)
+    for r in rows:
+        base = baseline.get(r["stage"])
+        if base is None:
+            print(f"{r['stage']:<22} {'(missing)':>14}")
+            continue
+        change = (r["meshes_per_sec"] / base["meshes_per_sec"] - 1) * 100 if base["meshes_per_sec"] else 0.0
+        print(f"{r['stage']:<22} {base['meshes_per_sec']:>14.1f} {r['meshes_per_sec']:>10.1f} "
+              f"{change:>+7.1f}% {base['peak_rss_mb']:>9.1f} {r['peak_rss_mb']:>7.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StaticMesh parser throughput")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic exports (no assets needed)")
+    parser.add_argument("--count", type=int, default=64, help="Number of synthetic exports")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic fixture seed")
+    parser.add_argument("--assets", type=str, default=None, help="Directory of .usx packages to load")
+    parser.add_argument("--limit", type=int, default=None, help="Limit number of packages with --assets")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per stage (best time is kept)")
+    parser.add_argument("--quantize", action="store_true", help="Export quantized glTF (KHR_mesh_quantization)")
+    parser.add_argument("--json", type=str, default=None, help="Write results to a JSON file")
+    parser.add_argument("--compare", type=str, default=None, help="Baseline JSON from an earlier run")
+    args = parser.parse_args()
+
+    exports = []
+    if args.synthetic:
+        exports += synthetic_exports(args.count, args.seed)
+    if args.assets:
+        exports += package_exports(args.assets, args.limit)
+    if not exports:
+        print("Nothing to benchmark (use --synthetic or --assets)")
+        return
+
+    export_mb = sum(len(e["data"]) for e in exports) / (1024 * 1024)
+    print(f"{len(exports)} StaticMesh exports, {export_mb:.1f} MB, best of {args.repeat}\n")
+    rows, failures = run_benchmark(exports, args.repeat, args.quantize)
+
+    print(f"{'stage':<22} {'meshes':>7} {'ms':>9} {'meshes/s':>10} {'MB/s':>8} {'peak RSS MB':>12}")
+    print("-" * 73)
+    for r in rows:
+        print(f"{r['stage']:<22} {r['meshes']:>7} {r['seconds'] * 1000:>9.1f} "
+              f"{r['meshes_per_sec']:>10.1f} {r['mb_per_sec']:>8.1f} {r['peak_rss_mb']:>12.1f}")
+    if failures:
+        print(f"\n{len(failures)} exports did not parse (excluded from mesh_to_gltf): {', '.join(failures[:5])}")
+
+    if args.compare:
+        print_comparison(rows, args.compare)
+
+    if args.json:
+        report = {
+            "source": {"synthetic": args.count if args.synthetic else 0, "seed": args.seed,
+                       "assets": args.assets, "limit": args.limit},
+            "exports": len(exports),
+            "export_bytes": sum(len(e["data"]) for e in exports),
+            "parse_failures": failures,
+            "repeat": args.repeat,
+            "quantize": args.quantize,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "stages": rows,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {len(rows)} stage results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark RTIN terrain simplification against the full 512x512 grid mesh.
+
+For each chunk and tolerance, reports triangle counts, reduction, build time and
+the measured max height error: every full-resolution sample is compared against
+the simplified surface by rasterizing the output triangles.
+
+Usage:
+    python bench_terrain_rtin.py --chunk chunk_n25_26 --chunk chunk_10_10
+    python bench_terrain_rtin.py --all --limit 20
+    python bench_terrain_rtin.py --synthetic          # No game assets needed
+    python bench_terrain_rtin.py --synthetic --tolerances 5 25 100 --json out.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path (go up 2 levels from scripts/benchmarks)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "extractors"))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from terrain_rtin import TerrainRTIN, pad_to_rtin_grid, triangle_max_errors
+
+DEFAULT_TOLERANCES = [1.0, 10.0, 50.0, 200.0]
+
+
+def synthetic_chunks(grid_size=512, seed=0):
+    """Heightfields (raw G16 units) covering ocean, plains, hills and mountains."""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:grid_size, 0:grid_size] / grid_size
+    hills = 2000 * np.sin(x * 6.0) * np.cos(y * 4.0) + 20000
+    noise = rng.normal(size=(grid_size, grid_size)).cumsum(0).cumsum(1)
+    noise = (noise - noise.min()) / (np.ptp(noise) or 1.0)
+    return {
+        "synthetic_ocean": np.full((grid_size, grid_size), 12000.0),
+        "synthetic_plains": 15000 + 40 * np.sin(x * 3.0) + rng.normal(scale=0.5, size=x.shape),
+        "synthetic_hills": hills,
+        "synthetic_mountains": 10000 + 30000 * noise,
+    }
+
+
+def load_chunk_heights(chunk_name):
+    """Decoded, corrected heightmap for a real chunk (same path as extract_all_terrain)."""
+    from ue2 import UE2Package
+    from extract_all_terrain import VANGUARD_MAPS, extract_g16_heightmap
+    vgr_path = os.path.join(VANGUARD_MAPS, f"{chunk_name}.vgr")
+    if not os.path.exists(vgr_path):
+        return None
+    heights, _ = extract_g16_heightmap(UE2Package(vgr_path), chunk_name)
+    return heights
+
+
+def measured_max_error(heights, vertex_idx, triangles):
+    """Max |surface - sample| over every grid sample, rasterizing the output triangles."""
+    size = heights.shape[0]
+    rows, cols = np.divmod(vertex_idx, size)
+    tri_x = cols[triangles]
+    tri_y = rows[triangles]
+    errors = triangle_max_errors(
+        heights, tri_x[:, 0], tri_y[:, 0], tri_x[:, 1], tri_y[:, 1], tri_x[:, 2], tri_y[:, 2]
+    )
+    return float(errors.max())
+
+
+def bench_heights(name, heights, tolerances, height_scale):
+    """Run every tolerance on one heightfield; return result rows."""
+    padded = pad_to_rtin_grid(heights) * height_scale
+    grid_triangles = 2 * (heights.shape[0] - 1) ** 2
+
+    t0 = time.perf_counter()
+    rtin = TerrainRTIN(padded)
+    build_s = time.perf_counter() - t0
+
+    results = []
+    for tolerance in tolerances:
+        t0 = time.perf_counter()
+        vertex_idx, triangles = rtin.extract(tolerance)
+        extract_s = time.perf_counter() - t0
+        error = measured_max_error(padded, vertex_idx, triangles)
+        results.append({
+            "chunk": name,
+            "tolerance": tolerance,
+            "grid_triangles": grid_triangles,
+            "rtin_triangles": int(len(triangles)),
+            "rtin_vertices": int(len(vertex_idx)),
+            "reduction": grid_triangles / max(len(triangles), 1),
+            "max_error": error,
+            "within_tolerance": error <= tolerance + 1e-6,
+            "build_ms": build_s * 1000,
+            "extract_ms": extract_s * 1000,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RTIN terrain simplification")
+    parser.add_argument("--chunk", action="append", default=[], help="Chunk name (repeatable)")
+    parser.add_argument("--all", action="store_true", help="Benchmark every chunk in the Maps folder")
+    parser.add_argument("--limit", type=int, default=None, help="Limit number of chunks with --all")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic heightfields (no assets needed)")
+    parser.add_argument("--tolerances", type=float, nargs="+", default=DEFAULT_TOLERANCES,
+                        help="Height tolerances in world units")
+    parser.add_argument("--json", type=str, default=None, help="Write results to a JSON file")
+    args = parser.parse_args()
+
+    from extract_all_terrain import HEIGHT_SCALE, get_all_chunks
+
+    sources = {}
+    if args.synthetic:
+        sources.update(synthetic_chunks())
+    chunk_names = list(args.chunk)
+    if args.all:
+        chunk_names += get_all_chunks()[:args.limit]
+    for chunk_name in chunk_names:
+        heights = load_chunk_heights(chunk_name)
+        if heights is None:
+            print(f"  {chunk_name}: no heightmap, skipped")
+            continue
+        sources[chunk_name] = heights
+
+    if not sources:
+        print("Nothing to benchmark (use --synthetic, --chunk or --all)")
+        return
+
+    rows = []
+    print(f"{'chunk':<24} {'tol':>7} {'triangles':>10} {'reduction':>10} {'max err':>9} {'ok':>3} {'ms':>8}")
+    print("-" * 78)
+    for name, heights in sources.items():
+        for r in bench_heights(name, heights, args.tolerances, HEIGHT_SCALE):
+            rows.append(r)
+            print(f"{r['chunk']:<24} {r['tolerance']:>7.1f} {r['rtin_triangles']:>10} "
+                  f"{r['reduction']:>9.1f}x {r['max_error']:>9.2f} {'Y' if r['within_tolerance'] else 'N':>3} "
+                  f"{r['build_ms'] + r['extract_ms']:>8.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(rows, f, indent=2)
+        print(f"\nSaved {len(rows)} results to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,8 +13,10 @@ from pathlib import Path
 
 # Add project root to path (go up 2 levels from scripts/extractors)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
+from bulk_load import apply_bulk_pragmas
 import config
 
 # Use canonical database
@@ -52,19 +54,15 @@ def parse_mat_file(mat_path: str) -> dict:
 def build_texture_database(silent=False):
     """
     Scan for textures and shader .mat files, populate database tables.
+    All files are parsed first; the shaders table is then replaced in one
+    short transaction, so the write lock isn't held during the scan.
     """
-    conn = sqlite3.connect(DB_PATH)
-    
-    # Clear existing entries
-    conn.execute("DELETE FROM shaders")
-    
     textures_path = Path(TEXTURES_DIR)
     
     if not textures_path.exists():
         if not silent:
             print(f"   ⚠ Textures directory not found: {TEXTURES_DIR}")
             print("   Skipping texture database build.")
-        conn.close()
         return
     
     # First pass: collect all PNG textures
@@ -83,6 +81,7 @@ def build_texture_database(silent=False):
     
     mat_files = list(textures_path.rglob("*.mat"))
     total_mats = len(mat_files)
+    shader_rows = {}  # shader name -> row (last .mat wins, as INSERT OR REPLACE did)
     shader_count = 0
     mapped_count = 0
     
@@ -104,15 +103,18 @@ def build_texture_database(silent=False):
                     diffuse_path = textures[diffuse_lower]
                     mapped_count += 1
             
-            # Insert into shaders table
-            conn.execute("""
-                INSERT OR REPLACE INTO shaders 
-                (shader_name, diffuse_texture, normal_texture, specular_texture)
-                VALUES (?, ?, ?, ?)
-            """, (shader_name.lower(), diffuse_path, normal, specular))
+            shader_rows[shader_name.lower()] = (shader_name.lower(), diffuse_path, normal, specular)
             shader_count += 1
 
-    conn.commit()
+    conn = sqlite3.connect(DB_PATH)
+    apply_bulk_pragmas(conn)
+    with conn:
+        conn.execute("DELETE FROM shaders")
+        conn.executemany("""
+            INSERT OR REPLACE INTO shaders 
+            (shader_name, diffuse_texture, normal_texture, specular_texture)
+            VALUES (?, ?, ?, ?)
+        """, list(shader_rows.values()))
     conn.close()
     
     if not silent:
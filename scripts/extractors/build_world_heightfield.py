@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Build the global world heightfield from all chunk heightmaps, or query it.
+
+The heightfield is a stitched, memory-mapped float32 tile file plus a JSON
+chunk-origin index (see ue2/world.py and TERRAIN_GUIDE.md Section 4.3).
+`extract_all_terrain.py --all` already writes it; use this script to rebuild
+it without regenerating the glTFs.
+
+Usage:
+    python build_world_heightfield.py                      # Build from all chunks
+    python build_world_heightfield.py --limit 10
+    python build_world_heightfield.py --query -5000000 5200000
+    python build_world_heightfield.py --query-local chunk_n25_26 1200 -3400
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path (go up 2 levels from scripts/extractors or scripts/generators)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "extractors"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from ue2 import UE2Package
+from ue2.world import WorldHeightfield, WorldHeightfieldWriter, parse_chunk_coords
+from extract_all_terrain import (
+    HEIGHT_SCALE, VANGUARD_MAPS, WORLD_HEIGHTFIELD,
+    extract_g16_heightmap, get_all_chunks, print_progress_bar
+)
+
+
+def build(path_prefix, limit=None, silent=False):
+    """Decode every chunk heightmap into the world heightfield; returns the chunk count."""
+    chunks = get_all_chunks()
+    if limit:
+        chunks = chunks[:limit]
+    total = len(chunks)
+    with WorldHeightfieldWriter(path_prefix, HEIGHT_SCALE) as writer:
+        for i, chunk in enumerate(chunks):
+            try:
+                pkg = UE2Package(os.path.join(VANGUARD_MAPS, f"{chunk}.vgr"))
+                heights, _ = extract_g16_heightmap(pkg, chunk)
+                if heights is not None:
+                    writer.add(chunk, heights)
+            except Exception as e:
+                if not silent:
+                    print(f"\n  {chunk}: ERROR {e}")
+            if not silent and total:
+                print_progress_bar(i + 1, total, prefix='   Progress:', suffix=f'({i+1}/{total})', length=40)
+    return len(writer.chunks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the global world heightfield")
+    parser.add_argument("--output", default=WORLD_HEIGHTFIELD, help="Path prefix (.f32 / .json)")
+    parser.add_argument("--limit", type=int, default=None, help="Only build from the first N chunks")
+    parser.add_argument("--silent", action="store_true", help="Suppress progress output")
+    parser.add_argument("--query", nargs=2, type=float, metavar=("X", "Y"), help="Height at world X/Y")
+    parser.add_argument("--query-local", nargs=3, metavar=("CHUNK", "X", "Y"),
+                        help="Height at a chunk-relative position")
+    args = parser.parse_args()
+
+    if args.query or args.query_local:
+        world = WorldHeightfield(args.output)
+        if args.query:
+            print(f"{world.height_at(*args.query):.2f}")
+        else:
+            chunk_x, chunk_y = parse_chunk_coords(args.query_local[0])
+            h = world.heights_at_local(chunk_x, chunk_y, float(args.query_local[1]), float(args.query_local[2]))
+            print(f"{float(h):.2f}")
+        return
+
+    count = build(args.output, args.limit, args.silent)
+    if not args.silent:
+        print(f"World heightfield: {count} chunks -> {args.output}.f32")
+
+
+if __name__ == "__main__":
+    main()
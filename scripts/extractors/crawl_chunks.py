@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+One-pass chunk crawler: reads each VGR once and fills chunks, names, imports,
+exports (with positions) and properties together.
+
+Replaces the two-pass flow (extract_chunk_data.py, then extract_properties.py
+reopening every VGR and re-querying exports). Each chunk is parsed with the
+shared ue2 core (UE2Package + ue2.properties) into plain row tuples, then
+written in one transaction: the chunk row is upserted on filename (its id is
+stable across runs) and the chunk's old names/imports/exports/properties are
+replaced. With --workers, chunks are parsed in a process pool and the
+main process stays the only writer. The exports_rtree spatial index
+(scripts/lib/spatial_index.py) is refreshed in the same transaction.
+
+Index columns hold the values UE2 serialized data uses to reference them:
+names.name_index is the 0-based name table index, exports.export_index the
+1-based export reference and imports.import_index the negative import
+reference (-1, -2, ...).
+
+Usage:
+    python crawl_chunks.py                        # Crawl every chunk_*.vgr
+    python crawl_chunks.py --file chunk_n25_26.vgr
+    python crawl_chunks.py --limit 10 --silent
+    python crawl_chunks.py --workers 0             # Parse in one process per CPU
+    python crawl_chunks.py --spatial-only          # Rebuild exports_rtree only
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from typing import Dict, List
+
+# Add project root to path (go up 2 levels from scripts/extractors)
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
+sys.path.insert(0, PROJECT_ROOT)
+
+from ue2 import UE2Package
+from ue2.properties import find_property_start, parse_properties
+from extract_chunk_data import (extract_position_from_data, iter_chunk_results, parse_chunk_name,
+                                print_progress_bar, upsert_chunk)
+import spatial_index
+from bulk_load import apply_bulk_pragmas
+
+try:
+    import config
+    DB_PATH = config.DB_PATH
+    MAPS_DIR = os.path.join(config.ASSETS_PATH, "Maps")
+except ImportError:
+    DB_PATH = "/Users/brynnbateman/Downloads/Vanguard EMU/vanguard_files.db"
+    MAPS_DIR = "/Users/brynnbateman/Downloads/Vanguard EMU/Assets/Maps"
+
+# Classes whose serialized data carries a world position (see extract_chunk_data)
+PLACEABLE_CLASSES = ('CompoundObject', 'Actor', 'StaticMeshActor', 'Prefab')
+
+
+def ensure_crawler_columns(conn: sqlite3.Connection):
+    """properties.value_hex is only created by ue2.properties; add it on setup.py databases."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(properties)")}
+    if columns and 'value_hex' not in columns:
+        conn.execute("ALTER TABLE properties ADD COLUMN value_hex TEXT")
+        conn.commit()
+
+
+def property_rows(data: bytes, names: List[str]) -> List[tuple]:
+    """(prop_name, prop_type, prop_size, array_index, struct_name, value_text, value_hex) per property."""
+    if not data or len(data) < 2:
+        return []
+    start_offset = find_property_start(data, names)
+    if start_offset < 0:
+        return []
+    return [
+        (prop['name'], prop['type'], prop['size'], prop['array_index'], prop['struct_name'],
+         str(prop['value']) if prop['value'] is not None else None, prop['value_hex'])
+        for prop in parse_properties(data, names, start_offset)
+    ]
+
+
+def crawl_chunk(filepath: str) -> Dict:
+    """
+    Parse one VGR into row tuples for every table (no database access).
+    exports rows are paired with their property rows: [(export_row, [prop_row, ...]), ...].
+    """
+    pkg = UE2Package(filepath)
+    filename = os.path.basename(filepath)
+    chunk_x, chunk_y = parse_chunk_name(filename)
+
+    exports = []
+    for exp in pkg.exports:
+        data = pkg.get_export_data(exp)
+        position = None
+        if exp['class_name'] in PLACEABLE_CLASSES:
+            position = extract_position_from_data(data)
+        export_row = (
+            exp['index'], exp['object_name'], exp['class_name'],
+            *(position if position else (None, None, None)),
+            exp['serial_offset'], exp['serial_size'],
+        )
+        exports.append((export_row, property_rows(data, pkg.names)))
+
+    return {
+        'chunk': (filename, filepath, chunk_x, chunk_y,
+                  len(pkg.names), len(pkg.exports), len(pkg.imports)),
+        'names': list(enumerate(pkg.names)),
+        'imports': [(imp['index'], imp['object_name'], imp['class_name'], imp['class_package'])
+                    for imp in pkg.imports],
+        'exports': exports,
+    }
+
+
+def store_chunk(conn: sqlite3.Connection, rows: Dict, next_export_id: int, spatial: bool = True) -> int:
+    """
+    Replace one chunk's rows in a single transaction.
+    Export ids are assigned here (from next_export_id) so properties reference
+    them directly; with spatial, the chunk's exports_rtree boxes are refreshed
+    in the same transaction. Returns the next free export id.
+    """
+    with conn:
+        cursor = conn.cursor()
+        chunk_id = upsert_chunk(cursor, rows['chunk'])
+
+        if spatial:
+            spatial_index.remove_chunk(cursor, chunk_id)
+        cursor.execute("DELETE FROM properties WHERE export_id IN (SELECT id FROM exports WHERE chunk_id = ?)",
+                       (chunk_id,))
+        cursor.execute("DELETE FROM exports WHERE chunk_id = ?", (chunk_id,))
+        cursor.execute("DELETE FROM names WHERE chunk_id = ?", (chunk_id,))
+        cursor.execute("DELETE FROM imports WHERE chunk_id = ?", (chunk_id,))
+
+        cursor.executemany("INSERT INTO names (chunk_id, name_index, name) VALUES (?, ?, ?)",
+                           [(chunk_id, *row) for row in rows['names']])
+        cursor.executemany("""
+            INSERT INTO imports (chunk_id, import_index, object_name, class_name, class_package)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(chunk_id, *row) for row in rows['imports']])
+
+        export_rows = []
+        prop_rows = []
+        for export_id, (export_row, props) in enumerate(rows['exports'], start=next_export_id):
+            export_rows.append((export_id, chunk_id, *export_row))
+            prop_rows.extend((export_id, *prop) for prop in props)
+
+        cursor.executemany("""
+            INSERT INTO exports
+            (id, chunk_id, export_index, object_name, class_name,
+             position_x, position_y, position_z, serial_offset, serial_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, export_rows)
+        cursor.executemany("""
+            INSERT INTO properties (export_id, prop_name, prop_type, prop_size,
+                                    array_index, struct_name, value_text, value_hex)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, prop_rows)
+
+        if spatial:
+            spatial_index.index_chunk(cursor, chunk_id, rows['chunk'][0])
+
+    return next_export_id + len(export_rows)
+
+
+def find_chunk_files(file_name: str = None, limit: int = 0) -> List[str]:
+    """chunk_*.vgr files in MAPS_DIR (or the single named file)."""
+    if file_name:
+        return [os.path.join(MAPS_DIR, file_name)]
+    vgr_files = sorted(
+        os.path.join(MAPS_DIR, f)
+        for f in os.listdir(MAPS_DIR)
+        if f.endswith('.vgr') and f.startswith('chunk_')
+    )
+    return vgr_files[:limit] if limit else vgr_files
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Crawl VGR chunks into chunks/names/imports/exports/properties")
+    parser.add_argument('--file', help="Process specific chunk file")
+    parser.add_argument('--limit', type=int, default=0, help="Limit number of files to process")
+    parser.add_argument('--silent', action='store_true', help="Suppress all output except errors")
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help="Parse chunks in N worker processes (0 = one per CPU); the main process writes")
+    parser.add_argument('--spatial-only', action='store_true',
+                        help="Only rebuild the exports_rtree spatial index from the database")
+    args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    if not args.silent:
+        print("=" * 60)
+        print("Chunk Crawler")
+        print("=" * 60)
+        print(f"Database: {DB_PATH}")
+        print(f"Maps Dir: {MAPS_DIR}")
+        print()
+
+    conn = sqlite3.connect(DB_PATH)
+    apply_bulk_pragmas(conn)
+    if args.spatial_only:
+        boxes = spatial_index.rebuild_spatial_index(conn)
+        conn.close()
+        if not args.silent:
+            print(f"exports_rtree rebuilt: {boxes:,} placed objects")
+        return
+    ensure_crawler_columns(conn)
+    spatial = spatial_index.ensure_spatial_index(conn)
+    if not spatial:
+        print("  SQLite build has no R*Tree module; exports_rtree not maintained")
+    next_export_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM exports").fetchone()[0]
+
+    vgr_files = [f for f in find_chunk_files(args.file, args.limit) if os.path.exists(f)]
+    total_files = len(vgr_files)
+    if not args.silent:
+        print(f"Found {total_files} chunk files to process ({workers} worker{'s' if workers > 1 else ''})")
+        print()
+
+    totals = {'chunks': 0, 'exports': 0, 'properties': 0, 'placed': 0, 'failed': 0}
+    start_time = time.time()
+    for i, (filepath, rows) in enumerate(iter_chunk_results(vgr_files, workers, task=crawl_chunk)):
+        if isinstance(rows, Exception):
+            print(f"\n  {os.path.basename(filepath)}: ERROR: {rows}")
+            totals['failed'] += 1
+            continue
+        next_export_id = store_chunk(conn, rows, next_export_id, spatial)
+        totals['chunks'] += 1
+        totals['exports'] += len(rows['exports'])
+        totals['properties'] += sum(len(props) for _, props in rows['exports'])
+        totals['placed'] += sum(1 for export_row, _ in rows['exports'] if export_row[3] is not None)
+        print_progress_bar(i + 1, total_files, prefix='   Progress:', suffix=f'({i+1}/{total_files})', length=40)
+
+    conn.close()
+
+    if not args.silent:
+        print()
+        print("=" * 60)
+        print("Crawl Complete")
+        print("=" * 60)
+        print(f"Chunks crawled: {totals['chunks']} ({totals['failed']} failed) in {time.time() - start_time:.1f}s")
+        print(f"Exports: {totals['exports']:,} ({totals['placed']:,} with positions)")
+        print(f"Properties: {totals['properties']:,}")
+
+
+if __name__ == "__main__":
+    main()
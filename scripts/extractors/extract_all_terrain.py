@@ -6,6 +6,10 @@ Does not require umodel or Wine - parses textures directly from VGR files.
 Usage:
     python extract_all_terrain.py --all        # Process all VGR chunk files
     python extract_all_terrain.py --chunk X   # Process single chunk by name
+    python extract_all_terrain.py --all --no-lods  # Skip the LOD pyramid
+    python extract_all_terrain.py --all --rtin-tolerance 50  # Error-bounded simplified mesh
+    python extract_all_terrain.py --all --texture-format dds  # DXT passthrough (+ PNG fallback)
+    python extract_all_terrain.py --all --quantize  # KHR_mesh_quantization vertex attributes
 """
 
 import numpy as np
@@ -13,6 +17,7 @@ from PIL import Image
 import struct
 import json
 import base64
+import hashlib
 import io
 import os
 import sys
@@ -22,15 +27,21 @@ from pathlib import Path
 # Add parent directory to path
 # Add project root to path (go up 2 levels from scripts/extractors or scripts/generators)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
 import config
 from ue2 import UE2Package
+from ue2.world import WorldHeightfieldWriter
+from terrain_rtin import TerrainRTIN, pad_to_rtin_grid
+import gltf_quantize
+from bulk_load import apply_bulk_pragmas
 
 # Configuration
 DB_PATH = config.DB_PATH
 VANGUARD_MAPS = os.path.join(config.ASSETS_PATH, "Maps")
 OUTPUT_DIR = config.TERRAIN_GRID_DIR
+WORLD_HEIGHTFIELD = os.path.join(config.TERRAIN_DIR, "world_heightfield")  # .f32 tiles + .json index
 
 # Vanguard-specific terrain decoding constants
 # See TERRAIN_GUIDE.md for details
@@ -40,6 +51,15 @@ COLUMN_SHIFT = 34  # Column de-swizzle offset
 HEIGHT_SCALE = 3.0  # Increased from 2.4 for better height variation
 TERRAIN_SCALE = 390.625  # Units per pixel (200k world / 512 grid)
 
+# Terrain LOD pyramid (see TERRAIN_GUIDE.md Section 4.1)
+LOD_SIZES = [256, 128, 64, 32]  # Samples per side for each decimated LOD
+SKIRT_MIN_DEPTH = 2 * TERRAIN_SCALE  # Minimum skirt drop in world units
+LOD_TEXELS_PER_SAMPLE = 4  # Color texture resolution kept per LOD sample
+
+# Incremental rebuilds (see TERRAIN_GUIDE.md Section 4.5)
+# Bump whenever decoding or mesh generation changes in a way the constants above don't capture
+TERRAIN_DECODER_VERSION = 1
+
 
 def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, length=40, fill='█', print_end="\r"):
     """
@@ -152,8 +172,8 @@ def decode_dxt5(data, width, height):
         return Image.frombytes("RGBA", (width, height), bytes(pixels))
     except Exception: return None
 
-def extract_color_texture(pkg, chunk_name):
-    """Extract and decode base color texture from VGR package using formal parsing."""
+def color_texture_candidates(pkg, chunk_name):
+    """Yield parsed base color Texture candidates for a chunk, best match first."""
     from ue2.texture import Texture
     candidates = []
     search_coord = chunk_name.replace("chunk_", "").lower()
@@ -174,10 +194,34 @@ def extract_color_texture(pkg, chunk_name):
             if not data: continue
             tex = Texture(data, pkg.names)
             if tex.mips:
-                img = tex.get_image(0)
-                if img:
-                    img = img.transpose(Image.TRANSPOSE)
-                    return img
+                yield tex
+        except: continue
+
+
+def extract_color_texture(pkg, chunk_name):
+    """Extract and decode base color texture from VGR package using formal parsing."""
+    for tex in color_texture_candidates(pkg, chunk_name):
+        try:
+            img = tex.get_image(0)
+            if img:
+                img = img.transpose(Image.TRANSPOSE)
+                return img
+        except: continue
+    return None
+
+
+def extract_color_dds(pkg, chunk_name):
+    """
+    Base color texture as a DDS file (original DXT blocks + full mip chain).
+    
+    The blocks are transposed in the compressed domain so the DDS lines up with
+    the mesh exactly like the decoded PNG (see TERRAIN_GUIDE.md Section 3.2).
+    """
+    for tex in color_texture_candidates(pkg, chunk_name):
+        try:
+            dds = tex.to_dds(transpose=True)
+            if dds:
+                return dds
         except: continue
     return None
 
@@ -215,31 +259,8 @@ def decode_dxt1(data, width, height):
 
 
 
-def generate_terrain_gltf(heights, color_image, output_path, chunk_name, grid_size=512):
-    """Generate a glTF terrain mesh with texture."""
-    
-    # Texture section (only add if we have an image)
-    texture_b64 = None
-    if color_image is not None:
-        buf = io.BytesIO()
-        color_image.save(buf, format="PNG")
-        texture_b64 = base64.b64encode(buf.getvalue()).decode("ascii")
-    
-    # Vectorized vertex generation
-    y_coords, x_coords = np.meshgrid(
-        np.arange(grid_size), np.arange(grid_size), indexing="ij"
-    )
-    vx = x_coords.flatten() * TERRAIN_SCALE
-    vy = heights.flatten() * HEIGHT_SCALE
-    vz = y_coords.flatten() * TERRAIN_SCALE
-    vertices_arr = np.column_stack([vx, vy, vz]).astype(np.float32)
-    
-    # UVs
-    u = x_coords.flatten() / (grid_size - 1)
-    v = y_coords.flatten() / (grid_size - 1)
-    uvs_arr = np.column_stack([u, v]).astype(np.float32)
-    
-    # Normals
+def compute_terrain_normals(heights):
+    """Per-sample normals from central differences of the full-resolution heightmap."""
     h_left = np.roll(heights, 1, axis=1)
     h_left[:, 0] = heights[:, 0]
     h_right = np.roll(heights, -1, axis=1)
@@ -251,78 +272,241 @@ def generate_terrain_gltf(heights, color_image, output_path, chunk_name, grid_si
     
     dx = (h_right - h_left) * HEIGHT_SCALE / (2 * TERRAIN_SCALE)
     dz = (h_down - h_up) * HEIGHT_SCALE / (2 * TERRAIN_SCALE)
-    nx = -dx.flatten()
+    nx = -dx
     ny = np.ones_like(nx)
-    nz = -dz.flatten()
+    nz = -dz
     lengths = np.sqrt(nx * nx + ny * ny + nz * nz)
-    normals_arr = np.column_stack([nx / lengths, ny / lengths, nz / lengths]).astype(np.float32)
+    return np.stack([nx / lengths, ny / lengths, nz / lengths], axis=-1)
+
+
+def build_grid_mesh(heights, sample_idx, grid_size, normals=None):
+    """
+    Build terrain vertex/index arrays from a (possibly decimated) set of grid samples.
+    
+    sample_idx holds the full-resolution row/column indices that are kept, so
+    decimated LODs place every vertex exactly on a full-resolution sample.
+    Returns (vertices, normals, uvs, indices) as float32/uint32 arrays.
+    """
+    if normals is None:
+        normals = compute_terrain_normals(heights)
+    n = len(sample_idx)
+    
+    # Vectorized vertex generation
+    y_coords, x_coords = np.meshgrid(sample_idx, sample_idx, indexing="ij")
+    sampled = heights[np.ix_(sample_idx, sample_idx)]
+    vx = x_coords.flatten() * TERRAIN_SCALE
+    vy = sampled.flatten() * HEIGHT_SCALE
+    vz = y_coords.flatten() * TERRAIN_SCALE
+    vertices_arr = np.column_stack([vx, vy, vz]).astype(np.float32)
+    
+    # UVs
+    u = x_coords.flatten() / (grid_size - 1)
+    v = y_coords.flatten() / (grid_size - 1)
+    uvs_arr = np.column_stack([u, v]).astype(np.float32)
+    
+    # Normals
+    normals_arr = normals[np.ix_(sample_idx, sample_idx)].reshape(-1, 3).astype(np.float32)
     
     # Indices
-    y_idx, x_idx = np.meshgrid(
-        np.arange(grid_size - 1), np.arange(grid_size - 1), indexing="ij"
-    )
-    i0 = (y_idx * grid_size + x_idx).flatten()
+    y_idx, x_idx = np.meshgrid(np.arange(n - 1), np.arange(n - 1), indexing="ij")
+    i0 = (y_idx * n + x_idx).flatten()
     indices_arr = np.column_stack([
-        i0, i0 + grid_size, i0 + 1,
-        i0 + 1, i0 + grid_size, i0 + grid_size + 1
+        i0, i0 + n, i0 + 1,
+        i0 + 1, i0 + n, i0 + n + 1
     ]).flatten().astype(np.uint32)
     
+    return vertices_arr, normals_arr, uvs_arr, indices_arr
+
+
+def add_skirt(vertices, normals, uvs, indices, depth):
+    """
+    Hang a vertical skirt of the given depth below every boundary edge.
+    
+    Boundary edges are the edges used by exactly one triangle, so this works for
+    regular grids and irregular triangulations alike. The skirt hides the cracks
+    that open between neighbouring chunks rendered at different LODs.
+    """
+    tris = indices.reshape(-1, 3).astype(np.int64)
+    edges = np.concatenate([tris[:, [0, 1]], tris[:, [1, 2]], tris[:, [2, 0]]])
+    keys = np.sort(edges, axis=1)
+    _, inverse, counts = np.unique(keys, axis=0, return_inverse=True, return_counts=True)
+    boundary = edges[counts[inverse.reshape(-1)] == 1]
+    if len(boundary) == 0:
+        return vertices, normals, uvs, indices
+    
+    # One dropped copy per boundary vertex, shared by adjacent skirt quads
+    rim, rim_inverse = np.unique(boundary, return_inverse=True)
+    dropped = rim_inverse.reshape(-1, 2) + len(vertices)
+    skirt_vertices = vertices[rim].copy()
+    skirt_vertices[:, 1] -= depth
+    
+    a, b = boundary[:, 0], boundary[:, 1]
+    a2, b2 = dropped[:, 0], dropped[:, 1]
+    skirt_tris = np.column_stack([a, a2, b, b, a2, b2]).reshape(-1)
+    
+    return (
+        np.concatenate([vertices, skirt_vertices]),
+        np.concatenate([normals, normals[rim]]),
+        np.concatenate([uvs, uvs[rim]]),
+        np.concatenate([indices, skirt_tris.astype(np.uint32)]),
+    )
+
+
+def build_rtin_mesh(heights, grid_size, tolerance, normals=None):
+    """
+    Build an error-bounded terrain mesh (see TERRAIN_GUIDE.md Section 4.2).
+    
+    The heightfield is padded to 513x513 and simplified with an RTIN so that no
+    full-resolution sample deviates more than `tolerance` world units from the
+    surface. Returns (vertices, normals, uvs, indices) like build_grid_mesh.
+    """
+    if normals is None:
+        normals = compute_terrain_normals(heights)
+    padded = pad_to_rtin_grid(heights)
+    size = padded.shape[0]
+    rtin = TerrainRTIN(padded * HEIGHT_SCALE)
+    vertex_idx, triangles = rtin.extract(tolerance)
+    
+    rows, cols = np.divmod(vertex_idx, size)
+    vertices_arr = np.column_stack([
+        cols * TERRAIN_SCALE,
+        padded[rows, cols] * HEIGHT_SCALE,
+        rows * TERRAIN_SCALE
+    ]).astype(np.float32)
+    uvs_arr = np.column_stack([
+        np.minimum(cols / (grid_size - 1), 1.0),
+        np.minimum(rows / (grid_size - 1), 1.0)
+    ]).astype(np.float32)
+    normals_arr = normals[np.minimum(rows, grid_size - 1), np.minimum(cols, grid_size - 1)].astype(np.float32)
+    
+    # RTIN triangles come in both windings; match the grid mesh (normals up)
+    p0, p1, p2 = (vertices_arr[triangles[:, k]] for k in range(3))
+    cross = (p1[:, 0] - p0[:, 0]) * (p2[:, 2] - p0[:, 2]) - (p1[:, 2] - p0[:, 2]) * (p2[:, 0] - p0[:, 0])
+    flip = cross > 0
+    triangles[flip] = triangles[flip][:, [0, 2, 1]]
+    
+    return vertices_arr, normals_arr, uvs_arr, triangles.reshape(-1).astype(np.uint32)
+
+
+def write_terrain_gltf(vertices_arr, normals_arr, uvs_arr, indices_arr, color_image, output_path, chunk_name,
+                       dds_uri=None, quantize=False, report=None):
+    """
+    Write terrain vertex/index arrays (plus optional color texture) as an embedded glTF.
+    
+    dds_uri references a DDS color texture (relative to the glTF) through
+    MSFT_texture_dds; color_image, if also given, is embedded as the PNG fallback.
+    quantize=True writes KHR_mesh_quantization attributes (see TERRAIN_GUIDE.md
+    Section 4.4); the max dequantization errors are accumulated into `report`.
+    """
+    
+    # Texture section (only add if we have an image)
+    texture_b64 = None
+    if color_image is not None:
+        buf = io.BytesIO()
+        color_image.save(buf, format="PNG")
+        texture_b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    
+    has_texture = bool(texture_b64 or dds_uri)
+    images = []
+    texture = {"sampler": 0}
+    if texture_b64:
+        texture["source"] = len(images)
+        images.append({"uri": f"data:image/png;base64,{texture_b64}"})
+    if dds_uri:
+        texture["extensions"] = {"MSFT_texture_dds": {"source": len(images)}}
+        images.append({"uri": dds_uri, "mimeType": "image/vnd-ms.dds"})
+    
+    # 16-bit indices whenever the vertex count allows it
+    if len(vertices_arr) <= 65535:
+        indices_arr = indices_arr.astype(np.uint16)
+        index_component_type = 5123  # UNSIGNED_SHORT
+    else:
+        indices_arr = indices_arr.astype(np.uint32)
+        index_component_type = 5125  # UNSIGNED_INT
+    
+    node = {"mesh": 0, "name": chunk_name}
+    if quantize:
+        # KHR_mesh_quantization: int16 positions (node transform), int8 normals, uint16 UVs
+        q_pos, translation, scale, pos_error = gltf_quantize.quantize_positions(vertices_arr)
+        q_nrm, nrm_error = gltf_quantize.quantize_normals(normals_arr)
+        q_uv, uv_error = gltf_quantize.quantize_uvs(uvs_arr)
+        gltf_quantize.merge_report(report, position=pos_error, normal_degrees=nrm_error, uv=uv_error)
+        node.update({"translation": translation, "scale": [scale, scale, scale]})
+        v_min, v_max = gltf_quantize.quantized_bounds(q_pos)
+        vertices_bin, normals_bin, uvs_bin = q_pos.tobytes(), q_nrm.tobytes(), q_uv.tobytes()
+        attribute_accessors = [
+            {"componentType": 5122, "type": "VEC3", "min": v_min, "max": v_max},  # SHORT
+            {"componentType": 5120, "normalized": True, "type": "VEC3"},  # BYTE
+            {"componentType": 5123, "normalized": True, "type": "VEC2"},  # UNSIGNED_SHORT
+        ]
+        strides = [8, 4, None]
+    else:
+        vertices_bin = vertices_arr.tobytes()
+        normals_bin = normals_arr.tobytes()
+        uvs_bin = uvs_arr.tobytes()
+        attribute_accessors = [
+            {"componentType": 5126, "type": "VEC3",
+             "min": vertices_arr.min(axis=0).tolist(), "max": vertices_arr.max(axis=0).tolist()},
+            {"componentType": 5126, "type": "VEC3"},
+            {"componentType": 5126, "type": "VEC2"},
+        ]
+        strides = [None, None, None]
+    
     # Pack buffers
-    vertices_bin = vertices_arr.tobytes()
-    normals_bin = normals_arr.tobytes()
-    uvs_bin = uvs_arr.tobytes()
     indices_bin = indices_arr.tobytes()
     buffer_data = vertices_bin + normals_bin + uvs_bin + indices_bin
     
-    # Texture
-    buf = io.BytesIO()
-    color_image.save(buf, format="PNG")
-    texture_b64 = base64.b64encode(buf.getvalue()).decode("ascii")
+    buffer_views = []
+    offset = 0
+    for blob, stride in zip((vertices_bin, normals_bin, uvs_bin, indices_bin), strides + [None]):
+        view = {"buffer": 0, "byteOffset": offset, "byteLength": len(blob)}
+        if stride:
+            view["byteStride"] = stride
+        buffer_views.append(view)
+        offset += len(blob)
     
-    v_min = vertices_arr.min(axis=0).tolist()
-    v_max = vertices_arr.max(axis=0).tolist()
+    accessors = [
+        {"bufferView": i, "count": len(vertices_arr), **acc} for i, acc in enumerate(attribute_accessors)
+    ]
+    accessors.append({"bufferView": 3, "componentType": index_component_type, "count": len(indices_arr), "type": "SCALAR"})
     
     gltf = {
         "asset": {"version": "2.0", "generator": "extract_all_terrain.py"},
         "scene": 0,
         "scenes": [{"nodes": [0]}],
-        "nodes": [{"mesh": 0, "name": chunk_name}],
+        "nodes": [node],
         "meshes": [{
             "primitives": [{
                 "attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2},
                 "indices": 3,
-                **({"material": 0} if texture_b64 else {})
+                **({"material": 0} if has_texture else {})
             }]
         }],
         "materials": [{
             "pbrMetallicRoughness": {
-                "baseColorTexture": {"index": 0} if texture_b64 else None,
-                "baseColorFactor": [1.0, 1.0, 1.0, 1.0] if not texture_b64 else None,
+                "baseColorTexture": {"index": 0},
                 "metallicFactor": 0.0,
                 "roughnessFactor": 1.0
             }
-        }] if texture_b64 else [],
-        "textures": [{"source": 0, "sampler": 0}] if texture_b64 else [],
-        "samplers": [{"magFilter": 9729, "minFilter": 9987, "wrapS": 10497, "wrapT": 10497}] if texture_b64 else [],
-        "images": [{"uri": f"data:image/png;base64,{texture_b64}"}] if texture_b64 else [],
-        "accessors": [
-            {"bufferView": 0, "componentType": 5126, "count": len(vertices_arr), "type": "VEC3", "min": v_min, "max": v_max},
-            {"bufferView": 1, "componentType": 5126, "count": len(normals_arr), "type": "VEC3"},
-            {"bufferView": 2, "componentType": 5126, "count": len(uvs_arr), "type": "VEC2"},
-            {"bufferView": 3, "componentType": 5125, "count": len(indices_arr), "type": "SCALAR"}
-        ],
-        "bufferViews": [
-            {"buffer": 0, "byteOffset": 0, "byteLength": len(vertices_bin)},
-            {"buffer": 0, "byteOffset": len(vertices_bin), "byteLength": len(normals_bin)},
-            {"buffer": 0, "byteOffset": len(vertices_bin) + len(normals_bin), "byteLength": len(uvs_bin)},
-            {"buffer": 0, "byteOffset": len(vertices_bin) + len(normals_bin) + len(uvs_bin), "byteLength": len(indices_bin)}
-        ],
+        }] if has_texture else [],
+        "textures": [texture] if has_texture else [],
+        "samplers": [{"magFilter": 9729, "minFilter": 9987, "wrapS": 10497, "wrapT": 10497}] if has_texture else [],
+        "images": images,
+        "accessors": accessors,
+        "bufferViews": buffer_views,
         "buffers": [{
             "uri": f"data:application/octet-stream;base64,{base64.b64encode(buffer_data).decode('ascii')}",
             "byteLength": len(buffer_data)
         }]
     }
     
+    if quantize:
+        gltf_quantize.add_extension(gltf)
+    if dds_uri:
+        gltf.setdefault("extensionsUsed", []).append("MSFT_texture_dds")
+        if not texture_b64:
+            gltf.setdefault("extensionsRequired", []).append("MSFT_texture_dds")
+    
     os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
     with open(output_path, "w") as f:
         json.dump(gltf, f)
@@ -330,8 +514,213 @@ def generate_terrain_gltf(heights, color_image, output_path, chunk_name, grid_si
     return True
 
 
-def process_chunk(chunk_name, output_dir, conn=None, silent=False):
-    """Process a single chunk by name."""
+def generate_terrain_gltf(heights, color_image, output_path, chunk_name, grid_size=512, tolerance=None,
+                          **write_options):
+    """
+    Generate a glTF terrain mesh with texture.
+    
+    With `tolerance` (world units) the mesh is simplified with an RTIN instead of
+    emitting every grid sample, and skirted to cover the allowed edge error.
+    write_options are passed through to write_terrain_gltf (dds_uri, quantize, report).
+    """
+    if tolerance is not None:
+        vertices_arr, normals_arr, uvs_arr, indices_arr = build_rtin_mesh(heights, grid_size, tolerance)
+        vertices_arr, normals_arr, uvs_arr, indices_arr = add_skirt(
+            vertices_arr, normals_arr, uvs_arr, indices_arr, max(SKIRT_MIN_DEPTH, 2.0 * tolerance)
+        )
+    else:
+        sample_idx = np.arange(grid_size)
+        vertices_arr, normals_arr, uvs_arr, indices_arr = build_grid_mesh(heights, sample_idx, grid_size)
+    return write_terrain_gltf(
+        vertices_arr, normals_arr, uvs_arr, indices_arr, color_image, output_path, chunk_name, **write_options
+    )
+
+
+def lod_output_path(output_dir, chunk_name, lod_size):
+    """Path of a decimated terrain LOD next to the full-resolution glTF."""
+    return os.path.join(output_dir, f"{chunk_name}_terrain_lod{lod_size}.gltf")
+
+
+def generate_terrain_lods(heights, color_image, output_dir, chunk_name, grid_size=512, lod_sizes=LOD_SIZES,
+                          **write_options):
+    """
+    Generate the decimated LOD pyramid for a chunk (see TERRAIN_GUIDE.md Section 4.1).
+    
+    Each LOD keeps lod_size x lod_size full-resolution samples spread evenly across
+    the chunk and carries a skirt deep enough to cover its own edge error twice over,
+    which hides cracks against a neighbour at any other LOD.
+    Returns {lod_size: output_path}.
+    """
+    normals = compute_terrain_normals(heights)
+    paths = {}
+    for lod_size in lod_sizes:
+        if lod_size >= grid_size:
+            continue
+        sample_idx = np.unique(np.round(np.linspace(0, grid_size - 1, lod_size)).astype(np.intp))
+        vertices_arr, normals_arr, uvs_arr, indices_arr = build_grid_mesh(
+            heights, sample_idx, grid_size, normals=normals
+        )
+        
+        # Edge error: full-resolution border profile vs. the linear LOD edge
+        edge_error = 0.0
+        for profile in (heights[0, :], heights[-1, :], heights[:, 0], heights[:, -1]):
+            coarse = np.interp(np.arange(grid_size), sample_idx, profile[sample_idx])
+            edge_error = max(edge_error, float(np.abs(profile - coarse).max()) * HEIGHT_SCALE)
+        skirt_depth = max(SKIRT_MIN_DEPTH, 2.0 * edge_error)
+        vertices_arr, normals_arr, uvs_arr, indices_arr = add_skirt(
+            vertices_arr, normals_arr, uvs_arr, indices_arr, skirt_depth
+        )
+        
+        # Coarse LODs don't need the full-resolution texture (a DDS is shared, its mips cover this)
+        lod_image = color_image
+        if color_image is not None:
+            tex_size = min(color_image.width, lod_size * LOD_TEXELS_PER_SAMPLE)
+            if tex_size < color_image.width:
+                lod_image = color_image.resize((tex_size, tex_size), Image.BOX)
+        
+        output_path = lod_output_path(output_dir, chunk_name, lod_size)
+        write_terrain_gltf(
+            vertices_arr, normals_arr, uvs_arr, indices_arr, lod_image, output_path, f"{chunk_name}_lod{lod_size}",
+            **write_options
+        )
+        paths[lod_size] = output_path
+    return paths
+
+
+TERRAIN_CHUNK_COLUMNS = {
+    "lod_paths": "TEXT",
+    "source_hash": "TEXT",
+    "source_size": "INTEGER",
+    "source_mtime": "REAL",
+    "decoder_params": "TEXT",
+    "output_hash": "TEXT",
+    "output_paths": "TEXT",
+}
+
+
+def ensure_terrain_columns(conn):
+    """Add terrain_chunks columns introduced after the original schema (older databases)."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(terrain_chunks)")}
+    if not existing:
+        return
+    for column, column_type in TERRAIN_CHUNK_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE terrain_chunks ADD COLUMN {column} {column_type}")
+    conn.commit()
+
+
+def file_sha256(paths):
+    """SHA-256 over one or more files, streamed in 1 MB blocks."""
+    digest = hashlib.sha256()
+    for path in ([paths] if isinstance(paths, str) else paths):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def decoder_params(lods=True, tolerance=None, texture_format="png", png_fallback=True, quantize=False):
+    """
+    Everything besides the VGR bytes that determines a chunk's outputs, as canonical JSON.
+    A chunk is rebuilt whenever this string differs from the one stored with it.
+    """
+    return json.dumps({
+        "version": TERRAIN_DECODER_VERSION,
+        "column_shift": COLUMN_SHIFT,
+        "height_scale": HEIGHT_SCALE,
+        "terrain_scale": TERRAIN_SCALE,
+        "lod_sizes": LOD_SIZES if lods else [],
+        "skirt_min_depth": SKIRT_MIN_DEPTH,
+        "lod_texels_per_sample": LOD_TEXELS_PER_SAMPLE,
+        "tolerance": tolerance,
+        "texture_format": texture_format,
+        "png_fallback": png_fallback,
+        "quantize": quantize,
+    }, sort_keys=True)
+
+
+def source_fingerprint(vgr_path, previous=None):
+    """
+    (sha256, size, mtime) of a VGR file.
+
+    The hash of `previous` (a terrain_chunks row) is reused when size and mtime
+    are unchanged, so up-to-date checks don't re-read every VGR.
+    """
+    stat = os.stat(vgr_path)
+    if previous and previous["source_hash"] and \
+            previous["source_size"] == stat.st_size and previous["source_mtime"] == stat.st_mtime:
+        return previous["source_hash"], stat.st_size, stat.st_mtime
+    return file_sha256(vgr_path), stat.st_size, stat.st_mtime
+
+
+def output_fingerprint(paths):
+    """[[path, size, mtime], ...] for a chunk's output files, stored as output_paths."""
+    fingerprint = []
+    for path in paths:
+        stat = os.stat(path)
+        fingerprint.append([path, stat.st_size, stat.st_mtime])
+    return fingerprint
+
+
+def get_terrain_row(conn, chunk_name):
+    """(chunks.id, latest terrain_chunks row as a dict or None) for a chunk name."""
+    chunk_row = conn.execute(
+        "SELECT id FROM chunks WHERE filename = ? OR filename = ?",
+        (chunk_name, chunk_name + ".vgr")
+    ).fetchone()
+    if not chunk_row:
+        return None, None
+    cursor = conn.execute("""
+        SELECT export_path, lod_paths, source_hash, source_size, source_mtime, decoder_params,
+               output_hash, output_paths
+        FROM terrain_chunks WHERE chunk_id = ? ORDER BY id DESC LIMIT 1
+    """, (chunk_row[0],))
+    row = cursor.fetchone()
+    if row is None:
+        return chunk_row[0], None
+    return chunk_row[0], dict(zip([d[0] for d in cursor.description], row))
+
+
+def is_up_to_date(previous, source_hash, params):
+    """
+    True when a stored terrain row matches the source/decoder and every file it
+    wrote (glTF, LODs and the shared DDS texture) is unchanged.
+
+    Outputs are compared by size and mtime against output_paths; only when an
+    mtime moved (same size) are they re-hashed against output_hash, the same
+    reuse source_fingerprint does for the VGR.
+    """
+    if not previous or not previous["output_hash"] or not previous["output_paths"]:
+        return False
+    if previous["source_hash"] != source_hash or previous["decoder_params"] != params:
+        return False
+    outputs = json.loads(previous["output_paths"])
+    if not outputs or not all(isinstance(entry, list) and os.path.exists(entry[0]) for entry in outputs):
+        return False
+    current = output_fingerprint(entry[0] for entry in outputs)
+    if any(now[1] != then[1] for now, then in zip(current, outputs)):
+        return False
+    if current == outputs:
+        return True
+    return file_sha256([entry[0] for entry in outputs]) == previous["output_hash"]
+
+
+def process_chunk(chunk_name, output_dir, conn=None, silent=False, lods=True, tolerance=None,
+                  texture_format="png", png_fallback=True, world_writer=None, quantize=False, report=None,
+                  force=False):
+    """
+    Process a single chunk by name.
+    
+    With a database connection, chunks whose VGR hash and decoder_params() match
+    the stored row (and whose outputs are unchanged) are skipped unless force=True; the
+    result then has "skipped": True.
+    
+    texture_format="dds" writes the color texture's original DXT blocks and mip
+    chain to {chunk}_terrain_color.dds and references it via MSFT_texture_dds;
+    png_fallback=False skips decoding the PNG fallback entirely.
+    world_writer (a ue2.world.WorldHeightfieldWriter) collects the corrected heights.
+    quantize writes KHR_mesh_quantization glTFs; `report` collects the max errors.
+    """
     vgr_path = os.path.join(VANGUARD_MAPS, f"{chunk_name}.vgr")
     
     if not os.path.exists(vgr_path):
@@ -341,6 +730,19 @@ def process_chunk(chunk_name, output_dir, conn=None, silent=False):
         print(f"  {chunk_name}...", end=" ", flush=True)
     
     try:
+        chunk_id, previous, source = None, None, None
+        params = decoder_params(lods, tolerance, texture_format, png_fallback, quantize)
+        if conn:
+            chunk_id, previous = get_terrain_row(conn, chunk_name)
+            source = source_fingerprint(vgr_path, previous)
+            if not force and is_up_to_date(previous, source[0], params):
+                # A missing world tile falls through to a full rebuild of the chunk
+                if world_writer is None or world_writer.copy_existing(chunk_name):
+                    if not silent:
+                        print("UP TO DATE")
+                    lod_paths = {int(k): v for k, v in json.loads(previous["lod_paths"] or "{}").items()}
+                    return {"chunk_name": chunk_name, "skipped": True, "lod_paths": lod_paths}
+        
         pkg = UE2Package(vgr_path)
         
         # Extract heightmap
@@ -350,37 +752,63 @@ def process_chunk(chunk_name, output_dir, conn=None, silent=False):
                 print("NO HEIGHTMAP")
             return None
         
+        if world_writer is not None:
+            world_writer.add(chunk_name, heights)
+        
         # Extract color texture (optional)
-        color_image = extract_color_texture(pkg, chunk_name)
+        dds_uri = None
+        if texture_format == "dds":
+            dds_data = extract_color_dds(pkg, chunk_name)
+            if dds_data:
+                dds_uri = f"{chunk_name}_terrain_color.dds"
+                with open(os.path.join(output_dir, dds_uri), "wb") as f:
+                    f.write(dds_data)
+        color_image = None
+        if texture_format == "png" or png_fallback or dds_uri is None:
+            color_image = extract_color_texture(pkg, chunk_name)
         
         # Generate glTF
+        write_options = {"dds_uri": dds_uri, "quantize": quantize, "report": report}
         output_path = os.path.join(output_dir, f"{chunk_name}_terrain.gltf")
-        generate_terrain_gltf(heights, color_image, output_path, chunk_name, grid_size)
+        generate_terrain_gltf(
+            heights, color_image, output_path, chunk_name, grid_size, tolerance=tolerance, **write_options
+        )
+        
+        # Generate decimated LODs
+        lod_paths = {}
+        if lods:
+            lod_paths = generate_terrain_lods(
+                heights, color_image, output_dir, chunk_name, grid_size, **write_options
+            )
         
         # Save to database
-        if conn:
+        if conn and chunk_id is not None:
             try:
-                cursor = conn.cursor()
-                chunk_row = cursor.execute(
-                    "SELECT id FROM chunks WHERE filename = ? OR filename = ?",
-                    (chunk_name, chunk_name + ".vgr")
-                ).fetchone()
-                
-                if chunk_row:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO terrain_chunks 
-                        (chunk_id, grid_size, gltf_exported, export_path)
-                        VALUES (?, ?, 1, ?)
-                    """, (chunk_row[0], grid_size, output_path))
-                    conn.commit()
+                outputs = [output_path] + [lod_paths[size] for size in sorted(lod_paths)]
+                if dds_uri:
+                    outputs.append(os.path.join(output_dir, dds_uri))
+                # chunk_id is not UNIQUE, so replace the row explicitly
+                conn.execute("DELETE FROM terrain_chunks WHERE chunk_id = ?", (chunk_id,))
+                conn.execute("""
+                    INSERT INTO terrain_chunks 
+                    (chunk_id, grid_size, height_scale, terrain_scale, gltf_exported, export_path, lod_paths,
+                     source_hash, source_size, source_mtime, decoder_params, output_hash, output_paths)
+                    VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    chunk_id, grid_size, HEIGHT_SCALE, TERRAIN_SCALE, output_path,
+                    json.dumps({str(size): path for size, path in lod_paths.items()}),
+                    source[0], source[1], source[2], params,
+                    file_sha256(outputs), json.dumps(output_fingerprint(outputs))
+                ))
+                conn.commit()
             except Exception:
                 pass
         
-        color_status = "with texture" if color_image else "no texture"
+        color_status = "dds texture" if dds_uri else "with texture" if color_image else "no texture"
         if not silent:
-            print(f"OK ({grid_size}x{grid_size}, {color_status})")
+            print(f"OK ({grid_size}x{grid_size}, {color_status}, {len(lod_paths)} LODs)")
         
-        return {"chunk_name": chunk_name, "grid_size": grid_size}
+        return {"chunk_name": chunk_name, "grid_size": grid_size, "lod_paths": lod_paths}
     
     except Exception as e:
         if not silent:
@@ -406,11 +834,26 @@ def main():
     parser.add_argument("--chunk", type=str, help="Process single chunk by name")
     parser.add_argument("--silent", action="store_true", help="Suppress all output except errors")
     parser.add_argument("--texture-only", action="store_true", help="Only extract color textures as PNG (faster)")
+    parser.add_argument("--rtin-tolerance", type=float, default=None,
+                        help="Simplify the main mesh with an RTIN, keeping height error under this many world units")
+    parser.add_argument("--texture-format", choices=["png", "dds"], default="png",
+                        help="Color texture output: decoded PNG, or DDS passthrough of the original DXT mips")
+    parser.add_argument("--no-png-fallback", action="store_true",
+                        help="With --texture-format dds, don't embed a decoded PNG fallback")
+    parser.add_argument("--no-world-heightfield", action="store_true",
+                        help="With --all, don't rebuild the global world heightfield")
+    parser.add_argument("--quantize", action="store_true",
+                        help="Write int16/int8/uint16 vertex attributes (KHR_mesh_quantization)")
+    parser.add_argument("--no-lods", action="store_true", help="Skip the decimated LOD pyramid (full-resolution mesh only)")
+    parser.add_argument("--force", action="store_true", help="Rebuild chunks even if their VGR and decoder settings are unchanged")
     args = parser.parse_args()
     
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     conn = sqlite3.connect(DB_PATH) if os.path.exists(DB_PATH) else None
+    if conn:
+        apply_bulk_pragmas(conn)
+        ensure_terrain_columns(conn)
     
     # Texture-only mode: just extract PNGs
     if args.texture_only:
@@ -422,6 +865,15 @@ def main():
                 continue
             try:
                 pkg = UE2Package(vgr_path)
+                if args.texture_format == "dds":
+                    dds_data = extract_color_dds(pkg, chunk)
+                    if dds_data:
+                        with open(os.path.join(OUTPUT_DIR, f"{chunk}_texture.dds"), "wb") as f:
+                            f.write(dds_data)
+                        print(f"  {chunk}: OK")
+                    else:
+                        print(f"  {chunk}: No texture")
+                    continue
                 color_image = extract_color_texture(pkg, chunk)
                 if color_image:
                     out_path = os.path.join(OUTPUT_DIR, f"{chunk}_texture.png")
@@ -442,6 +894,15 @@ def main():
     
     successful = []
     failed = []
+    chunk_options = {
+        "lods": not args.no_lods,
+        "tolerance": args.rtin_tolerance,
+        "texture_format": args.texture_format,
+        "png_fallback": not args.no_png_fallback,
+        "quantize": args.quantize,
+        "report": {} if args.quantize else None,
+        "force": args.force,
+    }
     
     if args.all:
         chunks = get_all_chunks()
@@ -449,17 +910,26 @@ def main():
             print(f"Processing {len(chunks)} chunks...")
             print()
         
+        world_writer = None
+        if not args.no_world_heightfield:
+            world_writer = WorldHeightfieldWriter(WORLD_HEIGHTFIELD, HEIGHT_SCALE, reuse_existing=not args.force)
+        
         total_chunks = len(chunks)
         for i, chunk in enumerate(chunks):
-            result = process_chunk(chunk, OUTPUT_DIR, conn, silent=True)
+            result = process_chunk(chunk, OUTPUT_DIR, conn, silent=True, world_writer=world_writer, **chunk_options)
             if result:
                 successful.append(result)
             else:
                 failed.append(chunk)
             print_progress_bar(i + 1, total_chunks, prefix='   Progress:', suffix=f'({i+1}/{total_chunks})', length=40)
+        
+        if world_writer is not None:
+            world_count = world_writer.close()
+            if not args.silent:
+                print(f"World heightfield: {world_count} chunks -> {WORLD_HEIGHTFIELD}.f32")
     
     elif args.chunk:
-        result = process_chunk(args.chunk, OUTPUT_DIR, conn, silent=args.silent)
+        result = process_chunk(args.chunk, OUTPUT_DIR, conn, silent=args.silent, **chunk_options)
         if result:
             successful.append(result)
         else:
@@ -480,8 +950,13 @@ def main():
         print("=" * 60)
         print("Complete")
         print("=" * 60)
-        print(f"Successful: {len(successful)}")
+        skipped = sum(1 for r in successful if r.get("skipped"))
+        print(f"Successful: {len(successful)} ({skipped} up to date, skipped)")
         print(f"Failed: {len(failed)}")
+        if chunk_options["report"]:
+            report = chunk_options["report"]
+            print(f"Quantization max error: position {report['position']:.3f} units, "
+                  f"normal {report['normal_degrees']:.3f} deg, uv {report['uv']:.2e}")
 
 
 if __name__ == "__main__":
@@ -11,11 +11,16 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path (go up 2 levels from scripts/extractors)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
+from ue2.scan import find_vec3
+from bulk_load import apply_bulk_pragmas
+
 try:
     import config
     DB_PATH = config.DB_PATH
@@ -138,28 +143,14 @@ def parse_chunk_name(filename: str) -> Tuple[Optional[int], Optional[int]]:
 
 
 def extract_position_from_data(obj_data: bytes) -> Optional[Tuple[float, float, float]]:
-    """Extract position from CompoundObject/Actor serialized data."""
-    # Try multiple methods
-    
-    # Method 1: Look for 0x0b marker (common in CompoundObjects)
-    for i in range(40, min(len(obj_data) - 12, 100)):
-        if obj_data[i] == 0x0B:
-            if i + 13 <= len(obj_data):
-                x = struct.unpack('<f', obj_data[i+1:i+5])[0]
-                y = struct.unpack('<f', obj_data[i+5:i+9])[0]
-                z = struct.unpack('<f', obj_data[i+9:i+13])[0]
-                if all(not (v != v) and 1000 < abs(v) < 500000 for v in [x, y, z]):
-                    return (x, y, z)
-    
+    """Extract position from CompoundObject/Actor serialized data (ue2.scan.find_vec3)."""
+    # Method 1: Look for 0x0b marker (common in CompoundObjects), vector follows it
+    position = find_vec3(obj_data, 41, min(len(obj_data) - 11, 101), marker=0x0B)
+    if position:
+        return position
+
     # Method 2: Scan last portion for valid coordinate triplet
-    for j in range(max(0, len(obj_data) - 30), len(obj_data) - 11):
-        x = struct.unpack('<f', obj_data[j:j+4])[0]
-        y = struct.unpack('<f', obj_data[j+4:j+8])[0]
-        z = struct.unpack('<f', obj_data[j+8:j+12])[0]
-        if all(1000 < abs(v) < 500000 for v in [x, y, z]) and not any(v != v for v in [x, y, z]):
-            return (x, y, z)
-    
-    return None
+    return find_vec3(obj_data, max(0, len(obj_data) - 30), len(obj_data) - 11)
 
 
 def parse_vgr_file(filepath: str) -> Dict:
@@ -249,62 +240,103 @@ def parse_vgr_file(filepath: str) -> Dict:
     }
 
 
+def chunk_rows(filepath: str) -> Dict:
+    """
+    Parse one VGR into database rows (worker task, no database access):
+    the chunks row and one exports row per export, positions included.
+    """
+    filename = os.path.basename(filepath)
+    chunk_x, chunk_y = parse_chunk_name(filename)
+    parsed = parse_vgr_file(filepath)
+    exports = []
+    for exp in parsed['exports']:
+        pos = exp.get('position')
+        exports.append((
+            exp['index'], exp['object_name'], exp['class_name'],
+            *(pos if pos else (None, None, None)),
+            exp['serial_offset'], exp['serial_size'],
+        ))
+    return {
+        'chunk': (filename, filepath, chunk_x, chunk_y,
+                  parsed['name_count'], parsed['export_count'], parsed['import_count']),
+        'exports': exports,
+    }
+
+
+def iter_chunk_results(files: List[str], workers: int = 1, task=chunk_rows):
+    """
+    Yield (filepath, task() result or the Exception it raised) in file order.
+    With workers > 1, chunks are parsed in a process pool; the caller stays the only writer.
+    """
+    if workers <= 1:
+        for filepath in files:
+            try:
+                yield filepath, task(filepath)
+            except Exception as e:
+                yield filepath, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(task, filepath) for filepath in files]
+        for filepath, future in zip(files, futures):
+            try:
+                yield filepath, future.result()
+            except Exception as e:
+                yield filepath, e
+
+
+def upsert_chunk(cursor: sqlite3.Cursor, chunk_row: Tuple) -> int:
+    """
+    Insert or update a chunk by filename and return its id.
+    The id is kept on re-runs (INSERT OR REPLACE would assign a new one and
+    orphan rows pointing at the old id).
+    """
+    cursor.execute("""
+        INSERT INTO chunks (filename, filepath, chunk_x, chunk_y, name_count, export_count, import_count)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(filename) DO UPDATE SET
+            filepath = excluded.filepath,
+            chunk_x = excluded.chunk_x,
+            chunk_y = excluded.chunk_y,
+            name_count = excluded.name_count,
+            export_count = excluded.export_count,
+            import_count = excluded.import_count
+    """, chunk_row)
+    return cursor.execute("SELECT id FROM chunks WHERE filename = ?", (chunk_row[0],)).fetchone()[0]
+
+
+def store_chunk_rows(conn, rows: Dict) -> int:
+    """Replace one chunk's exports in a single transaction; returns the placed-object count."""
+    with conn:
+        cursor = conn.cursor()
+        chunk_id = upsert_chunk(cursor, rows['chunk'])
+        cursor.execute("DELETE FROM exports WHERE chunk_id = ?", (chunk_id,))
+        cursor.executemany("""
+            INSERT INTO exports
+            (chunk_id, export_index, object_name, class_name,
+             position_x, position_y, position_z,
+             serial_offset, serial_size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(chunk_id, *row) for row in rows['exports']])
+    return sum(1 for row in rows['exports'] if row[3] is not None)
+
+
 def process_chunk_file(conn, filepath: str, silent=False):
     """Process a single VGR file and store in database."""
     filename = os.path.basename(filepath)
-    chunk_x, chunk_y = parse_chunk_name(filename)
     
     if not silent:
         print(f"  Parsing {filename}...", end=" ")
     
     try:
-        parsed = parse_vgr_file(filepath)
+        rows = chunk_rows(filepath)
     except Exception as e:
         print(f"ERROR: {e}")
         return 0
     
-    cursor = conn.cursor()
-    
-    # Insert or update chunk
-    cursor.execute("""
-        INSERT OR REPLACE INTO chunks 
-        (filename, filepath, chunk_x, chunk_y, name_count, export_count, import_count)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (
-        filename, filepath, chunk_x, chunk_y,
-        parsed['name_count'], parsed['export_count'], parsed['import_count']
-    ))
-    
-    chunk_id = cursor.lastrowid or cursor.execute(
-        "SELECT id FROM chunks WHERE filename = ?", (filename,)
-    ).fetchone()[0]
-    
-    # Clear old exports for this chunk
-    cursor.execute("DELETE FROM exports WHERE chunk_id = ?", (chunk_id,))
-    
-    # Insert exports with positions
-    placed_count = 0
-    for exp in parsed['exports']:
-        pos = exp.get('position')
-        cursor.execute("""
-            INSERT INTO exports
-            (chunk_id, export_index, object_name, class_name, 
-             position_x, position_y, position_z,
-             serial_offset, serial_size)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            chunk_id, exp['index'], exp['object_name'], exp['class_name'],
-            pos[0] if pos else None,
-            pos[1] if pos else None,
-            pos[2] if pos else None,
-            exp['serial_offset'], exp['serial_size']
-        ))
-        if pos:
-            placed_count += 1
-    
-    conn.commit()
+    placed_count = store_chunk_rows(conn, rows)
     if not silent:
-        print(f"OK ({parsed['export_count']} exports, {placed_count} with positions)")
+        print(f"OK ({len(rows['exports'])} exports, {placed_count} with positions)")
     return placed_count
 
 
@@ -314,7 +346,10 @@ def main():
     parser.add_argument('--file', help="Process specific chunk file")
     parser.add_argument('--limit', type=int, help="Limit number of files to process")
     parser.add_argument('--silent', action='store_true', help="Suppress all output except errors")
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help="Parse chunks in N worker processes (0 = one per CPU); the main process writes")
     args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
     
     if not args.silent:
         print("=" * 60)
@@ -326,6 +361,7 @@ def main():
     
     # Connect to database
     conn = sqlite3.connect(DB_PATH)
+    apply_bulk_pragmas(conn)
     create_tables(conn)
     
     # Find VGR files
@@ -340,18 +376,20 @@ def main():
     
     if args.limit:
         vgr_files = vgr_files[:args.limit]
+    vgr_files = [f for f in vgr_files if os.path.exists(f)]
     
     if not args.silent:
-        print(f"Found {len(vgr_files)} chunk files to process")
+        print(f"Found {len(vgr_files)} chunk files to process ({workers} worker{'s' if workers > 1 else ''})")
         print()
     
     total_placed = 0
     total_files = len(vgr_files)
-    
-    for i, filepath in enumerate(vgr_files):
-        if os.path.exists(filepath):
-            total_placed += process_chunk_file(conn, filepath, silent=True)
-            print_progress_bar(i + 1, total_files, prefix='   Progress:', suffix=f'({i+1}/{total_files})', length=40)
+    for i, (filepath, rows) in enumerate(iter_chunk_results(vgr_files, workers)):
+        if isinstance(rows, Exception):
+            print(f"\n  {os.path.basename(filepath)}: ERROR: {rows}")
+        else:
+            total_placed += store_chunk_rows(conn, rows)
+        print_progress_bar(i + 1, total_files, prefix='   Progress:', suffix=f'({i+1}/{total_files})', length=40)
     
     if not args.silent:
         # Summary
@@ -13,6 +13,8 @@ from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 import base64
 
+import numpy as np
+
 # Add parent directory to path to allow importing ue2 package
 # Add project root to path (go up 2 levels from scripts/extractors or scripts/generators)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -32,9 +34,6 @@ class HeightmapExtractor:
     # Removed read_compact_index and read_fstring (used internal UE2Package now)
     # Removed parse_package (UE2Package handles this)
 
-    def find_heightmap_textures(self) -> List[Dict]:
-        """Find all heightmap texture exports."""
-        heightmaps = []
     def find_heightmap_textures(self) -> List[Dict]:
         """Find all heightmap texture exports."""
         heightmaps = []
@@ -43,60 +42,38 @@ class HeightmapExtractor:
                 heightmaps.append(exp)
         return heightmaps
 
-    def extract_g16_texture(self, export: Dict) -> Optional[List[int]]:
+    def extract_g16_texture(self, export: Dict, tile_size: int = 128) -> Optional[np.ndarray]:
         """
         Extract 16-bit grayscale texture data.
-        Returns list of height values (0-65535).
+        Returns a (tile_size, tile_size) uint16 array of height values (0-65535), [y, x].
         """
-        offset = export["serial_offset"]
-        size = export["serial_size"]
-
-        if size <= 0:
-            return None
-
-        if size <= 0:
+        if export["serial_size"] <= 0:
             return None
 
         # Read the texture data
         tex_data = self.pkg.get_export_data(export)
 
-        # UE2 texture format: properties followed by mip data
-        # Skip properties and find the raw pixel data
-        # The texture is likely 128x128 or 256x256 16-bit values
-
-        # Try to find the mip data - look for size that matches expected dimensions
-        # 128x128 * 2 bytes = 32768 bytes
-        # 256x256 * 2 bytes = 131072 bytes
-
-        # The data size is 32979 bytes, which is close to 32768 + some header
-        # Let's try to extract the last 32768 bytes as 128x128 16-bit heightmap
-
-        expected_size = 128 * 128 * 2  # 32768 bytes for 128x128 16-bit
+        # UE2 texture format: properties followed by mip data.
+        # The data size is e.g. 32979 bytes for a 128x128 tile (32768 + header),
+        # so the raw pixels are the last tile_size * tile_size * 2 bytes.
+        expected_size = tile_size * tile_size * 2
 
-        if len(tex_data) >= expected_size:
-            # Try reading from the end (mip data is usually at the end)
-            raw_start = len(tex_data) - expected_size
-            raw_data = tex_data[raw_start:]
-
-            heights = []
-            for i in range(0, len(raw_data), 2):
-                if i + 2 <= len(raw_data):
-                    height = struct.unpack("<H", raw_data[i : i + 2])[0]
-                    heights.append(height)
-
-            return heights
+        if len(tex_data) < expected_size:
+            return None
 
-        return None
+        raw_data = tex_data[len(tex_data) - expected_size:]
+        return np.frombuffer(raw_data, dtype="<u2").reshape(tile_size, tile_size)
 
-    def get_heightmap_grid(self) -> Tuple[List[List[int]], int, int]:
+    def get_heightmap_grid(self) -> Tuple[np.ndarray, int, int]:
         """
         Extract and assemble the full heightmap grid from all tiles.
-        Returns (grid, width, height) where grid[y][x] = height value.
+        Returns (grid, width, height) where grid[y, x] = height value (uint16 array).
         """
+        empty = np.zeros((0, 0), dtype=np.uint16)
         heightmaps = self.find_heightmap_textures()
 
         if not heightmaps:
-            return [], 0, 0
+            return empty, 0, 0
 
         # Parse tile coordinates from names like "chunk_n10_n10Height_8_1"
         tiles = {}
@@ -114,7 +91,7 @@ class HeightmapExtractor:
                     continue
 
         if not tiles:
-            return [], 0, 0
+            return empty, 0, 0
 
         # Find grid dimensions
         max_x = max(t[0] for t in tiles.keys()) + 1
@@ -125,27 +102,24 @@ class HeightmapExtractor:
         # Tile size (assuming 128x128)
         tile_size = 128
 
-        # Create full grid
+        # Create full grid and place each tile by slice assignment
         full_width = max_x * tile_size
         full_height = max_y * tile_size
-        grid = [[0] * full_width for _ in range(full_height)]
+        grid = np.zeros((full_height, full_width), dtype=np.uint16)
 
-        # Fill in each tile
         for (tile_x, tile_y), hm in tiles.items():
-            heights = self.extract_g16_texture(hm)
-            if heights and len(heights) == tile_size * tile_size:
-                for y in range(tile_size):
-                    for x in range(tile_size):
-                        grid_x = tile_x * tile_size + x
-                        grid_y = tile_y * tile_size + y
-                        if grid_y < full_height and grid_x < full_width:
-                            grid[grid_y][grid_x] = heights[y * tile_size + x]
+            if tile_x < 0 or tile_y < 0:
+                continue
+            heights = self.extract_g16_texture(hm, tile_size)
+            if heights is not None:
+                y0, x0 = tile_y * tile_size, tile_x * tile_size
+                grid[y0:y0 + tile_size, x0:x0 + tile_size] = heights
 
         return grid, full_width, full_height
 
 
 def heightmap_to_gltf(
-    grid: List[List[int]],
+    grid: np.ndarray,
     width: int,
     height: int,
     output_path: str,
@@ -157,13 +131,14 @@ def heightmap_to_gltf(
     Convert a heightmap grid to a glTF terrain mesh.
 
     Args:
-        grid: 2D list of height values
+        grid: 2D array of height values, grid[y, x] (nested lists are accepted too)
         width, height: Grid dimensions
         output_path: Output glTF file path
         scale: XZ scale factor
         height_scale: Y (height) scale factor
     """
-    if not grid or width == 0 or height == 0:
+    grid = np.asarray(grid)
+    if grid.size == 0 or width == 0 or height == 0:
         print("Error: Empty heightmap grid")
         return False
 
@@ -174,59 +149,48 @@ def heightmap_to_gltf(
 
     print(f"Generating terrain mesh: {mesh_width}x{mesh_height} vertices")
 
-    # Generate vertices
-    positions = []
-    uvs = []
-
-    for z in range(mesh_height):
-        for x in range(mesh_width):
-            src_x = x * step
-            src_z = z * step
-
-            if src_z < len(grid) and src_x < len(grid[src_z]):
-                h = grid[src_z][src_x]
-            else:
-                h = 0
-
-            # Position (centered, Y-up for glTF)
-            px = (x - mesh_width / 2) * scale
-            py = h * height_scale
-            pz = (z - mesh_height / 2) * scale
-
-            positions.extend([px, py, pz])
-            uvs.extend([x / mesh_width, z / mesh_height])
-
-    # Generate indices (triangle strip converted to triangles)
-    indices = []
-    for z in range(mesh_height - 1):
-        for x in range(mesh_width - 1):
-            i0 = z * mesh_width + x
-            i1 = i0 + 1
-            i2 = i0 + mesh_width
-            i3 = i2 + 1
-
-            # Two triangles per quad
-            indices.extend([i0, i2, i1])
-            indices.extend([i1, i2, i3])
+    # Generate vertices (sample every step-th height; samples outside the grid are 0)
+    padded = np.zeros((mesh_height * step, mesh_width * step), dtype=np.float64)
+    rows = min(grid.shape[0], padded.shape[0])
+    cols = min(grid.shape[1], padded.shape[1])
+    padded[:rows, :cols] = grid[:rows, :cols]
+    sampled = padded[::step, ::step]
+
+    z_idx, x_idx = np.meshgrid(np.arange(mesh_height), np.arange(mesh_width), indexing="ij")
+
+    # Position (centered, Y-up for glTF)
+    positions = np.column_stack([
+        ((x_idx - mesh_width / 2) * scale).ravel(),
+        (sampled * height_scale).ravel(),
+        ((z_idx - mesh_height / 2) * scale).ravel(),
+    ])
+    uvs = np.column_stack([
+        (x_idx / mesh_width).ravel(),
+        (z_idx / mesh_height).ravel(),
+    ]).astype("<f4")
+
+    # Generate indices (two triangles per quad)
+    qz, qx = np.meshgrid(np.arange(mesh_height - 1), np.arange(mesh_width - 1), indexing="ij")
+    i0 = (qz * mesh_width + qx).ravel()
+    i1 = i0 + 1
+    i2 = i0 + mesh_width
+    i3 = i2 + 1
+    indices = np.column_stack([i0, i2, i1, i1, i2, i3]).ravel()
 
     # Calculate bounds
-    min_pos = [float("inf")] * 3
-    max_pos = [float("-inf")] * 3
-    for i in range(0, len(positions), 3):
-        for j in range(3):
-            min_pos[j] = min(min_pos[j], positions[i + j])
-            max_pos[j] = max(max_pos[j], positions[i + j])
+    min_pos = positions.min(axis=0).tolist()
+    max_pos = positions.max(axis=0).tolist()
 
     # Pack binary data
-    position_bytes = struct.pack(f"<{len(positions)}f", *positions)
-    uv_bytes = struct.pack(f"<{len(uvs)}f", *uvs)
+    position_bytes = positions.astype("<f4").tobytes()
+    uv_bytes = uvs.tobytes()
 
-    vertex_count = len(positions) // 3
+    vertex_count = len(positions)
     if vertex_count <= 65535:
-        index_bytes = struct.pack(f"<{len(indices)}H", *indices)
+        index_bytes = indices.astype("<u2").tobytes()
         index_component_type = 5123  # UNSIGNED_SHORT
     else:
-        index_bytes = struct.pack(f"<{len(indices)}I", *indices)
+        index_bytes = indices.astype("<u4").tobytes()
         index_component_type = 5125  # UNSIGNED_INT
 
     # Build buffer
@@ -381,7 +345,7 @@ def main():
     # Extract full heightmap grid
     grid, width, height = extractor.get_heightmap_grid()
     
-    if grid:
+    if grid.size:
         print(f"Extracted heightmap: {width}x{height}")
         
         # Generate terrain mesh
@@ -9,17 +9,21 @@ import sys
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
 try:
     from ue2.properties import main
+    from bulk_load import apply_bulk_pragmas
     if __name__ == "__main__":
         # Pass any arguments to the property parser
         import sys
         # By default, we might want to limit for setup.py if it's too slow,
         # but the user said "properties should be part of setup.py",
         # implying they want the full run.
-        main()
+        # Under setup.py's bulk load this also sets the busy timeout, since
+        # stages run concurrently with other writers.
+        main(on_connect=apply_bulk_pragmas)
 except ImportError as e:
     print(f"Error: Could not import ue2.properties: {e}")
     sys.exit(1)
@@ -11,17 +11,21 @@ from pathlib import Path
 
 # Add project root to path (go up 2 levels from scripts/extractors)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
 # Add current directory for local imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from extract_bsp import UE2Package
 
+from bulk_load import apply_bulk_pragmas
 import config
 
 # Use canonical database
 DB_PATH = config.DB_PATH
 ASSETS_DIR = config.ASSETS_PATH
+COMMIT_EVERY_FILES = 100  # Packages parsed per write transaction
+MESH_REF_CLASSES = ("StaticMesh", "Prefab", "CompoundObjectPrefab", "CompoundObject")
 
 
 def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, length=40, fill='█', print_end="\r"):
@@ -36,12 +40,40 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
         print()
 
 
+def package_rows(file_path):
+    """mesh_index rows for one package: exports that can be mesh_refs."""
+    rel_path = os.path.relpath(file_path, ASSETS_DIR)
+    file_ext = file_path.suffix.lower()
+    pkg = UE2Package(str(file_path))
+    return [
+        (exp.get("object_name"), exp.get("class_name"), rel_path, file_ext)
+        for exp in pkg.exports
+        if exp.get("class_name") in MESH_REF_CLASSES
+    ]
+
+
+def store_rows(conn, rows):
+    """Insert a batch of mesh_index rows in one short transaction."""
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO mesh_index (object_name, class_name, package_path, file_type) VALUES (?, ?, ?, ?)",
+            rows
+        )
+
+
 def scan_files(silent=False):
-    """Scan all mesh packages and populate mesh_index table."""
+    """
+    Scan all mesh packages and populate mesh_index table.
+    Packages are parsed outside any transaction; each batch of
+    COMMIT_EVERY_FILES packages is then written with one executemany, so the
+    write lock is only held briefly (setup.py runs other stages concurrently).
+    """
     conn = sqlite3.connect(DB_PATH, timeout=30)
+    apply_bulk_pragmas(conn)
     
     # Clear existing mesh_index entries
-    conn.execute("DELETE FROM mesh_index")
+    with conn:
+        conn.execute("DELETE FROM mesh_index")
     
     extensions = {".usx": "StaticMesh", ".vgr": "Map", ".prefab": "Prefab", ".upk": "Package"}
     files = []
@@ -51,35 +83,24 @@ def scan_files(silent=False):
     if not silent:
         print(f"   Found {len(files)} files to index...")
     
+    count = 0
+    pending = []
     total_files = len(files)
     for i, file_path in enumerate(files):
-        if i % 100 == 0 and i > 0:
-            conn.commit()
-            
         print_progress_bar(i + 1, total_files, prefix='   Progress:', suffix=f'({i+1}/{total_files})', length=40)
-            
-        rel_path = os.path.relpath(file_path, ASSETS_DIR)
-        file_ext = file_path.suffix.lower()
-        
         try:
-            pkg = UE2Package(str(file_path))
-            # Index all exports that could be mesh references
-            for exp in pkg.exports:
-                obj_name = exp.get("object_name")
-                class_name = exp.get("class_name")
-                
-                # We specifically care about things that can be mesh_refs
-                if class_name in ("StaticMesh", "Prefab", "CompoundObjectPrefab", "CompoundObject"):
-                    conn.execute(
-                        "INSERT OR IGNORE INTO mesh_index (object_name, class_name, package_path, file_type) VALUES (?, ?, ?, ?)",
-                        (obj_name, class_name, rel_path, file_ext)
-                    )
-                    count += 1
+            pending.extend(package_rows(file_path))
         except Exception:
             # Skip if file can't be parsed (corrupt or non-UE2)
-            continue
-            
-    conn.commit()
+            pass
+        if (i + 1) % COMMIT_EVERY_FILES == 0 and pending:
+            store_rows(conn, pending)
+            count += len(pending)
+            pending = []
+    
+    if pending:
+        store_rows(conn, pending)
+        count += len(pending)
     conn.close()
     if not silent:
         print(f"   ✓ Indexed {count} mesh objects from {len(files)} files")
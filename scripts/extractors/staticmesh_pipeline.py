@@ -12,6 +12,9 @@ Usage:
     python staticmesh_pipeline.py                    # Parse all files
     python staticmesh_pipeline.py --file Ra44.usx   # Parse specific file
     python staticmesh_pipeline.py --export-only     # Only export glTF, no db update
+    python staticmesh_pipeline.py --workers 8       # Parse/export in 8 processes, single DB writer
+    python staticmesh_pipeline.py --bounds-only     # Header scan: fill mesh_bounds only
+    python staticmesh_pipeline.py --profile         # Per-step parse timings -> parse_profile
 """
 
 import os
@@ -19,14 +22,16 @@ import sys
 import json
 import glob
 import sqlite3
-import struct
 import argparse
-import math
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from dataclasses import dataclass, asdict
 
 from typing import List, Optional, Dict, Any, Tuple
 
+import numpy as np
+
 
 # Add paths
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -37,7 +42,11 @@ sys.path.insert(0, os.path.join(SCRIPTS_DIR, 'lib'))
 sys.path.insert(0, PROJECT_ROOT)
 
 from ue2 import UE2Package
-from staticmesh_construct import parse_staticmesh, find_none_terminator
+from staticmesh_construct import parse_staticmesh, find_none_terminator, LOD_VERTEX_DTYPE, ParseProfile
+import gltf_quantize
+import mesh_optimize
+import region_store
+from bulk_load import apply_bulk_pragmas, bulk_load_enabled
 
 # Configuration
 import config
@@ -45,6 +54,19 @@ import config
 CANONICAL_DB = config.DB_PATH
 MESHES_DIR = os.path.join(config.ASSETS_PATH, "Meshes")
 OUTPUT_DIR = config.MESH_BUILDINGS_DIR  # Where glTF files go
+MESH_STORE_DIR = os.path.join(config.MESHES_DIR, "by_hash")  # Content-addressed geometry buffers
+COMMIT_EVERY_PACKAGES = 25  # Writer transaction size (packages per commit)
+MSFT_LOD = "MSFT_lod"
+LOD0_SCREEN_COVERAGE = 0.5  # Screen-height fraction below which LOD 0 hands over (scaled per LOD)
+
+
+def commit_every() -> int:
+    """
+    Packages per commit. Under setup.py's bulk load (synchronous=OFF, so commits
+    are cheap) other stages write concurrently: commit each package so the write
+    lock isn't held while the next one is parsed.
+    """
+    return 1 if bulk_load_enabled() else COMMIT_EVERY_PACKAGES
 
 
 def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, length=40, fill='█', print_end="\r"):
@@ -63,103 +85,210 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
-class ParsedVertex:
-    """Vertex data extracted from LOD model."""
-    x: float
-    y: float 
-    z: float
-    nx: float = 0.0
-    ny: float = 0.0
-    nz: float = 1.0
-    u: float = 0.0
-    v: float = 0.0
+class ParsedMesh:
+    """
+    Complete mesh data ready for glTF export and database storage.
+
+    Slotted and array-backed: geometry lives in contiguous float32 arrays (one row
+    per vertex) plus a uint16 index buffer (uint32 when indices don't fit), so a
+    mesh costs a few fixed-size buffers rather than one object per vertex.
+    """
+    __slots__ = (
+        'name', 'package_path', 'export_index',
+        # Bounds
+        'bbox_min', 'bbox_max', 'bsphere_center', 'bsphere_radius',
+        # LOD geometry
+        'lod_index', 'positions', 'normals', 'tangents', 'bitangents', 'uvs', 'indices',
+        # Parsing metrics
+        'bytes_total', 'bytes_parsed', 'bytes_unknown', 'coverage_pct', 'uses_heuristics', 'uses_skips',
+        # Metadata
+        'internal_version', 'section_count', 'parse_status', 'error_message', 'unknown_regions',
+    )
 
+    def __init__(self, name: str, package_path: str, export_index: int,
+                 bbox_min: Tuple[float, float, float], bbox_max: Tuple[float, float, float],
+                 bsphere_center: Tuple[float, float, float], bsphere_radius: float,
+                 lod_index: int,
+                 positions: Optional[np.ndarray] = None,   # (n, 3)
+                 normals: Optional[np.ndarray] = None,     # (n, 3)
+                 tangents: Optional[np.ndarray] = None,    # (n, 3) TangentX
+                 bitangents: Optional[np.ndarray] = None,  # (n, 3) TangentY
+                 uvs: Optional[np.ndarray] = None,         # (n, 2)
+                 indices: Optional[np.ndarray] = None,     # (m,) triangle list
+                 bytes_total: int = 0, bytes_parsed: int = 0, bytes_unknown: int = 0,
+                 coverage_pct: float = 0.0, uses_heuristics: bool = False, uses_skips: bool = False,
+                 internal_version: int = 0, section_count: int = 0, parse_status: str = 'error',
+                 error_message: Optional[str] = None, unknown_regions: List[Dict] = None):
+        self.name = name
+        self.package_path = package_path
+        self.export_index = export_index
+        self.bbox_min = bbox_min
+        self.bbox_max = bbox_max
+        self.bsphere_center = bsphere_center
+        self.bsphere_radius = bsphere_radius
+        self.lod_index = lod_index
+        self.positions = _float_buffer(positions, 3)
+        self.normals = _float_buffer(normals, 3)
+        self.tangents = _float_buffer(tangents, 3)
+        self.bitangents = _float_buffer(bitangents, 3)
+        self.uvs = _float_buffer(uvs, 2)
+        self.indices = _index_buffer(indices)
+        self.bytes_total = bytes_total
+        self.bytes_parsed = bytes_parsed
+        self.bytes_unknown = bytes_unknown
+        self.coverage_pct = coverage_pct
+        self.uses_heuristics = uses_heuristics
+        self.uses_skips = uses_skips
+        self.internal_version = internal_version
+        self.section_count = section_count
+        self.parse_status = parse_status
+        self.error_message = error_message
+        self.unknown_regions = unknown_regions
 
-@dataclass 
-class ParsedMesh:
-    """Complete mesh data ready for glTF export and database storage."""
-    name: str
-    package_path: str
-    export_index: int
-    # Bounds
-    bbox_min: Tuple[float, float, float]
-    bbox_max: Tuple[float, float, float]
-    bsphere_center: Tuple[float, float, float]
-    bsphere_radius: float
-    # LOD geometry
-    lod_index: int
-    vertices: List[ParsedVertex]
-    indices: List[int]
-    # Parsing metrics
-    bytes_total: int
-    bytes_parsed: int
-    bytes_unknown: int
-    coverage_pct: float
-    uses_heuristics: bool
-    uses_skips: bool
-    # Metadata
-    internal_version: int
-    section_count: int
-    parse_status: str
-    error_message: Optional[str] = None
-    unknown_regions: List[Dict] = None
+    @property
+    def vertex_count(self) -> int:
+        return len(self.positions)
+
+    @property
+    def index_count(self) -> int:
+        return len(self.indices)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the geometry buffers."""
+        return sum(getattr(self, attr).nbytes for attr in
+                   ('positions', 'normals', 'tangents', 'bitangents', 'uvs', 'indices'))
+
+    def __repr__(self) -> str:
+        return (f"ParsedMesh(name={self.name!r}, lod_index={self.lod_index}, "
+                f"vertices={self.vertex_count}, indices={len(self.indices)}, status={self.parse_status!r})")
+
+
+# ParsedMesh fields a MeshRecord copies (everything except geometry)
+MESH_RECORD_FIELDS = (
+    'name', 'package_path', 'export_index',
+    'bbox_min', 'bbox_max', 'bsphere_center', 'bsphere_radius', 'lod_index',
+    'bytes_total', 'bytes_parsed', 'bytes_unknown', 'coverage_pct', 'uses_heuristics', 'uses_skips',
+    'internal_version', 'section_count', 'parse_status', 'error_message', 'unknown_regions',
+)
+
+
+class MeshRecord:
+    """
+    Database-facing summary of a ParsedMesh: every stored field, no geometry.
+    This is what worker processes send back to the writer.
+
+    vertex_count/index_count are always the parsed counts. For a mesh the
+    vertex-cache optimizer rewrote, pass parsed_counts (taken before optimizing):
+    the buffers' own counts then go to optimized_vertex_count/optimized_index_count.
+    """
+    __slots__ = MESH_RECORD_FIELDS + (
+        'vertex_count', 'index_count', 'gltf_exported', 'gltf_path', 'geometry_hash', 'geometry_bytes',
+        'acmr_before', 'acmr_after', 'optimized_vertex_count', 'optimized_index_count',
+    )
+
+    def __init__(self, mesh: ParsedMesh, gltf_exported: bool = False, gltf_path: Optional[str] = None,
+                 geometry_hash: Optional[str] = None, geometry_bytes: int = 0,
+                 acmr_before: Optional[float] = None, acmr_after: Optional[float] = None,
+                 parsed_counts: Optional[Tuple[int, int]] = None):
+        for attr in MESH_RECORD_FIELDS:
+            setattr(self, attr, getattr(mesh, attr))
+        if parsed_counts is None:
+            self.vertex_count = mesh.vertex_count
+            self.index_count = mesh.index_count
+            self.optimized_vertex_count = self.optimized_index_count = None
+        else:
+            self.vertex_count, self.index_count = parsed_counts
+            self.optimized_vertex_count = mesh.vertex_count
+            self.optimized_index_count = mesh.index_count
+        self.gltf_exported = gltf_exported
+        self.gltf_path = gltf_path
+        self.geometry_hash = geometry_hash
+        self.geometry_bytes = geometry_bytes
+        self.acmr_before = acmr_before
+        self.acmr_after = acmr_after
+
+
+def _float_buffer(values: Optional[np.ndarray], width: int) -> np.ndarray:
+    """Contiguous (n, width) float32 copy/view of a vertex attribute."""
+    if values is None:
+        return np.zeros((0, width), dtype=np.float32)
+    return np.ascontiguousarray(values, dtype=np.float32).reshape(-1, width)
+
+
+def _index_buffer(values: Optional[np.ndarray]) -> np.ndarray:
+    """Contiguous uint16 index buffer, widened to uint32 only if an index needs it."""
+    if values is None:
+        return np.zeros(0, dtype=np.uint16)
+    values = np.asarray(values)
+    if len(values) and values.max() >= 0xFFFF:
+        return np.ascontiguousarray(values, dtype=np.uint32)
+    return np.ascontiguousarray(values, dtype=np.uint16)
 
 
 # =============================================================================
 # PARSING
 # =============================================================================
 
-def extract_vertices_from_lod(vertices_raw: bytes, count: int) -> List[ParsedVertex]:
+def lod_geometry(lod: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
     """
-    Extract vertex data from raw LOD vertex bytes.
-    Each Vanguard LOD vertex is 56 bytes:
-    - Position: 3 floats (12 bytes)
-    - Normal: 3 floats (12 bytes)  
-    - UV: 2 floats (8 bytes)
-    - Unknown: 24 bytes
+    ParsedMesh geometry fields from a parse_staticmesh() LOD dict.
+    The LOD's structured vertex array (LOD_VERTEX_DTYPE) is split into per-attribute
+    views without copying; with no LOD, every array is empty.
     """
-    vertices = []
-    VERTEX_SIZE = 56
-    
-    for i in range(count):
-        offset = i * VERTEX_SIZE
-        if offset + 24 > len(vertices_raw):
-            break
-            
-        # Position (12 bytes)
-        x, y, z = struct.unpack('<fff', vertices_raw[offset:offset+12])
-        
-        # For now, assume simple normal and UV layout
-        # This may need refinement based on actual data analysis
-        nx, ny, nz = 0.0, 0.0, 1.0  # Default up
-        u, v = 0.0, 0.0
-        
-        # Try to read normal if enough data
-        if offset + 24 <= len(vertices_raw):
-            nx, ny, nz = struct.unpack('<fff', vertices_raw[offset+12:offset+24])
-            
-        # Try to read UV if enough data
-        if offset + 32 <= len(vertices_raw):
-            u, v = struct.unpack('<ff', vertices_raw[offset+24:offset+32])
-        
-        vertices.append(ParsedVertex(x=x, y=y, z=z, nx=nx, ny=ny, nz=nz, u=u, v=v))
-    
-    return vertices
+    if lod is None or lod.get('vertices') is None:
+        vertices = np.zeros(0, dtype=LOD_VERTEX_DTYPE)
+    else:
+        vertices = lod['vertices']
+    indices = lod.get('indices') if lod else None
+    return {
+        'positions': vertices['position'],
+        'normals': vertices['normal'],
+        'tangents': vertices['tangent_x'],
+        'bitangents': vertices['tangent_y'],
+        'uvs': vertices['uv'],
+        'indices': indices if indices is not None else np.zeros(0, dtype=np.uint16),
+    }
+
+
+def optimize_vertex_cache(mesh: ParsedMesh) -> Dict[str, Any]:
+    """
+    Reorder a mesh in place for the GPU vertex cache (mesh_optimize.optimize_mesh):
+    Tipsify triangle order, first-use vertex order, degenerate triangles and
+    unreferenced vertices dropped. Returns the optimizer stats (ACMR before/after),
+    or None if an index is out of range (heuristic parse): the mesh keeps its
+    original buffers.
+    """
+    if not mesh_optimize.indices_in_range(mesh.indices, mesh.vertex_count):
+        return None
+    indices, vertex_order, stats = mesh_optimize.optimize_mesh(mesh.indices, mesh.vertex_count)
+    for attr in ('positions', 'normals', 'tangents', 'bitangents', 'uvs'):
+        values = getattr(mesh, attr)
+        if len(values) == mesh.vertex_count:
+            setattr(mesh, attr, np.ascontiguousarray(values[vertex_order]))
+    mesh.indices = _index_buffer(indices)
+    return stats
 
 
-def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
+def parse_staticmesh_file(pkg_path: str, region_blobs: bool = False,
+                          profile: Optional[ParseProfile] = None) -> List[ParsedMesh]:
     """
     Parse all StaticMesh exports from a package file.
+    Unknown regions get their absolute file offset; with region_blobs they also
+    carry their bytes zlib-compressed (see region_store). A ParseProfile collects
+    package load time plus parse_staticmesh's per-step timings and paths.
     Returns list of ParsedMesh objects.
     """
     meshes = []
+    t = time.perf_counter()
     
     try:
         pkg = UE2Package(pkg_path)
     except Exception as e:
         print(f"  Error loading package: {e}")
         return meshes
+    if profile:
+        profile.lap("package_load", t)
     
     static_mesh_exports = [e for e in pkg.exports if e['class_name'] == 'StaticMesh']
     
@@ -168,7 +297,12 @@ def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
             data = pkg.get_export_data(exp)
             serial_offset = exp['serial_offset']
             
-            result = parse_staticmesh(data, pkg.names, serial_offset)
+            result = parse_staticmesh(data, pkg.names, serial_offset, profile=profile)
+            for region in result.get('unknown_regions', []):
+                region['abs_offset'] = serial_offset + region['offset_start']
+                if region_blobs:
+                    region['data_zlib'] = region_store.compress_region(
+                        data[region['offset_start']:region['offset_end']])
             
             # Check for skip statuses
             status = result.get('parse_status', 'success')
@@ -182,8 +316,7 @@ def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
                     bsphere_center=(0, 0, 0),
                     bsphere_radius=0,
                     lod_index=0,
-                    vertices=[],
-                    indices=[],
+                    **lod_geometry(),
                     bytes_total=result['bytes_total'],
                     bytes_parsed=result['bytes_parsed'],
                     bytes_unknown=result['bytes_unknown'],
@@ -227,20 +360,6 @@ def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
             lods = result.get('data', {}).get('lods', [])
             
             for lod_idx, lod in enumerate(lods):
-                indices = lod.get('indices', [])
-                vertex_count = lod.get('vertex_count', 0)
-                
-                # Get parsed vertices from the result
-                parsed_verts = lod.get('vertices', [])
-                vertices = []
-                for v in parsed_verts:
-                    vertices.append(ParsedVertex(
-                        x=v.get('x', 0), y=v.get('y', 0), z=v.get('z', 0),
-                        nx=v.get('nx', 0), ny=v.get('ny', 0), nz=v.get('nz', 1),
-                        u=v.get('u', 0), v=v.get('v', 0)
-                    ))
-
-                
                 meshes.append(ParsedMesh(
                     name=exp['object_name'],
                     package_path=pkg_path,
@@ -250,8 +369,7 @@ def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
                     bsphere_center=bsphere_center,
                     bsphere_radius=bsphere_radius,
                     lod_index=lod_idx,
-                    vertices=vertices,
-                    indices=indices,
+                    **lod_geometry(lod),
                     bytes_total=result['bytes_total'],
                     bytes_parsed=result['bytes_parsed'],
                     bytes_unknown=result['bytes_unknown'],
@@ -275,8 +393,7 @@ def parse_staticmesh_file(pkg_path: str) -> List[ParsedMesh]:
                 bsphere_center=(0, 0, 0),
                 bsphere_radius=0,
                 lod_index=0,
-                vertices=[],
-                indices=[],
+                **lod_geometry(),
                 bytes_total=0,
                 bytes_parsed=0,
                 bytes_unknown=0,
@@ -330,7 +447,7 @@ def get_or_create_file_id(conn: sqlite3.Connection, pkg_path: str) -> int:
         VALUES (?, ?, ?, ?, ?, ?)
     """, (rel_path, filename, size, parent, ext, 'Mesh'))
     
-    conn.commit()
+    # Committed with the package's results by the writer
     return cursor.lastrowid
     
 
@@ -345,58 +462,48 @@ def create_parse_session(conn: sqlite3.Connection) -> int:
     return cursor.lastrowid
 
 
-def store_parsed_mesh(conn: sqlite3.Connection, mesh: ParsedMesh, file_id: int, session_id: int):
-    """Store parsed mesh data in the database."""
-    cursor = conn.cursor()
-    
-    # Map parse_status to allowed values
-    status_map = {
-        'success': 'complete',
-        'complete': 'complete',
-        'error': 'error',
-        'skipped_variant_format': 'error',
-        'skipped_populated_stream': 'error',
-    }
-    db_status = status_map.get(mesh.parse_status, 'error')
-    
-    # Insert or update parsed_exports
-    cursor.execute("""
-        INSERT INTO parsed_exports (
-            file_id, export_index, export_name, class_name,
-            serial_offset, serial_size, bytes_parsed, bytes_unknown,
-            parse_status, uses_heuristics, uses_skips,
-            session_id, last_parsed_at, error_message
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(file_id, export_index) DO UPDATE SET
-            bytes_parsed = excluded.bytes_parsed,
-            bytes_unknown = excluded.bytes_unknown,
-            parse_status = excluded.parse_status,
-            uses_heuristics = excluded.uses_heuristics,
-            uses_skips = excluded.uses_skips,
-            session_id = excluded.session_id,
-            last_parsed_at = excluded.last_parsed_at,
-            error_message = excluded.error_message
-    """, (
-        file_id,
-        mesh.export_index,
-        mesh.name,
-        'StaticMesh',
-        0,  # serial_offset - we'd need to track this
-        mesh.bytes_total,
-        mesh.bytes_parsed,
-        mesh.bytes_unknown,
-        db_status,
-        1 if mesh.uses_heuristics else 0,
-        1 if mesh.uses_skips else 0,
-        session_id,
-        datetime.now().isoformat(),
-        mesh.error_message
-    ))
-    
-    parsed_export_id = cursor.lastrowid
-    
-    # Store key fields
-    fields_to_store = [
+# Map parse_status to allowed values
+STATUS_MAP = {
+    'success': 'complete',
+    'complete': 'complete',
+    'error': 'error',
+    'skipped_variant_format': 'error',
+    'skipped_populated_stream': 'error',
+}
+
+UPSERT_PARSED_EXPORT = """
+    INSERT INTO {table} (
+        file_id, export_index, export_name, class_name,
+        serial_offset, serial_size, bytes_parsed, bytes_unknown,
+        parse_status, uses_heuristics, uses_skips, gltf_exported,
+        session_id, last_parsed_at, error_message
+    ) {values}
+    ON CONFLICT(file_id, export_index) DO UPDATE SET
+        bytes_parsed = excluded.bytes_parsed,
+        bytes_unknown = excluded.bytes_unknown,
+        parse_status = excluded.parse_status,
+        uses_heuristics = excluded.uses_heuristics,
+        uses_skips = excluded.uses_skips,
+        gltf_exported = excluded.gltf_exported,
+        session_id = excluded.session_id,
+        last_parsed_at = excluded.last_parsed_at,
+        error_message = excluded.error_message
+"""
+
+UPSERT_PARSED_FIELD = """
+    INSERT INTO parsed_fields (
+        parsed_export_id, field_path, field_type,
+        value_int, value_float, is_unknown
+    ) {values}
+    ON CONFLICT(parsed_export_id, field_path, array_index) DO UPDATE SET
+        value_int = excluded.value_int,
+        value_float = excluded.value_float
+"""
+
+
+def mesh_field_values(mesh) -> List[Tuple[str, str, Any]]:
+    """(field_path, field_type, value) rows stored in parsed_fields for one mesh."""
+    return [
         ('bounds.bbox_min.x', 'float', mesh.bbox_min[0]),
         ('bounds.bbox_min.y', 'float', mesh.bbox_min[1]),
         ('bounds.bbox_min.z', 'float', mesh.bbox_min[2]),
@@ -406,60 +513,423 @@ def store_parsed_mesh(conn: sqlite3.Connection, mesh: ParsedMesh, file_id: int,
         ('internal_version', 'int32', mesh.internal_version),
         ('section_count', 'int32', mesh.section_count),
         ('lod_index', 'int32', mesh.lod_index),
-        ('vertex_count', 'int32', len(mesh.vertices)),
-        ('index_count', 'int32', len(mesh.indices)),
-        ('triangle_count', 'int32', len(mesh.indices) // 3),
+        ('vertex_count', 'int32', mesh.vertex_count),
+        ('index_count', 'int32', mesh.index_count),
+        ('triangle_count', 'int32', mesh.index_count // 3),
+    ] + [
+        (f'optimize.{key}', 'float', getattr(mesh, key, None))
+        for key in ('acmr_before', 'acmr_after') if getattr(mesh, key, None) is not None
+    ] + [
+        (f'optimize.{key}', 'int32', getattr(mesh, f'optimized_{key}', None))
+        for key in ('vertex_count', 'index_count') if getattr(mesh, f'optimized_{key}', None) is not None
     ]
+
+
+def lod_field_values(lods: List) -> List[Tuple[str, str, Any]]:
+    """Per-LOD counts for one export (all of its records), stored as lod.<i>.* fields."""
+    values = [('lod_count', 'int32', len(lods))]
+    for lod in lods:
+        values += [
+            (f'lod.{lod.lod_index}.vertex_count', 'int32', lod.vertex_count),
+            (f'lod.{lod.lod_index}.index_count', 'int32', lod.index_count),
+            (f'lod.{lod.lod_index}.triangle_count', 'int32', lod.index_count // 3),
+        ]
+    return values
+
+
+def package_rows(records: List, file_id: int, session_id: int):
+    """
+    Row tuples for one package's records: (exports, fields, regions).
+
+    Records for the same export (one per LOD) collapse onto one parsed_exports row:
+    the last record's values win, as with sequential upserts, and gltf_exported is
+    set if any LOD was exported. Every LOD's counts are kept as lod.<i>.* fields.
+    fields/regions rows are keyed by export_index.
+    """
+    by_export = {}
+    lods = {}
+    exported = {}
+    for record in records:
+        by_export[record.export_index] = record
+        lods.setdefault(record.export_index, []).append(record)
+        exported[record.export_index] = exported.get(record.export_index, False) or \
+            bool(getattr(record, 'gltf_exported', False))
     
-    for field_path, field_type, value in fields_to_store:
-        cursor.execute("""
-            INSERT INTO parsed_fields (
-                parsed_export_id, field_path, field_type,
-                value_int, value_float, is_unknown
-            ) VALUES (?, ?, ?, ?, ?, 0)
-            ON CONFLICT(parsed_export_id, field_path, array_index) DO UPDATE SET
-                value_int = excluded.value_int,
-                value_float = excluded.value_float
-        """, (
-            parsed_export_id,
-            field_path,
-            field_type,
-            int(value) if field_type == 'int32' else None,
-            float(value) if field_type == 'float' else None
+    now = datetime.now().isoformat()
+    exports, fields, regions = [], [], []
+    for export_index, mesh in by_export.items():
+        exports.append((
+            file_id,
+            export_index,
+            mesh.name,
+            'StaticMesh',
+            0,  # serial_offset - we'd need to track this
+            mesh.bytes_total,
+            mesh.bytes_parsed,
+            mesh.bytes_unknown,
+            STATUS_MAP.get(mesh.parse_status, 'error'),
+            1 if mesh.uses_heuristics else 0,
+            1 if mesh.uses_skips else 0,
+            1 if exported[export_index] else 0,
+            session_id,
+            now,
+            mesh.error_message
         ))
-    
-    # Store unknown regions
-    if mesh.unknown_regions:
-        for region in mesh.unknown_regions:
-            # Get raw hex from the region if available
-            raw_hex = region.get('raw_hex', '00')  # Default to single byte if not available
-            cursor.execute("""
-                INSERT INTO unknown_regions (
-                    parsed_export_id, offset_start, offset_end, raw_hex, context
-                ) VALUES (?, ?, ?, ?, ?)
-            """, (
-                parsed_export_id,
-                region.get('offset', 0),
-                region.get('offset', 0) + region.get('size', 0),
-                raw_hex,
-                region.get('name', 'unknown')
+        for field_path, field_type, value in mesh_field_values(mesh) + lod_field_values(lods[export_index]):
+            fields.append((
+                export_index,
+                field_path,
+                field_type,
+                int(value) if field_type == 'int32' else None,
+                float(value) if field_type == 'float' else None
+            ))
+        for region in mesh.unknown_regions or []:
+            # parse_staticmesh emits offset_start/offset_end/context; bytes stay in the
+            # package (abs_offset, size) unless a compressed copy was requested
+            start = region.get('offset_start', region.get('offset', 0))
+            end = region.get('offset_end', start + region.get('size', 0))
+            regions.append((
+                export_index,
+                start,
+                end,
+                region.get('context', region.get('name', 'unknown')),
+                region.get('abs_offset'),
+                end - start,
+                region.get('data_zlib'),
             ))
+    return exports, fields, regions
+
 
+def store_rows(conn: sqlite3.Connection, exports: List[Tuple], fields: List[Tuple], regions: List[Tuple]):
+    """Write package_rows() output with one executemany per table (no commit)."""
+    if not exports:
+        return
+    file_id = exports[0][0]
+    conn.executemany(UPSERT_PARSED_EXPORT.format(
+        table='parsed_exports', values='VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'), exports)
     
-    conn.commit()
+    # cursor.lastrowid is not reliable after an upsert, so look the ids up
+    export_ids = dict(conn.execute(
+        "SELECT export_index, id FROM parsed_exports WHERE file_id = ?", (file_id,)
+    ).fetchall())
+    
+    # Replace (not accumulate) unknown regions on re-parse
+    conn.executemany("DELETE FROM unknown_regions WHERE parsed_export_id = ?",
+                     [(export_ids[row[1]],) for row in exports])
+    conn.executemany(UPSERT_PARSED_FIELD.format(values='VALUES (?, ?, ?, ?, ?, 0)'),
+                     [(export_ids[row[0]],) + row[1:] for row in fields])
+    conn.executemany("""
+        INSERT INTO unknown_regions (
+            parsed_export_id, offset_start, offset_end, context, abs_offset, size, data_zlib, file_id
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(export_ids[row[0]],) + row[1:] + (file_id,) for row in regions])
+
+
+def store_package_records(conn: sqlite3.Connection, pkg_path: str, records: List, session_id: int):
+    """
+    Write one package's mesh records (MeshRecord or ParsedMesh) as a batch.
+    Leaves the transaction open; the caller commits.
+    """
+    file_id = get_or_create_file_id(conn, pkg_path)
+    store_rows(conn, *package_rows(records, file_id, session_id))
+
+
+def store_parsed_mesh(conn: sqlite3.Connection, mesh: ParsedMesh, file_id: int, session_id: int,
+                      commit: bool = True):
+    """Store one parsed mesh (see store_package_records for whole packages)."""
+    store_rows(conn, *package_rows([mesh], file_id, session_id))
+    if commit:
+        conn.commit()
+
+
+def ensure_mesh_alias_table(conn: sqlite3.Connection):
+    """Create mesh_aliases on databases initialized before it existed."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS mesh_aliases (
+            id INTEGER PRIMARY KEY,
+            package TEXT NOT NULL,
+            mesh_name TEXT NOT NULL,
+            lod_index INTEGER NOT NULL DEFAULT 0,
+            geometry_hash TEXT NOT NULL,
+            gltf_path TEXT,
+            vertex_count INTEGER,
+            index_count INTEGER,
+            byte_length INTEGER,
+            UNIQUE(package, mesh_name, lod_index)
+        );
+        CREATE INDEX IF NOT EXISTS idx_mesh_aliases_hash ON mesh_aliases(geometry_hash);
+    """)
+
+
+def store_mesh_aliases(conn: sqlite3.Connection, pkg_path: str, records: List[MeshRecord]):
+    """
+    Map (package, mesh name, LOD) -> geometry hash for records exported to the content store.
+    Counts describe the stored buffers, so optimized meshes get their optimized counts.
+    """
+    package = os.path.splitext(os.path.basename(pkg_path))[0]
+    conn.executemany("""
+        INSERT INTO mesh_aliases (
+            package, mesh_name, lod_index, geometry_hash, gltf_path, vertex_count, index_count, byte_length
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(package, mesh_name, lod_index) DO UPDATE SET
+            geometry_hash = excluded.geometry_hash,
+            gltf_path = excluded.gltf_path,
+            vertex_count = excluded.vertex_count,
+            index_count = excluded.index_count,
+            byte_length = excluded.byte_length
+    """, [
+        (package, r.name, r.lod_index, r.geometry_hash, r.gltf_path,
+         r.vertex_count if r.optimized_vertex_count is None else r.optimized_vertex_count,
+         r.index_count if r.optimized_index_count is None else r.optimized_index_count,
+         r.geometry_bytes)
+        for r in records if r.geometry_hash
+    ])
+
+
+def ensure_mesh_bounds_table(conn: sqlite3.Connection):
+    """Create mesh_bounds on databases initialized before it existed."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS mesh_bounds (
+            id INTEGER PRIMARY KEY,
+            package TEXT NOT NULL,
+            mesh_name TEXT NOT NULL,
+            export_index INTEGER NOT NULL,
+            parse_status TEXT,
+            bounds_valid INTEGER DEFAULT 0,
+            min_x REAL, min_y REAL, min_z REAL,
+            max_x REAL, max_y REAL, max_z REAL,
+            sphere_x REAL, sphere_y REAL, sphere_z REAL, sphere_radius REAL,
+            lod_count INTEGER DEFAULT 0,
+            vertex_count INTEGER DEFAULT 0,
+            index_count INTEGER DEFAULT 0,
+            lod_counts TEXT,
+            scanned_at TEXT,
+            UNIQUE(package, export_index)
+        );
+        CREATE INDEX IF NOT EXISTS idx_mesh_bounds_name ON mesh_bounds(mesh_name);
+    """)
+
+
+def _xyz(point: Optional[Dict[str, float]]) -> List[Optional[float]]:
+    return [point.get(axis) for axis in 'xyz'] if point else [None] * 3
+
+
+def scan_package_bounds(pkg_path: str) -> List[Tuple]:
+    """
+    Header-mode scan of one package: one mesh_bounds row per StaticMesh export.
+    No vertex/index data is decoded and nothing is written, so it can run in a worker.
+    vertex_count/index_count are LOD 0's; lod_counts is JSON [[vertices, indices], ...].
+    """
+    package = os.path.splitext(os.path.basename(pkg_path))[0]
+    pkg = UE2Package(pkg_path)
+    rows = []
+    for exp in pkg.exports:
+        if exp['class_name'] != 'StaticMesh':
+            continue
+        try:
+            result = parse_staticmesh(pkg.get_export_data(exp), pkg.names, exp['serial_offset'], mode="header")
+            status = STATUS_MAP.get(result['parse_status'], result['parse_status'])
+        except Exception:
+            result, status = {'data': {}}, 'error'
+        core = result['data'].get('core', {})
+        box = core.get('bounding_box', {})
+        sphere = core.get('bounding_sphere', {})
+        lod_counts = [[lod['vertex_count'], lod['index_count']] for lod in result['data'].get('lods', [])]
+        rows.append((
+            package, exp['object_name'], exp['index'], status, int(core.get('bounds_valid', False)),
+            *_xyz(box.get('min')), *_xyz(box.get('max')),
+            *_xyz(sphere.get('center')), sphere.get('radius'),
+            len(lod_counts),
+            lod_counts[0][0] if lod_counts else 0,
+            lod_counts[0][1] if lod_counts else 0,
+            json.dumps(lod_counts),
+        ))
+    return rows
+
+
+def store_mesh_bounds(conn: sqlite3.Connection, rows: List[Tuple]):
+    """Upsert scan_package_bounds() rows on (package, export_index)."""
+    now = datetime.now().isoformat()
+    conn.executemany("""
+        INSERT INTO mesh_bounds (
+            package, mesh_name, export_index, parse_status, bounds_valid,
+            min_x, min_y, min_z, max_x, max_y, max_z,
+            sphere_x, sphere_y, sphere_z, sphere_radius,
+            lod_count, vertex_count, index_count, lod_counts, scanned_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(package, export_index) DO UPDATE SET
+            mesh_name = excluded.mesh_name,
+            parse_status = excluded.parse_status,
+            bounds_valid = excluded.bounds_valid,
+            min_x = excluded.min_x, min_y = excluded.min_y, min_z = excluded.min_z,
+            max_x = excluded.max_x, max_y = excluded.max_y, max_z = excluded.max_z,
+            sphere_x = excluded.sphere_x, sphere_y = excluded.sphere_y, sphere_z = excluded.sphere_z,
+            sphere_radius = excluded.sphere_radius,
+            lod_count = excluded.lod_count,
+            vertex_count = excluded.vertex_count,
+            index_count = excluded.index_count,
+            lod_counts = excluded.lod_counts,
+            scanned_at = excluded.scanned_at
+    """, [row + (now,) for row in rows])
+
+
+PROFILE_SESSION_PACKAGE = '*'  # parse_profile.package for session totals
+
+
+def ensure_parse_profile_table(conn: sqlite3.Connection):
+    """Create parse_profile on databases initialized before it existed."""
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS parse_profile (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER NOT NULL,
+            package TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            calls INTEGER,
+            total_ms REAL,
+            UNIQUE(session_id, package, metric)
+        );
+    """)
+
+
+def store_parse_profile(conn: sqlite3.Connection, session_id: int, package: str, profile: Dict):
+    """
+    One parse_profile row per metric: 'time.<step>' (calls, total_ms) and
+    'path.<path>' (calls = hits, total_ms NULL).
+    """
+    rows = [(session_id, package, f'time.{step}', calls, seconds * 1000)
+            for step, (calls, seconds) in profile['times'].items()]
+    rows += [(session_id, package, f'path.{path}', hits, None) for path, hits in profile['counts'].items()]
+    conn.executemany("""
+        INSERT INTO parse_profile (session_id, package, metric, calls, total_ms)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(session_id, package, metric) DO UPDATE SET
+            calls = excluded.calls,
+            total_ms = excluded.total_ms
+    """, rows)
+
+
+def print_parse_profile(profile: ParseProfile):
+    """--profile summary: steps by total time, then how often each heuristic path was taken."""
+    total = sum(seconds for _, seconds in profile.times.values()) or 1.0
+    print("Parse profile:")
+    print(f"   {'step':<16}{'calls':>9}{'total ms':>12}{'mean us':>10}{'share':>8}")
+    for step, (calls, seconds) in sorted(profile.times.items(), key=lambda item: -item[1][1]):
+        print(f"   {step:<16}{calls:>9}{seconds * 1000:>12.1f}{seconds / max(calls, 1) * 1e6:>10.1f}"
+              f"{seconds / total * 100:>7.1f}%")
+    groups = {}
+    for path, hits in profile.counts.items():
+        groups.setdefault(path.split('.', 1)[0], []).append((path, hits))
+    print("   paths:")
+    for group, paths in sorted(groups.items()):
+        print("     " + ", ".join(f"{path} {hits}" for path, hits in sorted(paths)))
+
+
+class StagingWriter:
+    """
+    In-memory staging for mesh results.
+
+    Rows are buffered in an attached ':memory:' database and merged into the main
+    tables every `flush_every` packages with a few set-based INSERT ... SELECT
+    statements in one transaction, so the main database sees one commit per flush
+    instead of one per package.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, session_id: int, flush_every: int = 200):
+        self.conn = conn
+        self.session_id = session_id
+        self.flush_every = flush_every
+        self.pending = 0
+        if not conn.execute("SELECT 1 FROM pragma_database_list WHERE name = 'staging'").fetchone():
+            conn.commit()  # ATTACH is not allowed inside a transaction
+            conn.executescript("""
+                ATTACH DATABASE ':memory:' AS staging;
+                CREATE TABLE staging.parsed_exports (
+                    file_id INTEGER, export_index INTEGER, export_name TEXT, class_name TEXT,
+                    serial_offset INTEGER, serial_size INTEGER, bytes_parsed INTEGER, bytes_unknown INTEGER,
+                    parse_status TEXT, uses_heuristics INTEGER, uses_skips INTEGER, gltf_exported INTEGER,
+                    session_id INTEGER, last_parsed_at TEXT, error_message TEXT,
+                    UNIQUE(file_id, export_index)
+                );
+                CREATE TABLE staging.parsed_fields (
+                    file_id INTEGER, export_index INTEGER, field_path TEXT, field_type TEXT,
+                    value_int INTEGER, value_float REAL
+                );
+                CREATE TABLE staging.unknown_regions (
+                    file_id INTEGER, export_index INTEGER, offset_start INTEGER, offset_end INTEGER,
+                    context TEXT, abs_offset INTEGER, size INTEGER, data_zlib BLOB
+                );
+            """)
+
+    def add_package(self, pkg_path: str, records: List):
+        """Stage one package's records; flushes every `flush_every` packages."""
+        file_id = get_or_create_file_id(self.conn, pkg_path)
+        self._stage(*package_rows(records, file_id, self.session_id))
+        self.pending += 1
+        if self.flush_every and self.pending >= self.flush_every:
+            self.flush()
+
+    def _stage(self, exports, fields, regions):
+        if not exports:
+            return
+        file_id = exports[0][0]
+        # A package staged twice before a flush replaces its earlier rows
+        for table in ('parsed_exports', 'parsed_fields', 'unknown_regions'):
+            self.conn.executemany(f"DELETE FROM staging.{table} WHERE file_id = ? AND export_index = ?",
+                                  [(file_id, row[1]) for row in exports])
+        self.conn.executemany(
+            "INSERT INTO staging.parsed_exports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", exports)
+        self.conn.executemany("INSERT INTO staging.parsed_fields VALUES (?, ?, ?, ?, ?, ?)",
+                              [(file_id,) + row for row in fields])
+        self.conn.executemany("INSERT INTO staging.unknown_regions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              [(file_id,) + row for row in regions])
+
+    def flush(self, commit: bool = True):
+        """Merge staged rows into the main tables and clear the staging tables."""
+        conn = self.conn
+        join = """
+            JOIN main.parsed_exports pe
+              ON pe.file_id = s.file_id AND pe.export_index = s.export_index
+        """
+        # "WHERE true" disambiguates INSERT ... SELECT ... ON CONFLICT for SQLite's parser
+        conn.execute(UPSERT_PARSED_EXPORT.format(
+            table='main.parsed_exports', values='SELECT * FROM staging.parsed_exports WHERE true'))
+        conn.execute(f"""
+            DELETE FROM main.unknown_regions WHERE parsed_export_id IN (
+                SELECT pe.id FROM staging.parsed_exports s {join}
+            )
+        """)
+        conn.execute(UPSERT_PARSED_FIELD.format(values=f"""
+            SELECT pe.id, s.field_path, s.field_type, s.value_int, s.value_float, 0
+            FROM staging.parsed_fields s {join} WHERE true
+        """))
+        conn.execute(f"""
+            INSERT INTO main.unknown_regions (
+                parsed_export_id, offset_start, offset_end, context, abs_offset, size, data_zlib, file_id
+            )
+            SELECT pe.id, s.offset_start, s.offset_end, s.context, s.abs_offset, s.size, s.data_zlib, s.file_id
+            FROM staging.unknown_regions s {join}
+        """)
+        for table in ('parsed_exports', 'parsed_fields', 'unknown_regions'):
+            conn.execute(f"DELETE FROM staging.{table}")
+        if commit:
+            conn.commit()
+        self.pending = 0
 
 
 # =============================================================================
 # GLTF EXPORT
 # =============================================================================
 
-def mesh_to_gltf(mesh: ParsedMesh, output_path: str) -> bool:
+def build_gltf(mesh: ParsedMesh, quantize: bool = False,
+               report: Optional[Dict[str, float]] = None) -> Optional[Tuple[Dict, bytes]]:
     """
-    Export ParsedMesh to glTF format.
-    Returns True on success.
+    Build the glTF JSON (without buffer URI) and binary buffer for a ParsedMesh.
+    With quantize=True, positions are written as int16 with a node scale
+    (KHR_mesh_quantization) and the max dequantization error goes into `report`.
+    Returns None for meshes without geometry.
     """
-    if not mesh.vertices or not mesh.indices:
-        return False
+    if not mesh.vertex_count or not len(mesh.indices):
+        return None
     
     # Build glTF structure
     gltf = {
@@ -481,44 +951,37 @@ def mesh_to_gltf(mesh: ParsedMesh, output_path: str) -> bool:
     }
     
     # Build binary buffer
-    import struct
-    import base64
-    
     buffer_data = bytearray()
     
+    # Sanitize NaN/Inf values (invalid in JSON), then apply the
+    # Vanguard (Z-up) -> glTF (Y-up) coordinate swizzle at export time
+    # Vanguard: X=Right, Y=Forward, Z=Up
+    # glTF:     X=Right, Y=Up,      Z=Forward (negated for right-hand convention)
+    sanitized = np.where(np.isfinite(mesh.positions), mesh.positions, np.float32(0))
+    positions = np.empty_like(sanitized)
+    positions[:, 0] = sanitized[:, 0]
+    positions[:, 1] = sanitized[:, 2]   # Vanguard height (Z) becomes glTF height (Y)
+    positions[:, 2] = -sanitized[:, 1]  # Vanguard forward (Y) becomes glTF depth (Z), negated
+    
     # Positions
     pos_start = len(buffer_data)
-    min_pos = [float('inf')] * 3
-    max_pos = [float('-inf')] * 3
-    
-    for v in mesh.vertices:
-        # Sanitize NaN/Inf values which are invalid in JSON
-        vx = v.x if math.isfinite(v.x) else 0.0
-        vy = v.y if math.isfinite(v.y) else 0.0
-        vz = v.z if math.isfinite(v.z) else 0.0
-        
-        # Apply Vanguard (Z-up) -> glTF (Y-up) coordinate swizzle at export time
-        # Vanguard: X=Right, Y=Forward, Z=Up
-        # glTF:     X=Right, Y=Up,      Z=Forward (negated for right-hand convention)
-        gx = vx
-        gy = vz   # Vanguard height (Z) becomes glTF height (Y)
-        gz = -vy  # Vanguard forward (Y) becomes glTF depth (Z), negated
-        
-        buffer_data.extend(struct.pack('<fff', gx, gy, gz))
-        min_pos[0] = min(min_pos[0], gx)
-        min_pos[1] = min(min_pos[1], gy)
-        min_pos[2] = min(min_pos[2], gz)
-        max_pos[0] = max(max_pos[0], gx)
-        max_pos[1] = max(max_pos[1], gy)
-        max_pos[2] = max(max_pos[2], gz)
-
-    
+    if quantize:
+        # int16 positions, dequantized by the node transform
+        q_pos, translation, scale, pos_error = gltf_quantize.quantize_positions(positions)
+        gltf_quantize.merge_report(report, position=pos_error)
+        gltf["nodes"][0].update({"translation": translation, "scale": [scale, scale, scale]})
+        gltf_quantize.add_extension(gltf)
+        min_pos, max_pos = gltf_quantize.quantized_bounds(q_pos)
+        buffer_data.extend(q_pos.tobytes())
+    else:
+        min_pos = positions.min(axis=0).tolist()
+        max_pos = positions.max(axis=0).tolist()
+        buffer_data.extend(positions.astype('<f4').tobytes())
     pos_end = len(buffer_data)
     
-    # Indices
+    # Indices (uint16 unless the mesh needs uint32)
     idx_start = len(buffer_data)
-    for idx in mesh.indices:
-        buffer_data.extend(struct.pack('<H', idx))
+    buffer_data.extend(mesh.indices.astype(mesh.indices.dtype.newbyteorder('<')).tobytes())
     idx_end = len(buffer_data)
     
     # Add buffer views
@@ -526,37 +989,158 @@ def mesh_to_gltf(mesh: ParsedMesh, output_path: str) -> bool:
         {"buffer": 0, "byteOffset": pos_start, "byteLength": pos_end - pos_start, "target": 34962},
         {"buffer": 0, "byteOffset": idx_start, "byteLength": idx_end - idx_start, "target": 34963}
     ]
+    if quantize:
+        gltf["bufferViews"][0]["byteStride"] = 8
     
     # Add accessors
     gltf["accessors"] = [
         {
             "bufferView": 0,
-            "componentType": 5126,  # FLOAT
-            "count": len(mesh.vertices),
+            "componentType": 5122 if quantize else 5126,  # SHORT / FLOAT
+            "count": mesh.vertex_count,
             "type": "VEC3",
             "min": min_pos,
             "max": max_pos
         },
         {
             "bufferView": 1,
-            "componentType": 5123,  # UNSIGNED_SHORT
+            "componentType": 5125 if mesh.indices.dtype == np.uint32 else 5123,  # UNSIGNED_INT / SHORT
             "count": len(mesh.indices),
             "type": "SCALAR"
         }
     ]
     
-    # Encode buffer as base64 data URI
-    b64_data = base64.b64encode(buffer_data).decode('utf-8')
-    gltf["buffers"] = [{
-        "uri": f"data:application/octet-stream;base64,{b64_data}",
-        "byteLength": len(buffer_data)
-    }]
+    gltf["buffers"] = [{"uri": None, "byteLength": len(buffer_data)}]  # URI set by write_gltf
+    return gltf, bytes(buffer_data)
+
+
+def screen_coverage(triangle_counts: List[int]) -> List[float]:
+    """
+    MSFT_screencoverage thresholds for LODs with these triangle counts.
+
+    LOD i is shown while the mesh covers at least value[i] of the screen height;
+    the last LOD's value is 0 (never culled). A LOD with a fraction f of LOD 0's
+    triangles takes over at LOD0_SCREEN_COVERAGE * sqrt(f), i.e. when its triangles
+    project to about the same size LOD 0's do at full detail.
+    """
+    base = max(triangle_counts[0], 1)
+    values = []
+    for count in triangle_counts[1:]:
+        value = LOD0_SCREEN_COVERAGE * float(np.sqrt(min(count / base, 1.0)))
+        values.append(min(value, values[-1]) if values else value)
+    return values + [0.0]
+
+
+def build_lod_gltf(meshes: List[ParsedMesh], quantize: bool = False,
+                   report: Optional[Dict[str, float]] = None) -> Optional[Tuple[Dict, List[bytes], List[ParsedMesh]]]:
+    """
+    One glTF holding every LOD of a mesh (ordered by lod_index), one buffer per LOD.
+
+    The scene references only the LOD 0 node; with more than one LOD it carries
+    MSFT_lod {"ids": [lower LOD nodes]} and extras.MSFT_screencoverage, so loaders
+    without MSFT_lod support still show full detail. Returns (gltf, buffers, meshes
+    written) or None when no LOD has geometry.
+    """
+    parts = []
+    for mesh in sorted(meshes, key=lambda m: m.lod_index):
+        built = build_gltf(mesh, quantize=quantize, report=report)
+        if built is not None:
+            parts.append((mesh, *built))
+    if not parts:
+        return None
+    
+    gltf = parts[0][1]
+    buffers = [parts[0][2]]
+    for mesh, part, buffer_data in parts[1:]:
+        view_base = len(gltf["bufferViews"])
+        accessor_base = len(gltf["accessors"])
+        for view in part["bufferViews"]:
+            view["buffer"] = len(gltf["buffers"])
+        for accessor in part["accessors"]:
+            accessor["bufferView"] += view_base
+        primitive = part["meshes"][0]["primitives"][0]
+        primitive["attributes"]["POSITION"] += accessor_base
+        primitive["indices"] += accessor_base
+        part["meshes"][0]["name"] = f"{mesh.name}_LOD{mesh.lod_index}"
+        part["nodes"][0].update(mesh=len(gltf["meshes"]), name=f"{mesh.name}_LOD{mesh.lod_index}")
+        
+        gltf["bufferViews"] += part["bufferViews"]
+        gltf["accessors"] += part["accessors"]
+        gltf["meshes"] += part["meshes"]
+        gltf["nodes"] += part["nodes"]
+        gltf["buffers"] += part["buffers"]
+        buffers.append(buffer_data)
+    
+    if len(parts) > 1:
+        root = gltf["nodes"][0]
+        root["extensions"] = {MSFT_LOD: {"ids": list(range(1, len(parts)))}}
+        root["extras"] = {"MSFT_screencoverage": screen_coverage([m.index_count // 3 for m, _, _ in parts])}
+        gltf.setdefault("extensionsUsed", []).append(MSFT_LOD)
+    return gltf, buffers, [m for m, _, _ in parts]
+
+
+def geometry_hash(buffer_data: bytes) -> str:
+    """Content address of a glTF geometry buffer (positions + indices as written)."""
+    return hashlib.sha256(buffer_data).hexdigest()[:32]
+
+
+def store_buffer(buffer_data: bytes, store_dir: str) -> str:
+    """
+    Write a buffer to the content-addressed store once; returns its hash.
+    Writes go through a per-process temp file and os.replace, so concurrent
+    workers exporting the same geometry never expose a partial file.
+    """
+    digest = geometry_hash(buffer_data)
+    path = os.path.join(store_dir, f"{digest}.bin")
+    if not os.path.exists(path):
+        os.makedirs(store_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(buffer_data)
+        os.replace(tmp_path, path)
+    return digest
+
+
+def write_gltf(gltf: Dict, buffers: List[bytes], output_path: str,
+               store_dir: Optional[str] = None) -> List[Optional[str]]:
+    """
+    Write a glTF file; buffers[i] is the data for gltf["buffers"][i]. Each buffer is
+    embedded as a base64 data URI, or with store_dir, referenced (relative URI) from
+    the content-addressed store. Returns the per-buffer geometry hashes (None when embedded).
+    """
+    import base64
+    
+    digests = []
+    for entry, buffer_data in zip(gltf["buffers"], buffers):
+        digest = None
+        if store_dir:
+            digest = store_buffer(buffer_data, store_dir)
+            bin_path = os.path.join(store_dir, f"{digest}.bin")
+            uri = os.path.relpath(bin_path, os.path.dirname(os.path.abspath(output_path))).replace(os.sep, '/')
+        else:
+            # Encode buffer as base64 data URI
+            uri = f"data:application/octet-stream;base64,{base64.b64encode(buffer_data).decode('utf-8')}"
+        entry["uri"] = uri
+        digests.append(digest)
     
     # Write file
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     with open(output_path, 'w') as f:
         json.dump(gltf, f)
-    
+    return digests
+
+
+def mesh_to_gltf(mesh: ParsedMesh, output_path: str, quantize: bool = False,
+                 report: Optional[Dict[str, float]] = None, store_dir: Optional[str] = None) -> bool:
+    """
+    Export ParsedMesh to glTF format (see build_gltf / write_gltf).
+    Returns True on success.
+    """
+    built = build_gltf(mesh, quantize=quantize, report=report)
+    if built is None:
+        return False
+    gltf, buffer_data = built
+    write_gltf(gltf, [buffer_data], output_path, store_dir=store_dir)
     return True
 
 
@@ -564,54 +1148,186 @@ def mesh_to_gltf(mesh: ParsedMesh, output_path: str) -> bool:
 # MAIN PIPELINE
 # =============================================================================
 
-def process_package(pkg_path: str, conn: Optional[sqlite3.Connection], session_id: int, 
-                   export_gltf: bool = True, output_dir: str = None) -> Dict[str, int]:
+def export_package(pkg_path: str, export_gltf: bool = True, output_dir: str = None,
+                   quantize: bool = False, store_dir: Optional[str] = None,
+                   optimize_cache: bool = False, region_blobs: bool = False,
+                   profile: bool = False) -> Dict[str, Any]:
     """
-    Process a single package file through the complete pipeline.
-    Returns stats dict.
+    Parse one package and write its glTF files. Touches no database, so it can run
+    in a worker process. With store_dir, geometry buffers go to the content-addressed
+    store and each glTF references its buffer by hash. optimize_cache reorders each
+    exported mesh for the vertex cache and records ACMR before/after. region_blobs
+    keeps a zlib copy of each unknown region (otherwise only its location).
+    profile collects a ParseProfile for the package (parse steps + glTF export).
+
+    Returns {'records': [MeshRecord], 'stats': {...}, 'report': {...}, 'profile': dict or None}.
     """
-    stats = {'success': 0, 'error': 0, 'skipped': 0, 'exported': 0}
-    
-    file_id = get_or_create_file_id(conn, pkg_path) if conn else 0
-    # sys.stderr.write(f"DEBUG: Processing {os.path.basename(pkg_path)}\n")
-    meshes = parse_staticmesh_file(pkg_path)
+    stats = {'success': 0, 'error': 0, 'skipped': 0, 'exported': 0, 'optimize_skipped': 0}
+    report = {}
+    pkg_name = os.path.splitext(os.path.basename(pkg_path))[0]
+    parse_profile = ParseProfile() if profile else None
+    meshes = parse_staticmesh_file(pkg_path, region_blobs=region_blobs, profile=parse_profile)
+    t = time.perf_counter()
+    export_info = {id(mesh): {} for mesh in meshes}
     
+    # All LODs of an export go into one <mesh>.gltf
+    lod_groups = {}
     for mesh in meshes:
-        # Store in database
-        if conn:
-            store_parsed_mesh(conn, mesh, file_id, session_id)
-        
         if mesh.parse_status == 'complete':
             stats['success'] += 1
-            
-            # Export glTF if requested
-            if export_gltf and output_dir and mesh.vertices and mesh.indices:
-                pkg_name = os.path.splitext(os.path.basename(pkg_path))[0]
-                gltf_path = os.path.join(output_dir, pkg_name, f"{mesh.name}.gltf")
-                if mesh_to_gltf(mesh, gltf_path):
-                    stats['exported'] += 1
-                    # Mark as exported in database
-                    if conn:
-                        cursor = conn.cursor()
-                        cursor.execute("""
-                            UPDATE parsed_exports 
-                            SET gltf_exported = 1 
-                            WHERE file_id = ? AND export_index = ?
-                        """, (file_id, mesh.export_index))
-                        conn.commit()
-
+            if export_gltf and output_dir and mesh.vertex_count and mesh.index_count:
+                lod_groups.setdefault(mesh.export_index, []).append(mesh)
         elif 'skipped' in mesh.parse_status:
             stats['skipped'] += 1
         else:
             stats['error'] += 1
+    
+    for lods in lod_groups.values():
+        if optimize_cache:
+            for mesh in lods:
+                parsed_counts = (mesh.vertex_count, mesh.index_count)
+                opt = optimize_vertex_cache(mesh)
+                if opt is None:
+                    stats['optimize_skipped'] += 1
+                    continue
+                export_info[id(mesh)].update(acmr_before=opt['acmr_before'], acmr_after=opt['acmr_after'],
+                                             parsed_counts=parsed_counts)
+        built = build_lod_gltf(lods, quantize=quantize, report=report)
+        if built is None:
+            continue
+        gltf, buffers, written = built
+        gltf_path = os.path.join(output_dir, pkg_name, f"{lods[0].name}.gltf")
+        digests = write_gltf(gltf, buffers, gltf_path, store_dir=store_dir)
+        for mesh, digest, buffer_data in zip(written, digests, buffers):
+            export_info[id(mesh)].update(gltf_exported=True, gltf_path=gltf_path,
+                                         geometry_hash=digest, geometry_bytes=len(buffer_data))
+        stats['exported'] += 1
+    
+    if parse_profile and lod_groups:
+        parse_profile.lap("gltf_export", t)
+    
+    records = [MeshRecord(mesh, **export_info[id(mesh)]) for mesh in meshes]
+    return {'records': records, 'stats': stats, 'report': report,
+            'profile': parse_profile.as_dict() if parse_profile else None}
+
+
+def process_package(pkg_path: str, conn: Optional[sqlite3.Connection], session_id: int, 
+                   export_gltf: bool = True, output_dir: str = None, quantize: bool = False,
+                   report: Optional[Dict[str, float]] = None, store_dir: Optional[str] = None,
+                   optimize_cache: bool = False, region_blobs: bool = False) -> Dict[str, int]:
+    """
+    Process a single package file through the complete pipeline.
+    Returns stats dict.
+    """
+    result = export_package(pkg_path, export_gltf=export_gltf, output_dir=output_dir, quantize=quantize,
+                            store_dir=store_dir, optimize_cache=optimize_cache, region_blobs=region_blobs)
+    gltf_quantize.merge_report(report, **result['report'])
+    if conn:
+        ensure_mesh_alias_table(conn)
+        region_store.ensure_region_columns(conn)
+        store_package_records(conn, pkg_path, result['records'], session_id)
+        store_mesh_aliases(conn, pkg_path, result['records'])
+        conn.commit()
+    return result['stats']
+
 
+def iter_package_results(files: List[str], workers: int = 1, task=export_package, **export_options):
+    """
+    Yield (pkg_path, task() result or the Exception it raised) in file order.
+    task defaults to export_package; with workers > 1, packages run in a process pool.
+    """
+    if workers <= 1:
+        for pkg_path in files:
+            try:
+                yield pkg_path, task(pkg_path, **export_options)
+            except Exception as e:
+                yield pkg_path, e
+        return
     
-    return stats
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(task, pkg_path, **export_options) for pkg_path in files]
+        for pkg_path, future in zip(files, futures):
+            try:
+                yield pkg_path, future.result()
+            except Exception as e:
+                yield pkg_path, e
+
+
+def find_package_files(file_pattern: str = None, limit: int = 0) -> List[str]:
+    """.usx packages in MESHES_DIR matching file_pattern (all if None), capped at limit."""
+    if file_pattern:
+        pattern = file_pattern if file_pattern.endswith('.usx') else file_pattern + "*.usx"
+        files = glob.glob(os.path.join(MESHES_DIR, pattern))
+    else:
+        files = glob.glob(os.path.join(MESHES_DIR, "*.usx"))
+    
+    if limit > 0:
+        files = files[:limit]
+    return files
+
+
+def run_bounds_scan(file_pattern: str = None, limit: int = 0, silent: bool = False, workers: int = 1):
+    """
+    Fill mesh_bounds for every StaticMesh using the header-only parse (no vertex
+    decode, no glTF, no parsed_exports rows). Commits every commit_every() packages.
+    """
+    start = time.perf_counter()
+    files = find_package_files(file_pattern, limit)
+    if not silent:
+        print("=" * 60)
+        print("Vanguard StaticMesh Bounds Scan")
+        print("=" * 60)
+        print(f"Database: {CANONICAL_DB}")
+        print(f"Found {len(files)} files to scan")
+        print()
+    
+    conn = sqlite3.connect(CANONICAL_DB)
+    apply_bulk_pragmas(conn)
+    ensure_mesh_bounds_table(conn)
+    counts = {'meshes': 0, 'valid': 0, 'failed_packages': 0}
+    for i, (pkg_path, rows) in enumerate(iter_package_results(files, workers, task=scan_package_bounds)):
+        if len(files) > 5 and not silent:
+            print_progress_bar(i + 1, len(files), prefix='   Progress:', suffix=f'({i+1}/{len(files)})', length=40)
+        if isinstance(rows, Exception):
+            if not silent:
+                print(f"\n ERROR scanning {os.path.basename(pkg_path)}: {rows}")
+            counts['failed_packages'] += 1
+            continue
+        store_mesh_bounds(conn, rows)
+        counts['meshes'] += len(rows)
+        counts['valid'] += sum(row[4] for row in rows)
+        if (i + 1) % commit_every() == 0:
+            conn.commit()
+    conn.commit()
+    conn.close()
+    
+    if not silent:
+        print()
+        print("=" * 60)
+        print("Bounds Scan Complete")
+        print("=" * 60)
+        print(f"Files Scanned:   {len(files)} ({counts['failed_packages']} failed)")
+        print(f"Meshes:          {counts['meshes']} ({counts['valid']} with valid bounds)")
+        print(f"Elapsed:         {time.perf_counter() - start:.1f}s")
+    return counts
 
 
-def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only: bool = False, limit: int = 0, silent: bool = False):
+def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only: bool = False, limit: int = 0, silent: bool = False,
+                 quantize: bool = False, workers: int = 1, staging_flush: int = 0, dedup: bool = True,
+                 optimize_cache: bool = False, region_blobs: bool = False, profile: bool = False):
     """
     Run the complete StaticMesh parsing pipeline.
+    
+    With workers > 1, packages are parsed and exported in worker processes while
+    this process is the only database writer, committing every commit_every() packages.
+    staging_flush > 0 buffers results in an in-memory StagingWriter instead and
+    merges them into the database every `staging_flush` packages.
+    With dedup, geometry buffers are written once to MESH_STORE_DIR (by hash) and
+    the per-mesh glTFs reference them; mesh_aliases records the mapping.
+    optimize_cache runs the vertex-cache optimizer on every exported mesh.
+    Unknown regions are stored by location; region_blobs also stores their bytes (zlib).
+    profile records per-step parse timings and heuristic path counts per package and
+    for the session (parse_profile, package '*') and prints a summary.
     """
     if not silent:
         print("=" * 60)
@@ -622,17 +1338,11 @@ def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only
         print(f"Output Dir: {OUTPUT_DIR}")
         if export_only:
             print("Mode: EXPORT-ONLY (Skipping database updates)")
+        if workers > 1:
+            print(f"Workers: {workers}")
         print()
     
-    # Find files to process
-    if file_pattern:
-        pattern = file_pattern if file_pattern.endswith('.usx') else file_pattern + "*.usx"
-        files = glob.glob(os.path.join(MESHES_DIR, pattern))
-    else:
-        files = glob.glob(os.path.join(MESHES_DIR, "*.usx"))
-    
-    if limit > 0:
-        files = files[:limit]
+    files = find_package_files(file_pattern, limit)
     
     if not silent:
         print(f"Found {len(files)} files to process")
@@ -641,18 +1351,36 @@ def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only
     # Connect to database
     conn = None
     session_id = None
+    staging = None
     if not export_only:
         conn = sqlite3.connect(CANONICAL_DB)
+        apply_bulk_pragmas(conn)
         session_id = create_parse_session(conn)
+        ensure_mesh_alias_table(conn)
+        region_store.ensure_region_columns(conn)
+        if profile:
+            ensure_parse_profile_table(conn)
+        staging = StagingWriter(conn, session_id, flush_every=staging_flush) if staging_flush > 0 else None
         if not silent:
             print(f"Created parse session: {session_id}")
             print()
     
     # Process files
-    total_stats = {'success': 0, 'error': 0, 'skipped': 0, 'exported': 0}
+    total_stats = {'success': 0, 'error': 0, 'skipped': 0, 'exported': 0, 'optimize_skipped': 0}
+    quant_report = {}
     
     total_files = len(files)
-    for i, pkg_path in enumerate(files):
+    pending_commit = 0
+    store_dir = MESH_STORE_DIR if dedup else None
+    unique_bytes = {}  # geometry hash -> buffer size
+    logical_bytes = 0
+    logical_buffers = 0  # one per exported LOD
+    acmr_totals = [0, 0.0, 0.0]  # meshes, sum before, sum after
+    session_profile = ParseProfile() if profile else None
+    results = iter_package_results(files, workers, export_gltf=export_gltf, output_dir=OUTPUT_DIR,
+                                   quantize=quantize, store_dir=store_dir, optimize_cache=optimize_cache,
+                                   region_blobs=region_blobs, profile=profile)
+    for i, (pkg_path, result) in enumerate(results):
         # Show progress bar if many files
         if total_files > 5:
             print_progress_bar(i + 1, total_files, prefix='   Progress:', suffix=f'({i+1}/{total_files})', length=40)
@@ -660,14 +1388,34 @@ def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only
             print(f"[{i+1}/{total_files}] Processing {os.path.basename(pkg_path)}...")
         
         try:
-            # When export_only, we don't pass conn
-            stats = process_package(
-                pkg_path, 
-                conn if not export_only else None, 
-                session_id if not export_only else 0, 
-                export_gltf=export_gltf, 
-                output_dir=OUTPUT_DIR
-            )
+            if isinstance(result, Exception):
+                raise result
+            # When export_only, nothing is written to the database
+            if staging is not None:
+                staging.add_package(pkg_path, result['records'])
+            elif conn is not None:
+                store_package_records(conn, pkg_path, result['records'], session_id)
+                pending_commit += 1
+            if conn is not None:
+                store_mesh_aliases(conn, pkg_path, result['records'])
+                if pending_commit >= commit_every():
+                    conn.commit()
+                    pending_commit = 0
+            for record in result['records']:
+                if record.acmr_before is not None:
+                    acmr_totals[0] += 1
+                    acmr_totals[1] += record.acmr_before
+                    acmr_totals[2] += record.acmr_after
+                if record.geometry_hash:
+                    logical_bytes += record.geometry_bytes
+                    logical_buffers += 1
+                    unique_bytes[record.geometry_hash] = record.geometry_bytes
+            if result.get('profile'):
+                session_profile.merge(result['profile'])
+                if conn is not None:
+                    store_parse_profile(conn, session_id, os.path.basename(pkg_path), result['profile'])
+            stats = result['stats']
+            gltf_quantize.merge_report(quant_report, **result['report'])
             for key in total_stats:
                 total_stats[key] += stats[key]
             
@@ -679,7 +1427,11 @@ def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only
             total_stats['error'] += 1
     
     # Update session as complete (skip if export-only mode)
+    if staging is not None:
+        staging.flush(commit=False)
     if conn is not None:
+        if session_profile:
+            store_parse_profile(conn, session_id, PROFILE_SESSION_PACKAGE, session_profile.as_dict())
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE parse_sessions 
@@ -709,6 +1461,22 @@ def run_pipeline(file_pattern: str = None, export_gltf: bool = True, export_only
         print(f"Meshes Skipped:  {total_stats['skipped']}")
         print(f"Meshes Failed:   {total_stats['error']}")
         print(f"glTF Exported:   {total_stats['exported']}")
+        if quant_report:
+            print(f"Quantization:    max position error {quant_report['position']:.4f} units")
+        if acmr_totals[0]:
+            print(f"Vertex cache:    mean ACMR {acmr_totals[1] / acmr_totals[0]:.3f} -> "
+                  f"{acmr_totals[2] / acmr_totals[0]:.3f} over {acmr_totals[0]} meshes")
+        if total_stats['optimize_skipped']:
+            print(f"Vertex cache:    {total_stats['optimize_skipped']} meshes left unoptimized "
+                  f"(index out of range)")
+        if unique_bytes:
+            stored = sum(unique_bytes.values())
+            print(f"Dedup:           {logical_buffers} LOD buffers -> {len(unique_bytes)} unique buffers "
+                  f"({logical_buffers / len(unique_bytes):.2f}x), "
+                  f"{logical_bytes / 1e6:.1f} MB -> {stored / 1e6:.1f} MB ({logical_bytes / max(stored, 1):.2f}x)")
+        if session_profile:
+            print()
+            print_parse_profile(session_profile)
         print()
     
     if not silent:
@@ -722,15 +1490,42 @@ def main():
     parser.add_argument('--export-only', action='store_true', help='Only export glTF, skip DB updates')
     parser.add_argument('--limit', '-n', type=int, default=0, help='Limit number of files to process')
     parser.add_argument('--silent', action='store_true', help='Suppress all output except errors')
+    parser.add_argument('--quantize', action='store_true', help='Write int16 positions (KHR_mesh_quantization)')
+    parser.add_argument('--workers', '-j', type=int, default=1,
+                        help='Parse/export packages in N worker processes (0 = one per CPU)')
+    parser.add_argument('--no-dedup', action='store_true',
+                        help='Embed buffers in each glTF instead of the content-addressed by_hash store')
+    parser.add_argument('--optimize-cache', action='store_true',
+                        help='Reorder triangles/vertices for the GPU vertex cache (reports ACMR before/after)')
+    parser.add_argument('--staging', type=int, default=0, metavar='N',
+                        help='Buffer DB rows in an in-memory staging table, flushing every N packages')
+    parser.add_argument('--region-blobs', action='store_true',
+                        help='Also store unknown-region bytes (zlib BLOB) instead of only their file location')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time each parse step and count heuristic paths (parse_profile table + summary)')
+    parser.add_argument('--bounds-only', action='store_true',
+                        help='Header-only scan that fills mesh_bounds (no vertex decode, no glTF)')
     
     args = parser.parse_args()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    
+    if args.bounds_only:
+        run_bounds_scan(file_pattern=args.file, limit=args.limit, silent=args.silent, workers=workers)
+        return
     
     run_pipeline(
         file_pattern=args.file,
         export_gltf=True,
         export_only=args.export_only,
         limit=args.limit,
-        silent=args.silent
+        silent=args.silent,
+        quantize=args.quantize,
+        workers=workers,
+        staging_flush=args.staging,
+        dedup=not args.no_dedup,
+        optimize_cache=args.optimize_cache,
+        region_blobs=args.region_blobs,
+        profile=args.profile
     )
 
 
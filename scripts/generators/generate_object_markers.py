@@ -18,6 +18,7 @@ sys.path.insert(0, PROJECT_ROOT)
 
 import config
 from ue2.reader import read_compact_index_at as read_compact_index, read_fstring_at as read_fstring
+from ue2.scan import find_vec3
 
 
 # Removed duplicate read_compact_index and read_fstring functions
@@ -79,16 +80,7 @@ def extract_objects_from_chunk(vgr_path):
         raw = data[offset : offset + size]
 
         # Find position by scanning for valid coordinates
-        best_pos = None
-        for j in range(max(0, size - 20), size - 11):
-            x = struct.unpack("<f", raw[j : j + 4])[0]
-            y = struct.unpack("<f", raw[j + 4 : j + 8])[0]
-            z = struct.unpack("<f", raw[j + 8 : j + 12])[0]
-            if all(1000 < abs(v) < 500000 for v in [x, y, z]) and not any(
-                v != v for v in [x, y, z]
-            ):
-                best_pos = (x, y, z)
-                break
+        best_pos = find_vec3(raw, max(0, size - 20), size - 11)
 
         if best_pos:
             results.append(
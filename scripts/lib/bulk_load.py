@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Bulk-load mode for the canonical database during setup.py.
+
+A from-scratch build writes millions of rows through SQLite's defaults
+(rollback journal, synchronous=FULL, every secondary index maintained per
+row). setup.py wraps its writing stages in begin_bulk_load/end_bulk_load:
+
+  begin  journal_mode=WAL (persistent, so extractor subprocesses share it),
+         secondary indexes dropped except the ones the loaders look rows up
+         by, and VANGUARD_DB_BULK_LOAD=1 exported to child processes
+  stage  each writer calls apply_bulk_pragmas on its connection:
+         synchronous=OFF, a 256 MB page cache, in-memory temp tables
+  end    indexes recreated from their saved SQL, ANALYZE, then back to
+         journal_mode=DELETE for serving
+
+synchronous=OFF trades durability for speed only while the build runs: a
+crash mid-build can corrupt the database, which setup.py --reset rebuilds
+anyway. If a run dies before end_bulk_load, rerunning init_database
+(setup.py --db) restores the dropped indexes (CREATE INDEX IF NOT EXISTS).
+
+Usage:
+    dropped = begin_bulk_load(db_path, tables)
+    ... run stages ...
+    end_bulk_load(db_path, dropped, tables)
+
+    conn = sqlite3.connect(db_path)
+    apply_bulk_pragmas(conn)            # No-op outside a bulk load
+"""
+
+import os
+import sqlite3
+from typing import Iterable, List, Tuple
+
+BULK_LOAD_ENV = "VANGUARD_DB_BULK_LOAD"
+
+# Page cache for bulk writers (negative = KiB, so 256 MB)
+BULK_CACHE_SIZE = -262144
+
+# Wait this long (ms) for a concurrent stage's write lock instead of failing
+BUSY_TIMEOUT_MS = 600000
+
+# Indexes the loaders themselves look rows up by (per-chunk replace, property
+# and import joins for exports_rtree, mesh bounds); dropping them would turn
+# each chunk's DELETE/SELECT into a table scan.
+KEEP_INDEXES = frozenset({
+    "idx_exports_chunk",
+    "idx_names_chunk",
+    "idx_imports_chunk",
+    "idx_properties_export",
+    "idx_mesh_bounds_name",
+})
+
+
+def bulk_load_enabled() -> bool:
+    """True inside a setup.py bulk load (set for extractor subprocesses)."""
+    return os.environ.get(BULK_LOAD_ENV) == "1"
+
+
+def apply_bulk_pragmas(conn: sqlite3.Connection, force: bool = False) -> bool:
+    """Switch a writer connection to bulk settings if a bulk load is running (or force)."""
+    if not (force or bulk_load_enabled()):
+        return False
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(f"PRAGMA cache_size = {BULK_CACHE_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    return True
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection, tables: Iterable[str] = None) -> List[Tuple[str, str]]:
+    """
+    Drop idx_* indexes not in KEEP_INDEXES (only on tables, when given);
+    returns [(name, create_sql), ...] to restore.
+    """
+    dropped = conn.execute("""
+        SELECT name, tbl_name, sql FROM sqlite_master
+        WHERE type = 'index' AND name LIKE 'idx_%' AND sql IS NOT NULL
+        ORDER BY name
+    """).fetchall()
+    wanted = set(tables) if tables is not None else None
+    dropped = [(name, sql) for name, table, sql in dropped
+               if name not in KEEP_INDEXES and (wanted is None or table in wanted)]
+    for name, _ in dropped:
+        conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+    conn.commit()
+    return dropped
+
+
+def restore_indexes(conn: sqlite3.Connection, dropped: List[Tuple[str, str]]):
+    """Recreate indexes from their saved CREATE INDEX statements."""
+    for name, sql in dropped:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone():
+            continue
+        conn.execute(sql)
+    conn.commit()
+
+
+def begin_bulk_load(db_path: str, tables: Iterable[str] = None) -> List[Tuple[str, str]]:
+    """
+    Put the database in bulk-load mode, dropping secondary indexes on tables
+    (all tables when None); returns the dropped indexes for end_bulk_load.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        dropped = drop_secondary_indexes(conn, tables)
+    finally:
+        conn.close()
+    os.environ[BULK_LOAD_ENV] = "1"
+    return dropped
+
+
+def end_bulk_load(db_path: str, dropped: List[Tuple[str, str]], tables: Iterable[str] = None):
+    """
+    Rebuild dropped indexes, ANALYZE (tables, or the whole database when None)
+    and return to durable serving settings.
+    """
+    os.environ.pop(BULK_LOAD_ENV, None)
+    conn = sqlite3.connect(db_path)
+    try:
+        apply_bulk_pragmas(conn, force=True)  # Sort space for the index builds
+        restore_indexes(conn, dropped)
+        if tables is None:
+            conn.execute("ANALYZE")
+        else:
+            existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table in sorted(set(tables) & existing):
+                conn.execute(f'ANALYZE "{table}"')
+        conn.commit()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("PRAGMA synchronous = FULL")
+    finally:
+        conn.close()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Vertex attribute quantization for glTF writers (KHR_mesh_quantization).
+
+- POSITION: int16, dequantized by the node's translation + uniform scale
+- NORMAL:   int8 normalized (padded to 4 bytes per vertex)
+- TEXCOORD: uint16 normalized (UVs must lie in [0, 1])
+
+Every quantize_* function also returns the maximum dequantization error, so
+writers can report the fidelity of what they emitted.
+
+Usage:
+    q_pos, translation, scale, pos_err = quantize_positions(positions)
+    node.update({"translation": translation, "scale": [scale] * 3})
+    add_extension(gltf)
+"""
+
+import numpy as np
+
+KHR_MESH_QUANTIZATION = "KHR_mesh_quantization"
+
+INT16_MAX = 32767
+
+
+def quantize_positions(positions):
+    """
+    Quantize float positions to int16 around their bounding-box center.
+
+    Returns (q, translation, scale, max_error): q is (n, 4) int16 (4th component
+    is padding so each vertex is 8 bytes), and positions ~= q[:, :3] * scale + translation.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    lo = positions.min(axis=0)
+    hi = positions.max(axis=0)
+    center = (lo + hi) / 2
+    extent = float((hi - lo).max()) / 2
+    scale = extent / INT16_MAX if extent > 0 else 1.0
+
+    q = np.zeros((len(positions), 4), dtype="<i2")
+    q[:, :3] = np.clip(np.round((positions - center) / scale), -INT16_MAX, INT16_MAX)
+    restored = q[:, :3] * scale + center
+    max_error = float(np.abs(restored - positions).max()) if len(positions) else 0.0
+    return q, center.tolist(), scale, max_error
+
+
+def quantize_normals(normals):
+    """
+    Quantize unit normals to normalized int8.
+
+    Returns (q, max_error_degrees): q is (n, 4) int8 (padded), error is the
+    largest angle between an input normal and its dequantized direction.
+    """
+    normals = np.asarray(normals, dtype=np.float64)
+    q = np.zeros((len(normals), 4), dtype="i1")
+    q[:, :3] = np.clip(np.round(normals * 127), -127, 127)
+    restored = q[:, :3] / 127.0
+    lengths = np.linalg.norm(restored, axis=1)
+    lengths[lengths == 0] = 1.0
+    cos = np.clip(np.sum(restored * normals, axis=1) / lengths, -1.0, 1.0)
+    max_error = float(np.degrees(np.arccos(cos)).max()) if len(normals) else 0.0
+    return q, max_error
+
+
+def quantize_uvs(uvs):
+    """
+    Quantize [0, 1] texture coordinates to normalized uint16.
+
+    Returns (q, max_error) with q as (n, 2) uint16.
+    """
+    uvs = np.asarray(uvs, dtype=np.float64)
+    if len(uvs) and (uvs.min() < 0 or uvs.max() > 1):
+        raise ValueError("normalized uint16 UVs must lie in [0, 1]")
+    q = np.round(uvs * 65535).astype("<u2")
+    max_error = float(np.abs(q / 65535.0 - uvs).max()) if len(uvs) else 0.0
+    return q, max_error
+
+
+def quantized_bounds(q):
+    """Accessor min/max (in quantized units) for the first three components."""
+    return q[:, :3].min(axis=0).tolist(), q[:, :3].max(axis=0).tolist()
+
+
+def add_extension(gltf):
+    """Declare KHR_mesh_quantization as used and required."""
+    for key in ("extensionsUsed", "extensionsRequired"):
+        exts = gltf.setdefault(key, [])
+        if KHR_MESH_QUANTIZATION not in exts:
+            exts.append(KHR_MESH_QUANTIZATION)
+
+
+def merge_report(report, **errors):
+    """Keep the maximum of each error in a running fidelity report dict."""
+    if report is None:
+        return
+    for key, value in errors.items():
+        report[key] = max(report.get(key, 0.0), value)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Offline index/vertex buffer optimization for exported meshes (pure Python + NumPy).
+
+- compact_triangles: drop degenerate triangles (repeated index)
+- tipsify:          vertex-cache-aware triangle reordering
+                    (Sander, Nehab, Barczak 2007, "Fast Triangle Reordering for
+                    Vertex Locality and Reduced Overdraw")
+- reorder_vertices: vertex fetch reordering + compaction (first-use order,
+                    unreferenced vertices dropped)
+- acmr:             average cache miss ratio (misses per triangle) for a FIFO cache
+
+Every pass assumes 0 <= index < vertex_count; heuristically parsed buffers may
+break that, so check indices_in_range first (optimize_mesh raises ValueError).
+
+Usage:
+    if indices_in_range(indices, vertex_count):
+        indices, vertex_order, stats = optimize_mesh(indices, vertex_count)
+        positions = positions[vertex_order]   # same for every vertex attribute
+
+    python mesh_optimize.py                   # Run the self-checks
+"""
+
+from collections import deque
+
+import numpy as np
+
+DEFAULT_CACHE_SIZE = 16  # Post-transform cache size the triangle order is tuned for
+ACMR_CACHE_SIZE = 32     # FIFO size used when reporting ACMR
+
+
+def acmr(indices, cache_size=ACMR_CACHE_SIZE):
+    """Average cache miss ratio of a triangle list under a FIFO cache (0.5 is ideal, 3.0 worst)."""
+    triangles = len(indices) // 3
+    if not triangles:
+        return 0.0
+    cache = set()
+    fifo = deque()
+    misses = 0
+    for v in np.asarray(indices).tolist():
+        if v in cache:
+            continue
+        misses += 1
+        cache.add(v)
+        fifo.append(v)
+        if len(fifo) > cache_size:
+            cache.discard(fifo.popleft())
+    return misses / triangles
+
+
+def indices_in_range(indices, vertex_count):
+    """True if every index addresses one of vertex_count vertices (an empty buffer passes)."""
+    indices = np.asarray(indices)
+    if not len(indices):
+        return True
+    return int(indices.min()) >= 0 and int(indices.max()) < vertex_count
+
+
+def compact_triangles(indices):
+    """Triangle list without degenerate triangles (two or more identical indices)."""
+    tris = np.asarray(indices).reshape(-1, 3)
+    keep = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 0] != tris[:, 2])
+    return tris[keep].reshape(-1)
+
+
+def _vertex_triangles(tris, vertex_count):
+    """CSR adjacency: triangles using vertex v are order[start[v]:start[v + 1]]."""
+    corner_vertex = tris.reshape(-1)
+    order = np.argsort(corner_vertex, kind="stable") // 3
+    start = np.zeros(vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(corner_vertex, minlength=vertex_count), out=start[1:])
+    return order.tolist(), start.tolist()
+
+
+def tipsify(indices, vertex_count, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Reorder triangles for post-transform vertex cache locality (Tipsify).
+
+    Fans around a current vertex, then moves to the candidate vertex that is
+    still in the simulated cache and has live triangles left; dead ends fall back
+    to a stack of recently used vertices, then to a sweep over all vertices.
+    Returns the reordered index array (same dtype as the input).
+    """
+    indices = np.asarray(indices)
+    tris = indices.reshape(-1, 3).astype(np.int64)
+    if not len(tris):
+        return indices.copy()
+
+    adjacency, start = _vertex_triangles(tris, vertex_count)
+    tri_list = tris.tolist()
+    live = np.bincount(tris.reshape(-1), minlength=vertex_count).tolist()
+    cache_time = [0] * vertex_count
+    emitted = [False] * len(tri_list)
+    dead_end = []
+    output = []
+
+    timestamp = cache_size + 1
+    cursor = 0
+    fanning = int(tris[0, 0])
+
+    while fanning >= 0:
+        candidates = []
+        for t in adjacency[start[fanning]:start[fanning + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            output.append(t)
+            for v in tri_list[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if timestamp - cache_time[v] > cache_size:
+                    cache_time[v] = timestamp
+                    timestamp += 1
+
+        # Next fanning vertex: a candidate that will still be in cache after its fan
+        fanning = -1
+        best = -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if timestamp - cache_time[v] + 2 * live[v] <= cache_size:
+                    priority = timestamp - cache_time[v]
+                if priority > best:
+                    best = priority
+                    fanning = v
+
+        if fanning == -1:
+            # Dead end: most recent vertex with live triangles, else sweep
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fanning = v
+                    break
+            else:
+                while cursor < vertex_count:
+                    if live[cursor] > 0:
+                        fanning = cursor
+                        break
+                    cursor += 1
+
+    return tris[output].reshape(-1).astype(indices.dtype)
+
+
+def reorder_vertices(indices, vertex_count):
+    """
+    Vertex fetch reordering + compaction.
+
+    Vertices are renumbered in order of first use by the index buffer, so fetches
+    walk memory forward; vertices no triangle references are dropped.
+    Returns (new_indices, vertex_order) where new vertex i is old vertex_order[i].
+    """
+    indices = np.asarray(indices)
+    if not len(indices):
+        return indices.copy(), np.zeros(0, dtype=np.int64)
+    unique, first_use = np.unique(indices, return_index=True)
+    vertex_order = unique[np.argsort(first_use)].astype(np.int64)
+    remap = np.full(vertex_count, -1, dtype=np.int64)
+    remap[vertex_order] = np.arange(len(vertex_order))
+    return remap[indices].astype(indices.dtype), vertex_order
+
+
+def optimize_mesh(indices, vertex_count, cache_size=DEFAULT_CACHE_SIZE):
+    """
+    Full pass: compact degenerate triangles, Tipsify, then reorder/compact vertices.
+    Tipsify's order is only kept if it beats the original order's ACMR.
+
+    Returns (indices, vertex_order, stats); apply vertex_order to every vertex
+    attribute. stats has acmr_before/acmr_after plus triangle and vertex counts.
+    Raises ValueError if an index is outside [0, vertex_count).
+    """
+    indices = np.asarray(indices)
+    if not indices_in_range(indices, vertex_count):
+        raise ValueError(f"index buffer references vertex {int(indices.max())} "
+                         f"but the mesh has {vertex_count} vertices")
+    compacted = compact_triangles(indices)
+    # Measured on the compacted list so dropping degenerates doesn't skew the ratio
+    before = acmr(compacted)
+    ordered = tipsify(compacted, vertex_count, cache_size)
+    after = acmr(ordered)
+    if before <= after:
+        # Small or already well-ordered meshes: keep the original triangle order
+        ordered = compacted
+        after = before
+    new_indices, vertex_order = reorder_vertices(ordered, vertex_count)
+    stats = {
+        "acmr_before": before,
+        "acmr_after": after,
+        "triangles_before": len(indices) // 3,
+        "triangles_after": len(new_indices) // 3,
+        "vertices_before": vertex_count,
+        "vertices_after": len(vertex_order),
+    }
+    return new_indices, vertex_order, stats
+
+
+# =============================================================================
+# TEST
+# =============================================================================
+
+if __name__ == "__main__":
+    # Two quads sharing an edge, plus a degenerate triangle
+    quads = np.array([0, 1, 2, 2, 1, 3, 2, 3, 4, 4, 3, 5, 1, 1, 3], dtype=np.uint16)
+    new_indices, order, stats = optimize_mesh(quads, 7)
+    assert stats["triangles_after"] == 4 and stats["vertices_after"] == 6  # Vertex 6 unreferenced
+    assert sorted(map(tuple, np.sort(order[new_indices].reshape(-1, 3), axis=1))) == \
+        sorted(map(tuple, np.sort(compact_triangles(quads).reshape(-1, 3), axis=1)))
+
+    # Regression: an index past vertex_count used to fail inside np.bincount
+    bad = np.array([0, 1, 2, 2, 1, 5], dtype=np.uint16)
+    assert not indices_in_range(bad, 4) and indices_in_range(bad, 6)
+    try:
+        optimize_mesh(bad, 4)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("optimize_mesh accepted an out-of-range index")
+    print("mesh_optimize: OK")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compact storage for unknown byte regions (unknown_regions table).
+
+A region is stored as (file_id, absolute file offset, size) plus, optionally, its
+bytes as a zlib-compressed BLOB. Hex is materialized on demand: from the BLOB when
+present, otherwise by reading the source package (packages are uncompressed, so
+export offsets are file offsets). Rows written before this scheme keep raw_hex.
+
+Usage:
+    ensure_region_columns(conn)
+    data = region_bytes(conn, region_id, assets_path)
+"""
+
+import os
+import zlib
+
+# Columns added to unknown_regions after the original (raw_hex) schema
+REGION_COLUMNS = {
+    "file_id": "INTEGER",
+    "abs_offset": "INTEGER",
+    "size": "INTEGER",
+    "data_zlib": "BLOB",
+}
+
+ZLIB_LEVEL = 6
+
+
+def ensure_region_columns(conn):
+    """Add the compact-region columns to unknown_regions on older databases."""
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(unknown_regions)")}
+    if not existing:
+        return
+    for column, column_type in REGION_COLUMNS.items():
+        if column not in existing:
+            conn.execute(f"ALTER TABLE unknown_regions ADD COLUMN {column} {column_type}")
+    conn.commit()
+
+
+def compress_region(raw):
+    """zlib BLOB for a region's bytes."""
+    return zlib.compress(bytes(raw), ZLIB_LEVEL)
+
+
+def read_region(file_path, abs_offset, size):
+    """Read a region straight from its source package."""
+    with open(file_path, "rb") as f:
+        f.seek(abs_offset)
+        data = f.read(size)
+    if len(data) != size:
+        raise ValueError(f"{file_path}: region at {abs_offset} (+{size}) is past end of file")
+    return data
+
+
+def resolve_file_path(file_path, assets_path):
+    """files.file_path is stored relative to ASSETS_PATH where possible."""
+    return file_path if os.path.isabs(file_path) else os.path.join(assets_path, file_path)
+
+
+def region_bytes(conn, region_id, assets_path):
+    """
+    Bytes of one unknown_regions row and where they came from.
+
+    Returns (data, source) with source 'blob', 'package' or 'raw_hex' (legacy rows).
+    Raises KeyError for an unknown id.
+    """
+    row = conn.execute("""
+        SELECT r.abs_offset, r.size, r.data_zlib, r.raw_hex, f.file_path
+        FROM unknown_regions r
+        LEFT JOIN files f ON f.id = r.file_id
+        WHERE r.id = ?
+    """, (region_id,)).fetchone()
+    if row is None:
+        raise KeyError(region_id)
+    abs_offset, size, data_zlib, raw_hex, file_path = row
+    if data_zlib is not None:
+        return zlib.decompress(data_zlib), "blob"
+    if file_path is not None and abs_offset is not None:
+        return read_region(resolve_file_path(file_path, assets_path), abs_offset, size), "package"
+    if raw_hex is not None:
+        return bytes.fromhex(raw_hex), "raw_hex"
+    raise ValueError(f"Region {region_id} has no stored bytes and no source location")
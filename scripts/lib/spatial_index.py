@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+SQLite R*Tree over placed objects (exports with a position), in world coordinates.
+
+exports_rtree holds one box per placed export (id = exports.id), with the exact
+world position as auxiliary columns (the box corners are float32). Positions are
+chunk-relative, so the box is offset by the chunk origin (ue2.world, signed
+chunk coordinates from the filename). When the export's StaticMesh import has a
+row in mesh_bounds, the box is widened to a conservative cube around the mesh's
+bounding sphere (radius + |center| as an L1 norm, times DrawScale), which holds
+for any rotation; otherwise it is the point itself.
+
+The chunk crawler keeps the tree current per chunk (index_chunk inside its
+transaction); rebuild_spatial_index refills it from the database, e.g. after a
+mesh_bounds scan or on databases filled by the legacy passes.
+
+Usage:
+    ensure_spatial_index(conn)
+    rows = objects_in_box(conn, min_x, min_y, min_z, max_x, max_y, max_z)
+    rows = objects_near(conn, x, y, z, radius)
+"""
+
+from typing import Dict, List
+
+from ue2.world import CHUNK_SIZE, parse_chunk_coords
+
+RTREE_TABLE = "exports_rtree"
+
+
+def ensure_spatial_index(conn) -> bool:
+    """Create exports_rtree if missing. Returns False if this SQLite build lacks R*Tree."""
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE}
+            USING rtree(id, min_x, max_x, min_y, max_y, min_z, max_z, +world_x REAL, +world_y REAL, +world_z REAL)
+        """)
+    except Exception as e:
+        if "rtree" in str(e).lower():
+            return False
+        raise
+    return True
+
+
+def _has_table(conn, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def remove_chunk(cursor, chunk_id: int):
+    """Drop a chunk's boxes (call before its exports are deleted)."""
+    cursor.execute(f"DELETE FROM {RTREE_TABLE} WHERE id IN (SELECT id FROM exports WHERE chunk_id = ?)",
+                   (chunk_id,))
+
+
+def index_chunk(cursor, chunk_id: int, filename: str) -> int:
+    """
+    Insert boxes for a chunk's placed exports (its exports, properties and
+    imports rows must already be written). Returns the number of boxes.
+    """
+    chunk_x, chunk_y = parse_chunk_coords(filename)
+    if chunk_x is None:
+        return 0
+    if _has_table(cursor.connection, "mesh_bounds"):
+        # StaticMesh property value is the object reference (import index) as text
+        radius_sql = """
+            COALESCE((
+                SELECT MAX(b.sphere_radius + ABS(b.sphere_x) + ABS(b.sphere_y) + ABS(b.sphere_z))
+                FROM properties p
+                JOIN imports i ON i.chunk_id = e.chunk_id AND i.import_index = CAST(p.value_text AS INTEGER)
+                JOIN mesh_bounds b ON b.mesh_name = i.object_name AND b.bounds_valid = 1
+                WHERE p.export_id = e.id AND p.prop_name = 'StaticMesh'
+            ), 0.0) * COALESCE((
+                SELECT ABS(CAST(p.value_text AS REAL)) FROM properties p
+                WHERE p.export_id = e.id AND p.prop_name = 'DrawScale' LIMIT 1
+            ), 1.0)
+        """
+    else:
+        radius_sql = "0.0"
+    cursor.execute(f"""
+        INSERT OR REPLACE INTO {RTREE_TABLE}
+            (id, min_x, max_x, min_y, max_y, min_z, max_z, world_x, world_y, world_z)
+        SELECT id, x - r, x + r, y - r, y + r, z - r, z + r, x, y, z FROM (
+            SELECT e.id,
+                   e.position_x + :origin_x AS x,
+                   e.position_y + :origin_y AS y,
+                   e.position_z AS z,
+                   {radius_sql} AS r
+            FROM exports e
+            WHERE e.chunk_id = :chunk_id AND e.position_x IS NOT NULL
+              AND e.position_y IS NOT NULL AND e.position_z IS NOT NULL
+        )
+    """, {"chunk_id": chunk_id, "origin_x": chunk_x * CHUNK_SIZE, "origin_y": chunk_y * CHUNK_SIZE})
+    return cursor.rowcount
+
+
+def rebuild_spatial_index(conn) -> int:
+    """Refill exports_rtree from exports for every chunk; returns the number of boxes."""
+    if not ensure_spatial_index(conn):
+        return 0
+    total = 0
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM {RTREE_TABLE}")
+        for chunk_id, filename in conn.execute("SELECT id, filename FROM chunks").fetchall():
+            total += index_chunk(cursor, chunk_id, filename)
+    return total
+
+
+def objects_in_box(conn, min_x: float, min_y: float, min_z: float,
+                   max_x: float, max_y: float, max_z: float) -> List[Dict]:
+    """
+    Placed objects whose box intersects the world-space box, as dicts with
+    export_id, chunk_id, object_name, class_name and world x/y/z.
+    """
+    rows = conn.execute(f"""
+        SELECT e.id, e.chunk_id, e.object_name, e.class_name, r.world_x, r.world_y, r.world_z
+        FROM {RTREE_TABLE} r
+        JOIN exports e ON e.id = r.id
+        WHERE r.max_x >= ? AND r.min_x <= ?
+          AND r.max_y >= ? AND r.min_y <= ?
+          AND r.max_z >= ? AND r.min_z <= ?
+    """, (min_x, max_x, min_y, max_y, min_z, max_z)).fetchall()
+    return [
+        {"export_id": row[0], "chunk_id": row[1], "object_name": row[2], "class_name": row[3],
+         "x": row[4], "y": row[5], "z": row[6]}
+        for row in rows
+    ]
+
+
+def objects_near(conn, x: float, y: float, z: float, radius: float) -> List[Dict]:
+    """Placed objects within radius (world units) of a world point, across chunk borders."""
+    candidates = objects_in_box(conn, x - radius, y - radius, z - radius, x + radius, y + radius, z + radius)
+    return [
+        obj for obj in candidates
+        if (obj["x"] - x) ** 2 + (obj["y"] - y) ** 2 + (obj["z"] - z) ** 2 <= radius * radius
+    ]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware scheduler for setup.py stages.
+
+Each Stage declares the database tables it reads (inputs) and writes
+(outputs). A stage depends on every earlier-declared stage that writes one of
+its inputs, writes one of the same tables, or reads a table it writes; other
+stages run concurrently as long as their CPU costs fit the budget (a stage
+larger than the budget runs alone). Only the stages passed in are scheduled,
+so tables written by stages not selected for this run count as already built.
+
+Concurrent stages share one SQLite database, so this only pays off while every
+writer keeps its write transactions short (parse outside the transaction, then
+executemany and commit per batch) and waits on a locked database instead of
+failing: setup.py's writers call bulk_load.apply_bulk_pragmas, which sets
+BUSY_TIMEOUT_MS. A writer that holds the lock for a whole scan serializes the
+others behind it, and one without the timeout fails with "database is locked";
+give such a stage cpus=cpu_budget so it runs alone.
+
+A stage that fails (returns False or raises) marks its dependents skipped;
+independent stages keep running. After the run, critical_path gives the chain
+of dependent stages with the longest total duration, the lower bound on wall
+time for this stage graph however many CPUs are available.
+
+Usage:
+    stages = [Stage('files', 'Index files', index_files, outputs=('files',)), ...]
+    results = run_stages(stages, cpu_budget=os.cpu_count())
+    path, seconds = critical_path(stages, results)
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Sequence, Tuple
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class Stage:
+    """One setup stage: run() returns False (or raises) on failure."""
+    name: str
+    label: str
+    run: Callable[[], bool]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    cpus: int = 1
+
+
+@dataclass
+class StageResult:
+    status: str
+    seconds: float = 0.0
+    started: float = 0.0
+    error: str = None
+    deps: List[str] = field(default_factory=list)
+
+
+def stage_dependencies(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """Stage name -> names of earlier stages it must wait for (read/write overlaps on tables)."""
+    deps = {}
+    for i, stage in enumerate(stages):
+        reads, writes = set(stage.inputs), set(stage.outputs)
+        deps[stage.name] = [
+            earlier.name for earlier in stages[:i]
+            if set(earlier.outputs) & (reads | writes) or set(earlier.inputs) & writes
+        ]
+    return deps
+
+
+def run_stages(stages: Sequence[Stage], cpu_budget: int = 1,
+               log: Callable[[str], None] = print) -> Dict[str, StageResult]:
+    """
+    Run stages in dependency order, starting every ready stage whose CPU cost
+    fits the remaining budget. Returns stage name -> StageResult.
+    """
+    cpu_budget = max(1, cpu_budget)
+    deps = stage_dependencies(stages)
+    results: Dict[str, StageResult] = {}
+    pending = list(stages)
+    running = {}
+    cpus_in_use = 0
+    t0 = time.perf_counter()
+    log_lock = threading.Lock()
+
+    def timed(stage: Stage):
+        start = time.perf_counter()
+        try:
+            ok, error = stage.run() is not False, None
+        except Exception as e:
+            ok, error = False, str(e)
+        return ok, error, start - t0, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max(1, len(stages))) as pool:
+        while pending or running:
+            for stage in list(pending):
+                waiting_on = deps[stage.name]
+                if any(results.get(d) and results[d].status != OK for d in waiting_on):
+                    pending.remove(stage)
+                    results[stage.name] = StageResult(SKIPPED, deps=waiting_on)
+                    with log_lock:
+                        log(f"   - {stage.label} skipped (an input stage did not complete)")
+                    continue
+                if not all(d in results for d in waiting_on):
+                    continue
+                cost = min(max(1, stage.cpus), cpu_budget)
+                if running and cpus_in_use + cost > cpu_budget:
+                    continue
+                pending.remove(stage)
+                cpus_in_use += cost
+                with log_lock:
+                    log(f"   ▶ {stage.label} started")
+                running[pool.submit(timed, stage)] = (stage, cost)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, cost = running.pop(future)
+                cpus_in_use -= cost
+                ok, error, started, seconds = future.result()
+                results[stage.name] = StageResult(OK if ok else FAILED, seconds, started, error,
+                                                  deps[stage.name])
+                with log_lock:
+                    mark = "✓" if ok else "❌"
+                    log(f"   {mark} {stage.label} {'finished' if ok else 'failed'} ({seconds:.1f}s)"
+                        + (f": {error}" if error else ""))
+    return results
+
+
+def critical_path(stages: Sequence[Stage], results: Dict[str, StageResult]) -> Tuple[List[str], float]:
+    """Longest-duration chain of dependent stages that ran: (stage names, total seconds)."""
+    longest: Dict[str, Tuple[float, List[str]]] = {}
+    for stage in stages:
+        result = results.get(stage.name)
+        if result is None or result.status == SKIPPED:
+            continue
+        before = max((longest[d] for d in result.deps if d in longest), default=(0.0, []))
+        longest[stage.name] = (before[0] + result.seconds, before[1] + [stage.name])
+    if not longest:
+        return [], 0.0
+    seconds, path = max(longest.values())
+    return path, seconds
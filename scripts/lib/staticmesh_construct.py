@@ -7,6 +7,9 @@ Based on reverse engineering of P0001_Sun_Meshes.usx and PARSING_GUIDELINES.md
 from construct import *
 import io
 import struct
+from time import perf_counter
+
+import numpy as np
 
 # =============================================================================
 # PRIMITIVE TYPES
@@ -68,6 +71,16 @@ FVanguardLODVertex = Struct(
     "v" / Float32l,  # 4 bytes
 )
 
+# NumPy view of FVanguardLODVertex for decoding whole vertex streams at once
+LOD_VERTEX_DTYPE = np.dtype([
+    ("position", "<f4", 3),
+    ("normal", "<f4", 3),
+    ("tangent_x", "<f4", 3),
+    ("tangent_y", "<f4", 3),
+    ("uv", "<f4", 2),
+])
+assert LOD_VERTEX_DTYPE.itemsize == FVanguardLODVertex.sizeof() == 56
+
 # UV Stream entry
 FUVStream = Struct(
     "count" / Int32sl,
@@ -311,17 +324,197 @@ def find_none_terminator(data: bytes, names: list) -> int:
     raise ValueError(f"Never found None terminator or exceeded limit (pos={pos})")
 
 
+# =============================================================================
+# VECTORIZED PROBES
+# =============================================================================
+# The heuristic searches below test a small int pattern at every byte offset of a
+# window. Instead of one struct.unpack per offset, the window is viewed as 4-byte
+# words at each of the four byte alignments and all offsets are tested at once.
+# Each probe returns the same first match (by offset, then candidate order) as a
+# byte-by-byte loop would.
+
+# InternalVersion offsets after the bounds start: standard 40/41, vanguard-variant 44/45, 48/52
+ANCHOR_OFFSETS = np.array([40, 41, 44, 45, 48, 52])
+
+# Anchor gaps whose bytes are exactly FBox + FSphere: 40 = Vanguard's 24-byte
+# FBox, 41 = standard UE2 FBox with its 1-byte IsValid. Where the extra bytes of
+# the 44/45/48/52 gaps sit relative to the bounds is unknown.
+BOUNDS_VERIFIED_OFFSETS = frozenset({40, 41})
+
+
+def words_at(data: bytes, start: int, count: int, dtype: str = "<i4") -> np.ndarray:
+    """4-byte values beginning at every byte offset start .. start+count-1 (clipped to data)."""
+    count = max(0, min(count, len(data) - start - 3))
+    out = np.empty(count, dtype=dtype)
+    for alignment in range(min(4, count)):
+        n = len(range(alignment, count, 4))
+        out[alignment::4] = np.frombuffer(data, dtype=dtype, count=n, offset=start + alignment)
+    return out
+
+
+def find_core_anchor(data: bytes, v_anchors, search_limit: int = 2048):
+    """
+    Brute-force search for the InternalVersion anchor in the first 2KB.
+
+    Looks for [Version in v_anchors][0 <= SectionCount < max_sc] at i + ANCHOR_OFFSETS,
+    first with max_sc=20 and then 200. Returns (core_start, v_off) or (-1, -1).
+    """
+    search_limit = min(len(data) - 60, search_limit)
+    if search_limit <= 0:
+        return -1, -1
+    words = words_at(data, 0, search_limit + 60)
+    pos = np.arange(search_limit)[:, None] + ANCHOR_OFFSETS[None, :]
+    is_anchor = np.isin(words[pos], v_anchors)
+    sec_count = words[pos + 4]
+    for max_sc in [20, 200]:
+        hits = is_anchor & (sec_count >= 0) & (sec_count < max_sc)
+        if hits.any():
+            i, k = divmod(int(np.argmax(hits)), len(ANCHOR_OFFSETS))
+            return i, int(ANCHOR_OFFSETS[k])
+    return -1, -1
+
+
+def find_lod_block(data: bytes, start: int, window: int = 100) -> int:
+    """
+    First offset in [start, start+window) followed by LODVersion (0-1) at +8 and
+    LODCount (1-5) at +12, or -1.
+    """
+    count = min(start + window, len(data) - 16) - start
+    if count <= 0:
+        return -1
+    words = words_at(data, start, count + 16, "<u4")
+    lod_version = words[8:8 + count]
+    lod_count = words[12:12 + count]
+    hits = (lod_version <= 1) & (lod_count >= 1) & (lod_count <= 5)
+    return start + int(np.argmax(hits)) if hits.any() else -1
+
+
+def find_index_header(data: bytes, start: int, vertex_count: int):
+    """
+    Probe 0-60 bytes (4-byte steps) after the vertex block for the index buffer header.
+
+    The pattern is [val1, unk0, val2, unk1, val3, index_count] followed by the first
+    index: index_count in 3..1,000,000 and first index < vertex_count.
+    Returns (index_count, header_size) or (0, 0).
+    """
+    offsets = np.arange(0, 64, 4)
+    offsets = offsets[start + offsets + 26 <= len(data)]
+    if not len(offsets):
+        return 0, 0
+    buf = np.frombuffer(data, dtype=np.uint8)
+    probe = start + offsets
+    index_count = words_at(data, start + 20, int(offsets[-1]) + 1, "<u4")[offsets]
+    first_index = buf[probe + 24].astype(np.uint32) | (buf[probe + 25].astype(np.uint32) << 8)
+    hits = (index_count >= 3) & (index_count <= 1000000) & (first_index < vertex_count)
+    if not hits.any():
+        return 0, 0
+    k = int(np.argmax(hits))
+    return int(index_count[k]), int(offsets[k]) + 24
+
+
+def parse_bounds(data: bytes, core_start: int, v_off: int) -> dict:
+    """
+    UPrimitive bounds in front of InternalVersion (at core_start + v_off).
+
+    Only read for BOUNDS_VERIFIED_OFFSETS, where the gap is FBox (min/max, plus
+    IsValid at 41) followed by FSphere. Returns {"bounding_box": {...},
+    "bounding_sphere": {...}, "bounds_valid": bool}; for any other gap the layout
+    is unknown and the result is {"bounds_valid": False, "bounds_layout": "unknown"}
+    with no box or sphere.
+    """
+    if v_off not in BOUNDS_VERIFIED_OFFSETS:
+        return {"bounds_valid": False, "bounds_layout": "unknown"}
+    box_pos = core_start
+    sphere_pos = core_start + v_off - 16
+    bmin = struct.unpack("<3f", data[box_pos : box_pos + 12])
+    bmax = struct.unpack("<3f", data[box_pos + 12 : box_pos + 24])
+    sphere = struct.unpack("<4f", data[sphere_pos : sphere_pos + 16])
+    values = np.array(bmin + bmax + sphere)
+    valid = bool(
+        np.isfinite(values).all()
+        and all(lo <= hi for lo, hi in zip(bmin, bmax))
+        and sphere[3] >= 0
+    )
+    return {
+        "bounding_box": {
+            "min": dict(zip("xyz", bmin)),
+            "max": dict(zip("xyz", bmax)),
+        },
+        "bounding_sphere": {
+            "center": dict(zip("xyz", sphere[:3])),
+            "radius": sphere[3],
+        },
+        "bounds_valid": valid,
+    }
+
+
 # =============================================================================
 # MAIN PARSER FUNCTION
 # =============================================================================
 
+PARSE_MODES = ("full", "header")
 
-def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
+
+class ParseProfile:
+    """
+    Optional step timers and path counters for parse_staticmesh.
+
+    times:  step -> [calls, seconds]   (properties, anchor, raw_triangles, ...)
+    counts: path -> hits               (anchor.fast / anchor.brute_force, ...)
+
+    Pass one instance to many parse_staticmesh calls to aggregate (e.g. per
+    package); merge() combines profiles, e.g. from worker processes.
+    """
+
+    __slots__ = ("times", "counts")
+
+    def __init__(self):
+        self.times = {}
+        self.counts = {}
+
+    def lap(self, step: str, start: float) -> float:
+        """Charge the time since `start` to `step`; returns now (the next step's start)."""
+        now = perf_counter()
+        entry = self.times.setdefault(step, [0, 0.0])
+        entry[0] += 1
+        entry[1] += now - start
+        return now
+
+    def hit(self, path: str, n: int = 1):
+        self.counts[path] = self.counts.get(path, 0) + n
+
+    def merge(self, other):
+        """Add another ParseProfile (or its as_dict()) into this one."""
+        times = other["times"] if isinstance(other, dict) else other.times
+        counts = other["counts"] if isinstance(other, dict) else other.counts
+        for step, (calls, seconds) in times.items():
+            entry = self.times.setdefault(step, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+        for path, n in counts.items():
+            self.hit(path, n)
+        return self
+
+    def as_dict(self) -> dict:
+        """Plain (picklable, JSON-able) copy."""
+        return {"times": {k: list(v) for k, v in self.times.items()}, "counts": dict(self.counts)}
+
+
+def parse_staticmesh(data: bytes, names: list, serial_offset: int, mode: str = "full",
+                     profile: ParseProfile = None) -> dict:
     """
     Parse a complete Vanguard StaticMesh with full byte coverage.
 
+    mode="header" stops once the bounds and LOD headers are located: each LOD
+    gets vertex_count/index_count but no vertex or index data, and no unknown
+    regions are captured. With a ParseProfile, each step's time and the
+    heuristic path taken are recorded into it (no timing calls otherwise).
+
     Returns dict with all parsed data and coverage metrics.
     """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode {mode!r} (expected one of {PARSE_MODES})")
+    header_only = mode == "header"
     result = {
         "bytes_total": len(data),
         "bytes_parsed": 0,
@@ -334,10 +527,14 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         "unknown_regions": [],
     }
 
+    t = perf_counter() if profile else 0.0
+
     # Step 1: Parse properties
     prop_end = find_none_terminator(data, names)
     result["data"]["properties_end"] = prop_end
     result["bytes_parsed"] += prop_end
+    if profile:
+        t = profile.lap("properties", t)
 
     # Step 2: Parse core structure up to RawTriangles
     # We look for the InternalVersion anchor.
@@ -365,27 +562,15 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         # We search for the pattern [Bounds][Padding?][Version][SectionCount]
         # Vanguard can have extra padding/fields (4-8 bytes) between properties and bounds,
         # or between bounds and InternalVersion.
-        search_limit = min(len(data) - 60, 2048)
-        
-        # Two-pass search: First look for reasonable sec_count (< 20), then fallback to < 200
-        for max_sc in [20, 200]:
-            if core_start != -1:
-                break
-            for i in range(0, search_limit):
-                # InternalVersion anchor can be at various offsets after prop_end
-                # standard: 40/41, vanguard-variant: 44/45, 48/52
-                for v_off in [40, 41, 44, 45, 48, 52]:
-                    if i + v_off + 8 <= len(data):
-                        ver = struct.unpack("<i", data[i + v_off : i + v_off + 4])[0]
-                        if ver in v_anchors:
-                            sc = struct.unpack("<i", data[i + v_off + 4 : i + v_off + 8])[0]
-                            if 0 <= sc < max_sc:
-                                core_start = i
-                                detected_v_off = v_off
-                                result["uses_heuristics"] = True
-                                break
-                if core_start != -1:
-                    break
+        core_start, detected_v_off = find_core_anchor(data, v_anchors)
+        if core_start != -1:
+            result["uses_heuristics"] = True
+        if profile:
+            profile.hit("anchor.brute_force" if core_start != -1 else "anchor.not_found")
+    elif profile:
+        profile.hit("anchor.fast")
+    if profile:
+        t = profile.lap("anchor", t)
 
     if core_start == -1:
         result["parse_status"] = "error"
@@ -440,6 +625,8 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         match_pos = data.find(b"\x00\x00\x00\x00\x00\x00", current_search)
         if match_pos == -1 or match_pos >= search_limit:
             break
+        if profile:
+            profile.hit("raw_triangles.candidates")
 
         # Check the pointer immediately following the zeros
         ptr = struct.unpack("<I", data[match_pos + 6 : match_pos + 10])[0]
@@ -465,6 +652,11 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         # Move search forward
         current_search = match_pos + 1
 
+    if profile:
+        profile.hit("raw_triangles.not_found" if padding_pos == -1 else
+                    "raw_triangles.pointer" if skip_pos else "raw_triangles.zero_fallback")
+        t = profile.lap("raw_triangles", t)
+
     if padding_pos == -1:
         result["parse_status"] = "error"
         result["error_message"] = (
@@ -479,6 +671,7 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         "internal_version": internal_version,
         "section_count": sec_count,
         "raw_triangles_skip_pos": skip_pos,
+        **parse_bounds(data, core_start, v_off),
     }
 
     # Step 3: Handle RawTriangles skip
@@ -502,14 +695,10 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
 
     # Step 4: Parse post-skip data (Physics, Auth, LODs)
     # The header before LODs can vary. We search for LODCount (1-5) and LODVersion (0-1).
-    lod_block_start = -1
-    for i in range(current_pos, min(current_pos + 100, len(data) - 16)):
-        v = struct.unpack("<I", data[i + 8 : i + 12])[0]
-        c = struct.unpack("<I", data[i + 12 : i + 16])[0]
-        if v in [0, 1] and 1 <= c <= 5:
-            # Check if next 20 bytes look like a LOD header (sec_count, vertex_count)
-            lod_block_start = i
-            break
+    lod_block_start = find_lod_block(data, current_pos)
+    if profile:
+        profile.hit("lod_block.probe" if lod_block_start != -1 else "lod_block.fallback")
+        t = profile.lap("lod_block", t)
 
     if lod_block_start == -1:
         # Fallback to current position
@@ -523,7 +712,8 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         "lod_count" / Int32sl,
     )
 
-    stream2 = io.BytesIO(data[current_pos:])
+    # Only the 16-byte header is read here; slicing the rest would copy every LOD
+    stream2 = io.BytesIO(data[current_pos : current_pos + PostSkipStructure.sizeof()])
     try:
         post_skip = PostSkipStructure.parse_stream(stream2)
         lod_version = post_skip.lod_version
@@ -589,6 +779,8 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
             else:
                 # Both headers give absurd vertex counts - likely reached end of valid LOD data
                 # Break with what we have
+                if profile:
+                    profile.hit("lod_header.invalid")
                 break
         
         # Verify we actually have space for this many vertices
@@ -596,74 +788,40 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
         required_bytes = vertex_count * 56  # 56 bytes per vertex
         if required_bytes > remaining_bytes:
             # Not enough data for claimed vertices - break with what we have
+            if profile:
+                profile.hit("lod_header.invalid")
             break
         else:
             lod_data.update({"sec_count": h12[0], "unk1": h12[1]})
 
         lod_data["vertex_count"] = vertex_count
         result["bytes_parsed"] += header_size
+        if profile:
+            profile.hit(f"lod_header.{header_size}")
+            t = profile.lap("lod_header", t)
 
         # Vertices (56 bytes each) - use direct data access for consistent tracking
         vertex_bytes = lod_data["vertex_count"] * 56
-        vertices_data = data[result["bytes_parsed"] : result["bytes_parsed"] + vertex_bytes]
-        result["bytes_parsed"] += vertex_bytes
+        if not header_only:
+            vertices_data = data[result["bytes_parsed"] : result["bytes_parsed"] + vertex_bytes]
 
-        # Store raw vertex data
-        lod_data["vertices_raw"] = vertices_data
-
-        # Parse vertex positions for easy access
-        parsed_vertices = []
-        for v_idx in range(lod_data["vertex_count"]):
-            v_offset = v_idx * 56
-            if v_offset + 12 <= len(vertices_data):
-                x, y, z = struct.unpack("<fff", vertices_data[v_offset : v_offset + 12])
-                # Also read normal (next 12 bytes)
-                nx, ny, nz = 0.0, 0.0, 1.0
-                if v_offset + 24 <= len(vertices_data):
-                    nx, ny, nz = struct.unpack(
-                        "<fff", vertices_data[v_offset + 12 : v_offset + 24]
-                    )
-                # Also read UV (next 8 bytes)
-                u, v = 0.0, 0.0
-                if v_offset + 32 <= len(vertices_data):
-                    u, v = struct.unpack(
-                        "<ff", vertices_data[v_offset + 24 : v_offset + 32]
-                    )
-                parsed_vertices.append(
-                    {
-                        "x": x,
-                        "y": y,
-                        "z": z,
-                        "nx": nx,
-                        "ny": ny,
-                        "nz": nz,
-                        "u": u,
-                        "v": v,
-                    }
-                )
-        lod_data["vertices"] = parsed_vertices
+            # Store raw vertex data
+            lod_data["vertices_raw"] = vertices_data
+
+            # Decode the whole vertex stream in one pass (structured array, one record per vertex)
+            lod_data["vertices"] = np.frombuffer(vertices_data, dtype=LOD_VERTEX_DTYPE)
+        result["bytes_parsed"] += vertex_bytes
+        if profile:
+            t = profile.lap("vertices", t)
 
         # Post-vertex structure: search for index_count
         # It's usually 12-40 bytes after vertices.
         # We look for the pattern: [val1, unk0, val2, unk1, val3, index_count]
         # index_count is usually 3-1000000.
         pv_search_start = result["bytes_parsed"]
-        index_count = 0
-        pv_header_size = 0
-
-        for offset in range(0, 64, 4):
-            probe_pos = pv_search_start + offset
-            if probe_pos + 24 <= len(data):
-                ic = struct.unpack("<I", data[probe_pos + 20 : probe_pos + 24])[0]
-                if 3 <= ic <= 1000000:
-                    # Verify by checking first index
-                    first_idx = struct.unpack(
-                        "<H", data[probe_pos + 24 : probe_pos + 26]
-                    )[0]
-                    if first_idx < vertex_count:
-                        index_count = ic
-                        pv_header_size = offset + 24
-                        break
+        index_count, pv_header_size = find_index_header(data, pv_search_start, vertex_count)
+        if profile:
+            profile.hit("index_header.probe" if index_count else "index_header.fallback_24")
 
         if index_count == 0:
             # Fallback to standard 24 bytes if search fails
@@ -672,28 +830,33 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
                 index_count = struct.unpack(
                     "<I", data[pv_search_start + 20 : pv_search_start + 24]
                 )[0]
+        if profile:
+            t = profile.lap("index_header", t)
 
         lod_data["index_count"] = index_count
         result["bytes_parsed"] = pv_search_start + pv_header_size
 
-        indices_raw = data[
-            result["bytes_parsed"] : result["bytes_parsed"] + index_count * 2
-        ]
-        if len(indices_raw) < index_count * 2:
-            # Truncated?
-            index_count = len(indices_raw) // 2
-            indices_raw = indices_raw[: index_count * 2]
+        # Truncated?
+        index_count = min(index_count, max(0, len(data) - result["bytes_parsed"]) // 2)
+        if not header_only:
+            indices_raw = data[
+                result["bytes_parsed"] : result["bytes_parsed"] + index_count * 2
+            ]
+            lod_data["indices"] = np.frombuffer(indices_raw, dtype="<u2")
 
         result["bytes_parsed"] += index_count * 2
-        indices = list(struct.unpack(f"<{index_count}H", indices_raw))
-
         lod_data["index_count"] = index_count
-        lod_data["indices"] = indices
+        if profile:
+            t = profile.lap("indices", t)
 
         lods.append(lod_data)
 
     result["data"]["lods"] = lods
 
+    if header_only:
+        result["coverage_pct"] = (result["bytes_parsed"] / result["bytes_total"]) * 100
+        return result
+
     # Step 6: Capture remaining bytes as unknown
     remaining_pos = relative_skip + stream2.tell()
     remaining = len(data) - remaining_pos
@@ -703,12 +866,13 @@ def parse_staticmesh(data: bytes, names: list, serial_offset: int) -> dict:
                 "offset_start": remaining_pos,
                 "offset_end": len(data),
                 "size": remaining,
-                "raw_hex": data[remaining_pos:].hex(),
                 "context": "post_lod_data",
             }
         )
         result["bytes_unknown"] = remaining
         result["bytes_parsed"] += remaining  # We read it, just don't understand it
+    if profile:
+        profile.lap("unknown_regions", t)
 
     result["coverage_pct"] = (result["bytes_parsed"] / result["bytes_total"]) * 100
 
@@ -767,10 +931,10 @@ if __name__ == "__main__":
                     print(
                         f"  LOD {i}: {lod['vertex_count']} vertices, {lod['index_count']} indices"
                     )
-                    if lod["indices"]:
+                    if len(lod["indices"]):
                         triangles = len(lod["indices"]) // 3
                         print(
-                            f"         {triangles} triangles: {lod['indices'][:12]}..."
+                            f"         {triangles} triangles: {lod['indices'][:12].tolist()}..."
                         )
 
             if result["unknown_regions"]:
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Error-bounded terrain simplification using a Right-Triangulated Irregular Network (RTIN).
+
+The heightfield is recursively split along triangle hypotenuses (the same
+hierarchy as Martini / ROAM). Each grid vertex is the hypotenuse midpoint of
+exactly one level, so per-vertex errors can be computed one level at a time
+with NumPy instead of per triangle.
+
+Unlike Martini, which only measures the height at each hypotenuse midpoint,
+a triangle's error here is the max deviation over EVERY grid sample it covers,
+so an unsplit triangle is guaranteed to be within tolerance. Child errors are
+still folded into parents, which keeps the triangulation crack-free.
+
+Extraction emits the fewest RTIN triangles whose interpolation error stays
+under the requested tolerance. Flat chunks (ocean, plains) collapse to a
+handful of triangles.
+
+Usage:
+    rtin = TerrainRTIN(heights_world)   # (2^k + 1) square grid, world units
+    vertices_idx, triangles = rtin.extract(tolerance=50.0)
+"""
+
+import numpy as np
+
+
+def pad_to_rtin_grid(heights):
+    """
+    Pad a 2^k square grid to 2^k + 1 by replicating the last row/column.
+
+    RTIN needs an odd grid size; the extra row/column sits where the next
+    chunk's first sample would be, so it fills the seam between chunks.
+    """
+    size = heights.shape[0]
+    if heights.shape[0] != heights.shape[1]:
+        raise ValueError("RTIN requires a square heightmap")
+    tile = size - 1
+    if tile > 0 and tile & (tile - 1) == 0:
+        return heights
+    if size & (size - 1) != 0:
+        raise ValueError(f"RTIN requires a 2^k or 2^k + 1 grid, got {size}")
+    return np.pad(heights, ((0, 1), (0, 1)), mode="edge")
+
+
+def _triangle_coords(ids, tile):
+    """Vertex a/b grid coordinates of the RTIN triangles with the given heap ids (>= 2)."""
+    ids = np.asarray(ids, dtype=np.int64)
+    odd = (ids & 1).astype(bool)
+    ax = np.where(odd, 0, tile)
+    ay = np.where(odd, 0, tile)
+    bx = np.where(odd, tile, 0)
+    by = np.where(odd, tile, 0)
+    cx = np.where(odd, tile, 0)
+    cy = np.where(odd, 0, tile)
+
+    # Same walk as Martini: after the root pick, consume id bits from the LSB up
+    shift = 1
+    while True:
+        active = (ids >> shift) > 1
+        if not np.any(active):
+            break
+        left = active & ((ids >> shift) & 1).astype(bool)
+        right = active & ~left
+        mx = (ax + bx) >> 1
+        my = (ay + by) >> 1
+        nax = np.where(left, cx, np.where(right, bx, ax))
+        nay = np.where(left, cy, np.where(right, by, ay))
+        nbx = np.where(left, ax, np.where(right, cx, bx))
+        nby = np.where(left, ay, np.where(right, cy, by))
+        ax, ay, bx, by = nax, nay, nbx, nby
+        cx = np.where(active, mx, cx)
+        cy = np.where(active, my, cy)
+        shift += 1
+    return ax, ay, bx, by
+
+
+def triangle_max_errors(heights, ax, ay, bx, by, cx, cy, batch_points=4_000_000):
+    """
+    Max |plane - sample| over all grid samples inside each triangle.
+
+    Vertex coordinates are (col, row) grid positions. Triangles are grouped by
+    bounding-box shape and each group is rasterized as one NumPy batch.
+    """
+    tri_x = np.column_stack([ax, bx, cx]).astype(np.float64)
+    tri_y = np.column_stack([ay, by, cy]).astype(np.float64)
+    tri_h = heights[tri_y.astype(np.int64), tri_x.astype(np.int64)]
+
+    x0 = tri_x.min(axis=1).astype(np.int64)
+    y0 = tri_y.min(axis=1).astype(np.int64)
+    w = tri_x.max(axis=1).astype(np.int64) - x0
+    h = tri_y.max(axis=1).astype(np.int64) - y0
+
+    errors = np.zeros(len(tri_x), dtype=np.float64)
+    for bw, bh in np.unique(np.column_stack([w, h]), axis=0):
+        sel = np.nonzero((w == bw) & (h == bh))[0]
+        oy, ox = np.mgrid[0:bh + 1, 0:bw + 1]
+        ox = ox.reshape(-1)
+        oy = oy.reshape(-1)
+        step = max(1, batch_points // len(ox))
+        for start in range(0, len(sel), step):
+            s = sel[start:start + step]
+            px = x0[s, None] + ox[None, :]
+            py = y0[s, None] + oy[None, :]
+            x1, y1, h1 = tri_x[s, 0:1], tri_y[s, 0:1], tri_h[s, 0:1]
+            x2, y2, h2 = tri_x[s, 1:2], tri_y[s, 1:2], tri_h[s, 1:2]
+            x3, y3, h3 = tri_x[s, 2:3], tri_y[s, 2:3], tri_h[s, 2:3]
+            det = (y2 - y3) * (x1 - x3) + (x3 - x2) * (y1 - y3)
+            l1 = ((y2 - y3) * (px - x3) + (x3 - x2) * (py - y3)) / det
+            l2 = ((y3 - y1) * (px - x3) + (x1 - x3) * (py - y3)) / det
+            l3 = 1.0 - l1 - l2
+            inside = (l1 >= -1e-9) & (l2 >= -1e-9) & (l3 >= -1e-9)
+            err = np.abs(l1 * h1 + l2 * h2 + l3 * h3 - heights[py, px])
+            errors[s] = np.where(inside, err, 0.0).max(axis=1)
+    return errors
+
+
+class TerrainRTIN:
+    """RTIN error hierarchy for one (2^k + 1)-sized heightfield."""
+
+    def __init__(self, heights):
+        heights = np.asarray(heights, dtype=np.float64)
+        self.size = heights.shape[0]
+        self.tile = self.size - 1
+        if heights.shape != (self.size, self.size) or self.tile & (self.tile - 1) != 0:
+            raise ValueError(f"RTIN requires a (2^k + 1) square grid, got {heights.shape}")
+        self.heights = heights
+        self.errors = self._compute_errors()
+
+    def _compute_errors(self):
+        """Per-vertex RTIN error, finest level first, children folded into parents."""
+        size, tile = self.size, self.tile
+        errors = np.zeros(size * size, dtype=np.float64)
+        num_triangles = tile * tile * 2 - 2
+        num_parents = num_triangles - tile * tile
+
+        # Heap ids for triangle index i are i + 2; level = bit_length(id) - 2
+        top_level = int(num_triangles + 1).bit_length() - 2
+        for level in range(top_level, -1, -1):
+            first = max(1 << (level + 1), 2)
+            last = min((1 << (level + 2)) - 1, num_triangles + 1)
+            if first > last:
+                continue
+            ids = np.arange(first, last + 1, dtype=np.int64)
+            ax, ay, bx, by = _triangle_coords(ids, tile)
+            mx = (ax + bx) >> 1
+            my = (ay + by) >> 1
+            cx = mx + my - ay
+            cy = my + ax - mx
+            middle = my * size + mx
+            own_error = triangle_max_errors(self.heights, ax, ay, bx, by, cx, cy)
+            np.maximum.at(errors, middle, own_error)
+
+            is_parent = (ids - 2) < num_parents
+            if np.any(is_parent):
+                left = ((ay + cy) >> 1) * size + ((ax + cx) >> 1)
+                right = ((by + cy) >> 1) * size + ((bx + cx) >> 1)
+                child_error = np.maximum(errors[left], errors[right])
+                np.maximum.at(errors, middle[is_parent], child_error[is_parent])
+        return errors
+
+    def extract(self, tolerance):
+        """
+        Triangulate with the fewest RTIN triangles keeping error <= tolerance.
+
+        Returns (vertex_grid_idx, triangles): flat grid indices (row * size + col)
+        of the used vertices, and an (n, 3) int array indexing into them.
+        """
+        size, tile, errors = self.size, self.tile, self.errors
+        # Two root triangles (a, b, c) with c at the right angle
+        tri = np.array([
+            [0, 0, tile, tile, tile, 0],
+            [tile, tile, 0, 0, 0, tile],
+        ], dtype=np.int64)
+        done = []
+        while len(tri):
+            ax, ay, bx, by, cx, cy = tri.T
+            mx = (ax + bx) >> 1
+            my = (ay + by) >> 1
+            splittable = (np.abs(ax - cx) + np.abs(ay - cy)) > 1
+            split = splittable & (errors[my * size + mx] > tolerance)
+            done.append(tri[~split])
+            s = tri[split]
+            if not len(s):
+                break
+            ax, ay, bx, by, cx, cy = s.T
+            mx = (ax + bx) >> 1
+            my = (ay + by) >> 1
+            tri = np.concatenate([
+                np.column_stack([cx, cy, ax, ay, mx, my]),
+                np.column_stack([bx, by, cx, cy, mx, my]),
+            ])
+        tris = np.concatenate(done)
+        grid_idx = np.column_stack([
+            tris[:, 1] * size + tris[:, 0],
+            tris[:, 3] * size + tris[:, 2],
+            tris[:, 5] * size + tris[:, 4],
+        ])
+        vertex_idx, inverse = np.unique(grid_idx, return_inverse=True)
+        return vertex_idx, inverse.reshape(-1, 3)
@@ -12,10 +12,21 @@ This script performs all necessary initialization for a fresh clone:
 7. Property extraction
 8. (Optional) Full terrain/mesh extraction
 
+Stages 3-8 declare the tables they read and write and run as a dependency
+graph (scripts/lib/stage_scheduler.py): independent stages (e.g. 5, 6 and 8a,
+or 8b once the file index exists) run concurrently within --cpus, and the run
+ends with per-stage timings and the critical path.
+
+They also run in SQLite bulk-load mode (scripts/lib/bulk_load.py): WAL,
+synchronous=OFF, a large page cache and the written tables' secondary indexes
+dropped, then rebuilt with ANALYZE and durable settings restored at the end.
+
 Usage:
     python3 setup.py          # Standard setup
     python3 setup.py --reset  # Delete database and start fresh
     python3 setup.py --full   # Full setup (includes terrain + mesh extraction)
+    python3 setup.py --no-bulk-load  # Keep default SQLite settings and indexes
+    python3 setup.py --full --cpus 4 # Run independent stages concurrently on 4 CPUs
 """
 
 import os
@@ -28,8 +39,12 @@ from datetime import datetime
 
 # Add project root to path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "scripts", "lib"))
 sys.path.insert(0, PROJECT_ROOT)
 
+from bulk_load import apply_bulk_pragmas, begin_bulk_load, end_bulk_load
+import stage_scheduler
+
 # =============================================================================
 # CONFIGURATION VALIDATION
 # =============================================================================
@@ -160,6 +175,13 @@ def init_database(config):
             terrain_scale REAL DEFAULT 390.625,
             gltf_exported INTEGER DEFAULT 0,
             export_path TEXT,
+            lod_paths TEXT,  -- JSON {lod_size: gltf_path} for the decimated LOD pyramid
+            source_hash TEXT,  -- SHA-256 of the VGR the outputs were built from
+            source_size INTEGER,
+            source_mtime REAL,
+            decoder_params TEXT,  -- JSON decoder constants + output options (incremental rebuilds)
+            output_hash TEXT,  -- SHA-256 over the written glTF/LOD/DDS files
+            output_paths TEXT,  -- JSON [[path, size, mtime], ...] of every file written
             created_at TEXT DEFAULT CURRENT_TIMESTAMP
         );
         
@@ -205,6 +227,7 @@ def init_database(config):
             array_index INTEGER DEFAULT 0,
             struct_name TEXT,
             value_text TEXT,
+            value_hex TEXT,
             FOREIGN KEY (export_id) REFERENCES exports(id)
         );
         
@@ -258,7 +281,53 @@ def init_database(config):
             UNIQUE(parsed_export_id, field_path, array_index)
         );
 
-        -- Track unknown byte regions for analysis
+        -- Content-addressed mesh store: (package, mesh, LOD) -> output/meshes/by_hash/<hash>.bin
+        CREATE TABLE IF NOT EXISTS mesh_aliases (
+            id INTEGER PRIMARY KEY,
+            package TEXT NOT NULL,
+            mesh_name TEXT NOT NULL,
+            lod_index INTEGER NOT NULL DEFAULT 0,
+            geometry_hash TEXT NOT NULL,
+            gltf_path TEXT,
+            vertex_count INTEGER,
+            index_count INTEGER,
+            byte_length INTEGER,
+            UNIQUE(package, mesh_name, lod_index)
+        );
+
+        -- Header-only scan (staticmesh_pipeline.py --bounds-only): bounds + LOD counts per StaticMesh
+        CREATE TABLE IF NOT EXISTS mesh_bounds (
+            id INTEGER PRIMARY KEY,
+            package TEXT NOT NULL,
+            mesh_name TEXT NOT NULL,
+            export_index INTEGER NOT NULL,
+            parse_status TEXT,
+            bounds_valid INTEGER DEFAULT 0,
+            min_x REAL, min_y REAL, min_z REAL,
+            max_x REAL, max_y REAL, max_z REAL,
+            sphere_x REAL, sphere_y REAL, sphere_z REAL, sphere_radius REAL,
+            lod_count INTEGER DEFAULT 0,
+            vertex_count INTEGER DEFAULT 0,
+            index_count INTEGER DEFAULT 0,
+            lod_counts TEXT,
+            scanned_at TEXT,
+            UNIQUE(package, export_index)
+        );
+
+        -- staticmesh_pipeline.py --profile: per-step parse timings and heuristic path
+        -- counts per package (package = '*' for the session total)
+        CREATE TABLE IF NOT EXISTS parse_profile (
+            id INTEGER PRIMARY KEY,
+            session_id INTEGER NOT NULL,
+            package TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            calls INTEGER,
+            total_ms REAL,
+            UNIQUE(session_id, package, metric)
+        );
+
+        -- Track unknown byte regions for analysis: location in the source package
+        -- (file_id, abs_offset, size), bytes only as an optional zlib BLOB (raw_hex is legacy)
         CREATE TABLE IF NOT EXISTS unknown_regions (
             id INTEGER PRIMARY KEY,
             parsed_export_id INTEGER NOT NULL,
@@ -266,6 +335,10 @@ def init_database(config):
             offset_end INTEGER,
             raw_hex TEXT,
             context TEXT,
+            file_id INTEGER,
+            abs_offset INTEGER,
+            size INTEGER,
+            data_zlib BLOB,
             FOREIGN KEY (parsed_export_id) REFERENCES parsed_exports(id)
         );
         
@@ -317,9 +390,20 @@ def init_database(config):
         CREATE INDEX IF NOT EXISTS idx_properties_name ON properties(prop_name);
         CREATE INDEX IF NOT EXISTS idx_shaders_name ON shaders(shader_name);
         CREATE INDEX IF NOT EXISTS idx_mesh_materials_mesh ON mesh_materials(mesh_name);
+        CREATE INDEX IF NOT EXISTS idx_mesh_aliases_hash ON mesh_aliases(geometry_hash);
+        CREATE INDEX IF NOT EXISTS idx_mesh_bounds_name ON mesh_bounds(mesh_name);
         CREATE INDEX IF NOT EXISTS idx_prefabs_name ON prefabs(prefab_name);
     """)
     
+    # World-space R*Tree over placed exports (scripts/lib/spatial_index.py, filled by crawl_chunks.py)
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS exports_rtree
+            USING rtree(id, min_x, max_x, min_y, max_y, min_z, max_z, +world_x REAL, +world_y REAL, +world_z REAL)
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"   ⚠ exports_rtree not created (SQLite without R*Tree): {e}")
+    
     conn.commit()
     conn.close()
     
@@ -373,6 +457,12 @@ EXTENSION_CATEGORIES = {
 }
 
 
+def print_stage_banner(title):
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+
+
 def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, length=40, fill='█', print_end="\r"):
     """
     Call in a loop to create terminal progress bar
@@ -394,28 +484,30 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
     if iteration == total: 
         print()
 
-def index_files(config):
+def index_files(config, quiet=False):
     """Scan all files in the Assets directory and index them."""
-    print("\n" + "=" * 60)
-    print("STAGE 3: Indexing Asset Files")
-    print("=" * 60)
+    if not quiet:
+        print_stage_banner("STAGE 3: Indexing Asset Files")
     
     assets_path = config.ASSETS_PATH
     conn = sqlite3.connect(config.DB_PATH)
+    apply_bulk_pragmas(conn)
     cursor = conn.cursor()
     
     # Clear existing file index
     cursor.execute("DELETE FROM files")
     
     # First, get total file count for progress bar
-    print("   Scanning Assets directory...")
+    if not quiet:
+        print("   Scanning Assets directory...")
     all_files = []
     for root, dirs, files in os.walk(assets_path):
         for file in files:
             all_files.append(os.path.join(root, file))
     
     total = len(all_files)
-    print(f"   Found {total} files. Indexing...")
+    if not quiet:
+        print(f"   Found {total} files. Indexing...")
     
     count = 0
     start_time = time.time()
@@ -448,7 +540,8 @@ def index_files(config):
         
         count += 1
         if count % 100 == 0 or count == total:
-            print_progress_bar(count, total, prefix='   Progress:', suffix='Complete', length=40)
+            if not quiet:
+                print_progress_bar(count, total, prefix='   Progress:', suffix='Complete', length=40)
             if count % 1000 == 0:
                 conn.commit()
     
@@ -458,25 +551,36 @@ def index_files(config):
     # Print category summary
     cursor.execute("SELECT category, COUNT(*) FROM files GROUP BY category ORDER BY COUNT(*) DESC")
     categories = cursor.fetchall()
+    conn.close()
+    if quiet:
+        return
     
     print(f"\n   ✓ Indexed in {elapsed:.1f}s")
     print("\n   Category breakdown:")
     for cat, cnt in categories:
         print(f"     - {cat}: {cnt}")
-    
-    conn.close()
 
 
 # =============================================================================
 # CHUNK DATA EXPORT
 # =============================================================================
 
-def export_chunk_data(config):
-    """Export chunk data using the extract_chunk_data script."""
-    print("\n" + "=" * 60)
-    print("STAGE 4: Exporting Chunk Data")
-    print("=" * 60)
-    run_extractor("Chunk Data", "extract_chunk_data.py", silent=False, args=["--silent"])
+def export_chunk_data(config, legacy=False, workers=None, quiet=False):
+    """
+    Export chunk data. By default crawl_chunks.py reads each VGR once and fills
+    chunks, names, imports, exports and properties (stages 4 and 7 together);
+    legacy runs extract_chunk_data.py and leaves properties to stage 7.
+    """
+    if not quiet:
+        print_stage_banner("STAGE 4: Exporting Chunk Data")
+    chunk_args = ["--silent"]
+    if workers is not None:
+        chunk_args.extend(["--workers", str(workers)])
+    if legacy:
+        return run_extractor("Chunk Data", "extract_chunk_data.py", silent=quiet, args=chunk_args)
+    if not quiet:
+        print("   One pass per chunk: chunks, names, imports, exports, properties")
+    return run_extractor("Chunk Crawler", "crawl_chunks.py", silent=quiet, args=chunk_args)
 
 
 # =============================================================================
@@ -538,6 +642,134 @@ def run_full_extraction(config):
         print_progress_bar(1, 1, prefix='   StaticMesh:', suffix='Complete  ', length=40)
 
 
+# =============================================================================
+# STAGE GRAPH
+# =============================================================================
+
+CHUNK_TABLES = ('chunks', 'names', 'imports', 'exports', 'properties', 'exports_rtree')
+
+
+def worker_cpus(workers):
+    """CPUs an extractor started with --workers uses (None = its default of 1)."""
+    if workers is None:
+        return 1
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def setup_stages(config, args, selected, quiet=False):
+    """
+    Stages 3-8 selected for this run, with the tables each reads and writes.
+    quiet captures extractor output (stages running concurrently would
+    interleave their progress bars); failures are still printed.
+    """
+    stages = []
+    
+    def banner(title):
+        if not quiet:
+            print_stage_banner(title)
+    
+    if selected['files']:
+        stages.append(stage_scheduler.Stage(
+            'files', "Stage 3: Index files", lambda: index_files(config, quiet),
+            outputs=('files',)))
+    
+    if selected['chunks']:
+        stages.append(stage_scheduler.Stage(
+            'chunks', "Stage 4: Chunk data",
+            lambda: export_chunk_data(config, legacy=args.legacy_chunks, workers=args.workers, quiet=quiet),
+            outputs=CHUNK_TABLES if not args.legacy_chunks else ('chunks', 'exports'),
+            cpus=worker_cpus(args.workers)))
+    
+    def mesh_index():
+        banner("STAGE 5: Indexing Mesh Objects")
+        return run_extractor("Mesh Index", "index_meshes.py", silent=quiet, args=["--silent"])
+    
+    if selected['mesh_index']:
+        stages.append(stage_scheduler.Stage(
+            'mesh_index', "Stage 5: Mesh index", mesh_index, outputs=('mesh_index',)))
+    
+    def textures():
+        banner("STAGE 6: Building Texture Database")
+        return run_extractor("Texture DB", "build_texture_db.py", silent=quiet, args=["--silent"])
+    
+    if selected['textures']:
+        stages.append(stage_scheduler.Stage(
+            'textures', "Stage 6: Texture database", textures, outputs=('shaders', 'mesh_materials')))
+    
+    # Stage 7: the chunk crawler (stage 4) already fills properties
+    if selected['properties'] and selected['chunks'] and not args.legacy_chunks:
+        print("\n   Stage 7 (properties) is covered by the chunk crawler in stage 4")
+    elif selected['properties']:
+        def properties():
+            banner("STAGE 7: Extracting Object Properties")
+            if not quiet:
+                print("   This parses class member values (Location, Mesh, etc.)")
+            if args.legacy_chunks:
+                return run_extractor("Property Extraction", "extract_properties.py", silent=quiet, args=["--silent"])
+            return run_extractor("Chunk Crawler", "crawl_chunks.py", silent=quiet, args=["--silent"])
+        
+        stages.append(stage_scheduler.Stage(
+            'properties', "Stage 7: Object properties", properties,
+            inputs=('exports',), outputs=('properties',) if args.legacy_chunks else CHUNK_TABLES))
+    
+    def terrain():
+        banner("STAGE 8a: Terrain Extraction")
+        return run_extractor("Terrain Extraction", "extract_all_terrain.py", silent=quiet, args=["--all", "--silent"])
+    
+    if selected['terrain']:
+        # Links terrain rows to chunks.id when the chunk is already indexed
+        stages.append(stage_scheduler.Stage(
+            'terrain', "Stage 8a: Terrain", terrain, inputs=('chunks',), outputs=('terrain_chunks',)))
+    
+    def meshes():
+        banner("STAGE 8b: StaticMesh Extraction")
+        mesh_args = ["--silent"]
+        if args.limit > 0:
+            mesh_args.extend(["--limit", str(args.limit)])
+        if args.workers is not None:
+            mesh_args.extend(["--workers", str(args.workers)])
+        return run_extractor("StaticMesh Pipeline", "staticmesh_pipeline.py", silent=quiet, args=mesh_args)
+    
+    if selected['meshes']:
+        # Looks up (or adds) its packages' files rows
+        stages.append(stage_scheduler.Stage(
+            'meshes', "Stage 8b: StaticMeshes", meshes, inputs=('files',),
+            outputs=('parse_sessions', 'parsed_exports', 'parsed_fields', 'unknown_regions',
+                     'mesh_aliases', 'parse_profile'),
+            cpus=worker_cpus(args.workers)))
+    
+    return stages
+
+
+def run_stage_graph(stages, cpu_budget):
+    """Run stages concurrently within cpu_budget and report the critical path."""
+    print("\n" + "=" * 60)
+    print(f"Running {len(stages)} stage{'s' if len(stages) != 1 else ''} (CPU budget {cpu_budget})")
+    print("=" * 60)
+    deps = stage_scheduler.stage_dependencies(stages)
+    labels = {stage.name: stage.label for stage in stages}
+    for stage in stages:
+        after = ", ".join(labels[d] for d in deps[stage.name]) or "nothing"
+        print(f"   {stage.label}  (after: {after})")
+    print()
+    
+    start_time = time.perf_counter()
+    results = stage_scheduler.run_stages(stages, cpu_budget)
+    wall = time.perf_counter() - start_time
+    
+    path, path_seconds = stage_scheduler.critical_path(stages, results)
+    stage_seconds = sum(result.seconds for result in results.values())
+    print("\n   Stage timings:")
+    for stage in stages:
+        result = results[stage.name]
+        timing = f"{result.seconds:.1f}s" if result.status != stage_scheduler.SKIPPED else "-"
+        print(f"     {stage.label:<28} {result.status:<8} {timing}")
+    print(f"\n   Wall time: {wall:.1f}s (stages total {stage_seconds:.1f}s)")
+    if path:
+        print(f"   Critical path ({path_seconds:.1f}s): {' -> '.join(labels[name] for name in path)}")
+    return results
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -586,6 +818,13 @@ def main():
     parser.add_argument('--terrain', action='store_true', help='Stage 8a: Extract Terrain')
     parser.add_argument('--meshes', action='store_true', help='Stage 8b: Extract StaticMeshes')
     parser.add_argument('--limit', type=int, default=0, help='Limit number of items to process in Stage 8')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for Stages 4 and 8b (0 = one per CPU)')
+    parser.add_argument('--legacy-chunks', action='store_true',
+                        help='Stages 4/7: separate extract_chunk_data.py and extract_properties.py passes')
+    parser.add_argument('--no-bulk-load', action='store_true',
+                        help='Stages 3-8: keep default SQLite durability settings and indexes while writing (runs stages one at a time)')
+    parser.add_argument('--cpus', type=int, default=0,
+                        help='CPU budget for running independent stages concurrently (0 = one per CPU, 1 = one stage at a time)')
     
     args = parser.parse_args()
     
@@ -606,6 +845,9 @@ def main():
         if os.path.exists(config.DB_PATH):
             os.remove(config.DB_PATH)
             print(f"   ✓ Deleted: {config.DB_PATH}")
+            for suffix in ("-wal", "-shm", "-journal"):
+                if os.path.exists(config.DB_PATH + suffix):
+                    os.remove(config.DB_PATH + suffix)
         else:
             print("   (No existing database found)")
     
@@ -616,56 +858,35 @@ def main():
     if args.db or should_run_defaults:
         init_database(config)
     
-    # Stage 3: Index files
-    if args.files or should_run_defaults:
-        index_files(config)
-    
-    # Stage 4: Export chunk data
-    if args.chunks or should_run_defaults:
-        export_chunk_data(config)
-    
-    # Stage 5: Index meshes
-    if args.mesh_index or should_run_defaults:
-        print("\n" + "=" * 60)
-        print("STAGE 5: Indexing Mesh Objects")
-        print("=" * 60)
-        run_extractor("Mesh Index", "index_meshes.py", silent=False, args=["--silent"])
-    
-    # Stage 6: Build texture database
-    if args.textures or should_run_defaults:
-        print("\n" + "=" * 60)
-        print("STAGE 6: Building Texture Database")
-        print("=" * 60)
-        run_extractor("Texture DB", "build_texture_db.py", silent=False, args=["--silent"])
-    
-    # Stage 7: Property Extraction
-    if args.properties or should_run_defaults:
-        print("\n" + "=" * 60)
-        print("STAGE 7: Extracting Object Properties")
-        print("=" * 60)
-        print("   This parses class member values (Location, Mesh, etc.)")
-        run_extractor("Property Extraction", "extract_properties.py", silent=False, args=["--silent"])
-    
-    # Stage 8: Full Extraction (Terrain + Meshes)
-    # Only run if --full is set OR specific flags are set
-    if args.full or args.terrain:
-        print("\n" + "=" * 60)
-        print("STAGE 8a: Terrain Extraction")
-        print("=" * 60)
-        print_progress_bar(0, 1, prefix='   Terrain:', suffix='Running...', length=40)
-        if run_extractor("Terrain Extraction", "extract_all_terrain.py", silent=False, args=["--all", "--silent"]):
-            print_progress_bar(1, 1, prefix='   Terrain:', suffix='Complete  ', length=40)
-
-    if args.full or args.meshes:
-        print("\n" + "=" * 60)
-        print("STAGE 8b: StaticMesh Extraction")
-        print("=" * 60)
-        print_progress_bar(0, 1, prefix='   StaticMesh:', suffix='Running...', length=40)
-        mesh_args = ["--silent"]
-        if args.limit > 0:
-            mesh_args.extend(["--limit", str(args.limit)])
-        if run_extractor("StaticMesh Pipeline", "staticmesh_pipeline.py", silent=False, args=mesh_args):
-            print_progress_bar(1, 1, prefix='   StaticMesh:', suffix='Complete  ', length=40)
+    # Stages 3-8 run as a dependency graph; selectors pick which stages are in it
+    selected = {
+        'files': args.files or should_run_defaults,
+        'chunks': args.chunks or should_run_defaults,
+        'mesh_index': args.mesh_index or should_run_defaults,
+        'textures': args.textures or should_run_defaults,
+        'properties': args.properties or should_run_defaults,
+        'terrain': args.full or args.terrain,
+        'meshes': args.full or args.meshes,
+    }
+    bulk_load = not args.no_bulk_load and os.path.exists(config.DB_PATH)
+    # Concurrent writers need WAL and the bulk-load busy timeout
+    cpu_budget = (args.cpus or os.cpu_count() or 1) if bulk_load else 1
+    stages = setup_stages(config, args, selected, quiet=cpu_budget > 1)
+    bulk_tables = sorted({table for stage in stages for table in stage.outputs})
+    bulk_load = bulk_load and bool(bulk_tables)
+    
+    if bulk_load:
+        dropped_indexes = begin_bulk_load(config.DB_PATH, bulk_tables)
+        print(f"\n   Bulk-load mode: WAL, synchronous=OFF, {len(dropped_indexes)} secondary indexes deferred")
+    try:
+        if stages:
+            run_stage_graph(stages, cpu_budget)
+    finally:
+        if bulk_load:
+            print("\n   Rebuilding indexes and analyzing...")
+            start_time = time.time()
+            end_bulk_load(config.DB_PATH, dropped_indexes, bulk_tables)
+            print(f"   ✓ {len(dropped_indexes)} indexes rebuilt, durable settings restored ({time.time() - start_time:.1f}s)")
     
     # Summary
     print_summary(config)
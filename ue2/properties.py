@@ -1144,7 +1144,11 @@ def print_progress_bar(iteration, total, prefix='', suffix='', decimals=1, lengt
         print()
 
 
-def main():
+def main(on_connect=None):
+    """
+    Command-line entry point. on_connect(conn) is called on each database
+    connection (extract_properties.py uses it for setup.py's bulk-load pragmas).
+    """
     import argparse
 
     parser = argparse.ArgumentParser(description="Universal UE2 Property Parser")
@@ -1157,6 +1161,8 @@ def main():
 
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    if on_connect:
+        on_connect(conn)
 
     if args.stats:
         show_stats(conn)
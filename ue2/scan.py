@@ -0,0 +1,52 @@
+"""
+Vectorized FVector Scans.
+
+Placement extractors look for a world position in raw export data by testing
+every byte offset in a window for three floats that look like coordinates.
+Instead of three struct.unpack calls per offset, the window is viewed as
+float32 at every byte offset (all four alignments at once, no copy), each float
+is tested once, and an offset passes when its floats at +0, +4 and +8 all do.
+The first passing offset is the same one a byte-by-byte loop would return.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Placed-object coordinate range used by the chunk extractors (exclusive bounds)
+POSITION_MIN_ABS = 1000
+POSITION_MAX_ABS = 500000
+
+
+def floats_at(data: bytes, start: int, count: int) -> np.ndarray:
+    """Read-only float32 view: element k is the little-endian float at byte offset start + k."""
+    return np.ndarray((count,), dtype="<f4", buffer=data, offset=start, strides=(1,))
+
+
+def find_vec3(data: bytes, start: int, stop: int,
+              min_abs: float = POSITION_MIN_ABS, max_abs: float = POSITION_MAX_ABS,
+              marker: Optional[int] = None) -> Optional[Tuple[float, float, float]]:
+    """
+    First FVector at an offset in [start, stop) whose components all satisfy
+    min_abs < |v| < max_abs (NaN never passes). With marker, only offsets whose
+    preceding byte equals marker are candidates. Returns (x, y, z) or None.
+    """
+    start = max(start, 1 if marker is not None else 0)  # Offset 0 has no preceding byte
+    stop = min(stop, len(data) - 11)
+    n = stop - start
+    if n <= 0:
+        return None
+    if marker is not None and data.find(bytes([marker]), start - 1, stop - 1) < 0:
+        return None
+
+    magnitude = np.abs(floats_at(data, start, n + 8))
+    in_range = (magnitude > min_abs) & (magnitude < max_abs)
+    ok = in_range[:-8] & in_range[4:-4] & in_range[8:]
+    if marker is not None:
+        ok &= np.frombuffer(data, dtype=np.uint8, count=n, offset=start - 1) == marker
+
+    hits = np.flatnonzero(ok)
+    if not len(hits):
+        return None
+    return struct.unpack_from("<3f", data, start + int(hits[0]))
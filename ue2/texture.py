@@ -7,10 +7,75 @@ replacing heuristic foot-scanning with sequential binary parsing.
 
 import struct
 from typing import Dict, List, Optional
+import numpy as np
 from PIL import Image
 from .reader import BinaryReader
 from .properties import find_property_start, parse_properties, read_compact_index
 
+# DDS container constants (DDS_HEADER / DDS_PIXELFORMAT)
+DDSD_CAPS, DDSD_HEIGHT, DDSD_WIDTH, DDSD_PITCH = 0x1, 0x2, 0x4, 0x8
+DDSD_PIXELFORMAT, DDSD_MIPMAPCOUNT, DDSD_LINEARSIZE = 0x1000, 0x20000, 0x80000
+DDPF_ALPHAPIXELS, DDPF_FOURCC, DDPF_RGB = 0x1, 0x4, 0x40
+DDSCAPS_COMPLEX, DDSCAPS_TEXTURE, DDSCAPS_MIPMAP = 0x8, 0x1000, 0x400000
+
+# UE2 format id -> (DDS FourCC or None for BGRA8, bytes per 4x4 block / per pixel)
+DDS_FORMATS = {
+    3: (b"DXT1", 8),
+    6: (b"DXT5", 16),
+    7: (b"DXT5", 16),
+    63: (b"DXT5", 16),
+    5: (None, 4),
+}
+
+
+def mip_data_size(format_id: int, width: int, height: int) -> int:
+    """Expected byte size of one mip level in a DDS-compatible format."""
+    fourcc, unit = DDS_FORMATS[format_id]
+    if fourcc is None:
+        return width * height * unit
+    return max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * unit
+
+
+def _transpose_index_bits(codes: np.ndarray, bits: int) -> np.ndarray:
+    """Transpose the 4x4 per-pixel index grid packed LSB-first in each block."""
+    mask = (1 << bits) - 1
+    shifts = (np.arange(16, dtype=np.uint64) * bits)
+    unpacked = (codes[:, None] >> shifts) & mask
+    unpacked = unpacked.reshape(-1, 4, 4).transpose(0, 2, 1).reshape(-1, 16)
+    return np.bitwise_or.reduce(unpacked << shifts, axis=1)
+
+
+def transpose_mip(data: bytes, format_id: int, width: int, height: int) -> bytes:
+    """
+    Transpose one mip level without decoding it (same result as Image.TRANSPOSE).
+
+    DXT data is transposed block-by-block: the block grid is transposed and the
+    2-bit color / 3-bit alpha indices inside each block are re-packed.
+    """
+    fourcc, unit = DDS_FORMATS[format_id]
+    if fourcc is None:
+        pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, width, unit)
+        return pixels.transpose(1, 0, 2).tobytes()
+
+    blocks_x, blocks_y = max(1, (width + 3) // 4), max(1, (height + 3) // 4)
+    blocks = np.frombuffer(data, dtype=np.uint8).reshape(blocks_y, blocks_x, unit)
+    blocks = blocks.transpose(1, 0, 2).reshape(-1, unit).copy()
+
+    color = blocks[:, unit - 8:]
+    color_codes = color[:, 4:8].copy().view("<u4").reshape(-1).astype(np.uint64)
+    color[:, 4:8] = _transpose_index_bits(color_codes, 2).astype("<u4").view(np.uint8).reshape(-1, 4)
+
+    if unit == 16:
+        alpha_codes = np.zeros(len(blocks), dtype=np.uint64)
+        for i in range(6):
+            alpha_codes |= blocks[:, 2 + i].astype(np.uint64) << np.uint64(8 * i)
+        alpha_codes = _transpose_index_bits(alpha_codes, 3)
+        for i in range(6):
+            blocks[:, 2 + i] = ((alpha_codes >> np.uint64(8 * i)) & np.uint64(0xFF)).astype(np.uint8)
+
+    blocks[:, unit - 8:] = color
+    return blocks.tobytes()
+
 class Mipmap:
     """Represents a single mipmap level in a Texture export."""
     def __init__(self, width: int, height: int, data: bytes, format_id: int):
@@ -209,6 +274,68 @@ class Texture:
             
         return pos
         
+    def mip_chain(self) -> List[Mipmap]:
+        """Leading mips that form a valid DDS chain (each level halves, sizes match the format)."""
+        if not self.mips or self.mips[0].format_id not in DDS_FORMATS:
+            return []
+        chain = []
+        for mip in self.mips:
+            if chain:
+                prev = chain[-1]
+                if (mip.width, mip.height) != (max(1, prev.width // 2), max(1, prev.height // 2)):
+                    break
+            if len(mip.data) != mip_data_size(mip.format_id, mip.width, mip.height):
+                break
+            chain.append(mip)
+        return chain
+
+    def to_dds(self, transpose: bool = False) -> Optional[bytes]:
+        """
+        Write the mip chain into a DDS container without decoding it.
+
+        DXT1/DXT5 blocks are copied as-is (FourCC), BGRA8 becomes an A8R8G8B8
+        surface. With transpose=True every level is transposed in the compressed
+        domain, matching Image.TRANSPOSE on the decoded image.
+        Returns None for formats DDS can't carry as-is (e.g. G16).
+        """
+        chain = self.mip_chain()
+        if not chain:
+            return None
+        format_id = chain[0].format_id
+        fourcc, unit = DDS_FORMATS[format_id]
+
+        width, height = chain[0].width, chain[0].height
+        payload = []
+        for mip in chain:
+            data = mip.data
+            if transpose:
+                data = transpose_mip(data, format_id, mip.width, mip.height)
+            payload.append(data)
+        if transpose:
+            width, height = height, width
+
+        flags = DDSD_CAPS | DDSD_HEIGHT | DDSD_WIDTH | DDSD_PIXELFORMAT
+        caps = DDSCAPS_TEXTURE
+        if len(chain) > 1:
+            flags |= DDSD_MIPMAPCOUNT
+            caps |= DDSCAPS_COMPLEX | DDSCAPS_MIPMAP
+        if fourcc is not None:
+            flags |= DDSD_LINEARSIZE
+            pitch = len(payload[0])
+            pixel_format = struct.pack("<II4sIIIII", 32, DDPF_FOURCC, fourcc, 0, 0, 0, 0, 0)
+        else:
+            flags |= DDSD_PITCH
+            pitch = width * unit
+            pixel_format = struct.pack(
+                "<II4sIIIII", 32, DDPF_RGB | DDPF_ALPHAPIXELS, b"\0\0\0\0", 32,
+                0x00FF0000, 0x0000FF00, 0x000000FF, 0xFF000000
+            )
+
+        header = struct.pack("<4sIIIIIII", b"DDS ", 124, flags, height, width, pitch, 0, len(chain))
+        header += b"\0" * 44 + pixel_format
+        header += struct.pack("<IIIII", caps, 0, 0, 0, 0)
+        return header + b"".join(payload)
+
     def get_image(self, mip_index: int = 0) -> Optional[Image.Image]:
         """Decode a mipmap to a PIL Image."""
         if mip_index >= len(self.mips):
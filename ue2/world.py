@@ -0,0 +1,226 @@
+"""
+World Coordinates & Global Heightfield.
+
+Vanguard's world is a grid of 200000-unit chunks named `chunk_<x>_<y>.vgr`,
+where an `n` prefix marks a negative coordinate (`chunk_n25_26` -> (-25, 26)).
+Object positions inside a chunk are relative to the chunk center.
+
+World coordinates used here:
+    world_x = chunk_x * CHUNK_SIZE + local_x
+    world_y = chunk_y * CHUNK_SIZE + local_y
+    height  = world Z (raw G16 height * HEIGHT_SCALE, same units as the terrain glTF)
+
+Each chunk's 512x512 heightmap covers local [-100000, 100000) at TERRAIN_SCALE
+units per sample, so all chunks share ONE global sample grid:
+    global_col = (world_x + CHUNK_SIZE / 2) / TERRAIN_SCALE
+    global_row = (world_y + CHUNK_SIZE / 2) / TERRAIN_SCALE
+
+`WorldHeightfield` memory-maps a stitched tile file (one float32 512x512 tile
+per chunk) plus a JSON chunk-origin index, and answers batched bilinear height
+queries without loading every chunk.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+CHUNK_SIZE = 200000
+GRID_SIZE = 512
+TERRAIN_SCALE = CHUNK_SIZE / GRID_SIZE  # 390.625
+
+_CHUNK_NAME_RE = re.compile(r"chunk_(n?)(\d+)_(n?)(\d+)")
+
+
+def parse_chunk_coords(name: str) -> Tuple[Optional[int], Optional[int]]:
+    """Signed chunk coordinates from a name like 'chunk_n25_26(.vgr)' -> (-25, 26)."""
+    match = _CHUNK_NAME_RE.search(name)
+    if not match:
+        return (None, None)
+    x = int(match.group(2)) * (-1 if match.group(1) else 1)
+    y = int(match.group(4)) * (-1 if match.group(3) else 1)
+    return (x, y)
+
+
+def chunk_name(x: int, y: int) -> str:
+    """Chunk file stem for signed coordinates: (-25, 26) -> 'chunk_n25_26'."""
+    fx = f"n{abs(x)}" if x < 0 else str(x)
+    fy = f"n{abs(y)}" if y < 0 else str(y)
+    return f"chunk_{fx}_{fy}"
+
+
+def local_to_world(chunk_x, chunk_y, local_x, local_y):
+    """Chunk-relative (center origin) position -> world X/Y. Works on arrays."""
+    return (
+        np.asarray(chunk_x) * CHUNK_SIZE + np.asarray(local_x),
+        np.asarray(chunk_y) * CHUNK_SIZE + np.asarray(local_y),
+    )
+
+
+class WorldHeightfieldWriter:
+    """
+    Append chunk heightmaps to a world heightfield (tile file + JSON index).
+
+    Tiles are written to a temporary file and moved into place on close(), so
+    readers never see a half-written heightfield. With reuse_existing=True, the
+    previous heightfield at the same path (if its scales match) stays readable so
+    unchanged chunks can be copied over with copy_existing() instead of re-decoded.
+    """
+
+    def __init__(self, path_prefix: str, height_scale: float, grid_size: int = GRID_SIZE,
+                 reuse_existing: bool = False):
+        self.path_prefix = path_prefix
+        self.height_scale = height_scale
+        self.grid_size = grid_size
+        self.chunks: Dict[str, Dict] = {}
+        self.previous: Optional["WorldHeightfield"] = None
+        if reuse_existing and os.path.exists(f"{path_prefix}.json") and os.path.exists(f"{path_prefix}.f32"):
+            previous = WorldHeightfield(path_prefix)
+            if previous.index.get("height_scale") == height_scale and previous.grid_size == grid_size:
+                self.previous = previous
+        os.makedirs(os.path.dirname(path_prefix) or ".", exist_ok=True)
+        self._tmp_path = f"{path_prefix}.f32.tmp"
+        self._file = open(self._tmp_path, "wb")
+
+    def add(self, name: str, heights: np.ndarray):
+        """Add one chunk's corrected heightmap (raw G16 units, [row, col] like the glTF)."""
+        x, y = parse_chunk_coords(name)
+        if x is None or name in self.chunks:
+            return
+        if heights.shape != (self.grid_size, self.grid_size):
+            raise ValueError(f"{name}: expected {self.grid_size}x{self.grid_size} heightmap, got {heights.shape}")
+        self._write_tile(name, x, y, (heights * self.height_scale).astype("<f4"))
+
+    def copy_existing(self, name: str) -> bool:
+        """Copy a chunk's tile from the previous heightfield; False if it has none."""
+        if name in self.chunks:
+            return True
+        tile = self.previous.chunk_heights(name) if self.previous is not None else None
+        if tile is None:
+            return False
+        x, y = parse_chunk_coords(name)
+        self._write_tile(name, x, y, np.asarray(tile, dtype="<f4"))
+        return True
+
+    def _write_tile(self, name: str, x: int, y: int, tile: np.ndarray):
+        self.chunks[name] = {"slot": len(self.chunks), "x": x, "y": y}
+        self._file.write(tile.tobytes())
+
+    def close(self):
+        """Finish the tile file and write the index."""
+        self._file.close()
+        os.replace(self._tmp_path, f"{self.path_prefix}.f32")
+        index = {
+            "version": 1,
+            "grid_size": self.grid_size,
+            "chunk_size": CHUNK_SIZE,
+            "terrain_scale": CHUNK_SIZE / self.grid_size,
+            "height_scale": self.height_scale,
+            "dtype": "<f4",
+            "chunks": self.chunks,
+        }
+        with open(f"{self.path_prefix}.json.tmp", "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(f"{self.path_prefix}.json.tmp", f"{self.path_prefix}.json")
+        return len(self.chunks)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._tmp_path)
+
+
+class WorldHeightfield:
+    """Read-only, memory-mapped world heightfield with batched bilinear queries."""
+
+    def __init__(self, path_prefix: str):
+        with open(f"{path_prefix}.json") as f:
+            self.index = json.load(f)
+        self.grid_size = self.index["grid_size"]
+        self.terrain_scale = self.index["terrain_scale"]
+        self.chunk_size = self.index["chunk_size"]
+        chunks = self.index["chunks"]
+
+        n = len(chunks)
+        self.tiles = np.memmap(
+            f"{path_prefix}.f32", dtype=self.index["dtype"], mode="r",
+            shape=(n, self.grid_size, self.grid_size)
+        ) if n else np.zeros((0, self.grid_size, self.grid_size), dtype=np.float32)
+
+        # Dense chunk -> slot lookup (-1 = no terrain)
+        xs = [c["x"] for c in chunks.values()] or [0]
+        ys = [c["y"] for c in chunks.values()] or [0]
+        self.x0, self.y0 = min(xs), min(ys)
+        self.slots = np.full((max(ys) - self.y0 + 1, max(xs) - self.x0 + 1), -1, dtype=np.int32)
+        for c in chunks.values():
+            self.slots[c["y"] - self.y0, c["x"] - self.x0] = c["slot"]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index["chunks"]
+
+    def _samples(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Heights at integer global sample coordinates (NaN outside loaded chunks)."""
+        g = self.grid_size
+        cx = np.floor_divide(cols, g) - self.x0
+        cy = np.floor_divide(rows, g) - self.y0
+        inside = (cx >= 0) & (cy >= 0) & (cx < self.slots.shape[1]) & (cy < self.slots.shape[0])
+        slot = np.full(rows.shape, -1, dtype=np.int64)
+        slot[inside] = self.slots[cy[inside], cx[inside]]
+        valid = slot >= 0
+        out = np.full(rows.shape, np.nan, dtype=np.float64)
+        out[valid] = self.tiles[slot[valid], rows[valid] % g, cols[valid] % g]
+        return out
+
+    def heights_at(self, world_x, world_y) -> np.ndarray:
+        """
+        Bilinear terrain height (world Z) at world X/Y. Accepts scalars or arrays.
+
+        Queries that straddle a chunk seam interpolate across both chunks; points
+        over (or next to) a chunk without terrain return NaN.
+        """
+        world_x = np.asarray(world_x, dtype=np.float64)
+        world_y = np.asarray(world_y, dtype=np.float64)
+        half = self.chunk_size / 2
+        gc = (world_x + half) / self.terrain_scale
+        gr = (world_y + half) / self.terrain_scale
+        c0 = np.floor(gc).astype(np.int64)
+        r0 = np.floor(gr).astype(np.int64)
+        fc = gc - c0
+        fr = gr - r0
+
+        h00 = self._samples(r0, c0)
+        h01 = self._samples(r0, c0 + 1)
+        h10 = self._samples(r0 + 1, c0)
+        h11 = self._samples(r0 + 1, c0 + 1)
+        top = h00 * (1 - fc) + h01 * fc
+        bottom = h10 * (1 - fc) + h11 * fc
+        return top * (1 - fr) + bottom * fr
+
+    def height_at(self, world_x: float, world_y: float) -> float:
+        """Scalar convenience wrapper around heights_at()."""
+        return float(self.heights_at(world_x, world_y))
+
+    def heights_at_local(self, chunk_x, chunk_y, local_x, local_y) -> np.ndarray:
+        """Heights for chunk-relative positions (e.g. exports.position_x/y)."""
+        return self.heights_at(*local_to_world(chunk_x, chunk_y, local_x, local_y))
+
+    def chunk_heights(self, name: str) -> Optional[np.ndarray]:
+        """The stored 512x512 tile for one chunk (world Z units), or None."""
+        entry = self.index["chunks"].get(name)
+        return None if entry is None else self.tiles[entry["slot"]]
+
+
+def build_world_heightfield(path_prefix: str, chunk_heights: Iterable[Tuple[str, np.ndarray]],
+                            height_scale: float) -> int:
+    """Write a world heightfield from (chunk_name, heights) pairs; returns the chunk count."""
+    with WorldHeightfieldWriter(path_prefix, height_scale) as writer:
+        for name, heights in chunk_heights:
+            writer.add(name, heights)
+    return len(writer.chunks)
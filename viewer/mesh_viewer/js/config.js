@@ -1,8 +1,10 @@
 export const CONFIG = {
+    apiBase: window.location.protocol.startsWith('http') ? `${window.location.origin}/api` : 'http://localhost:8000/api',
     defaultChunk: 'chunk_n25_26',
     meshPath: '../output/meshes/buildings/',
     terrainPath: '../output/terrain/terrain_grid/',
     flySpeed: 50000,
+    cameraFov: 60,
     cameraFar: 500000,
     gridSize: 200000,
 };
@@ -11,7 +11,7 @@ export function init() {
     state.scene.background = new THREE.Color(0x1a1a2e);
 
     // Camera
-    state.camera = new THREE.PerspectiveCamera(60, window.innerWidth / window.innerHeight, 1, CONFIG.cameraFar);
+    state.camera = new THREE.PerspectiveCamera(CONFIG.cameraFov, window.innerWidth / window.innerHeight, 1, CONFIG.cameraFar);
     state.camera.position.set(200, 200, 200);
 
     // Renderer
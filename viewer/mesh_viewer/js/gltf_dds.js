@@ -0,0 +1,46 @@
+import { DDSLoader } from 'three/addons/loaders/DDSLoader.js';
+
+/**
+ * GLTFLoader plugin for MSFT_texture_dds.
+ *
+ * Terrain glTFs written with --texture-format dds reference the original DXT
+ * blocks and mip chain as a .dds image, so the GPU gets compressed data with no
+ * decode. Falls back to the PNG `source` when S3TC isn't available.
+ */
+
+let s3tcSupported = null;
+
+function hasS3TC() {
+    if (s3tcSupported === null) {
+        const gl = document.createElement('canvas').getContext('webgl2');
+        s3tcSupported = !!(gl && gl.getExtension('WEBGL_compressed_texture_s3tc'));
+    }
+    return s3tcSupported;
+}
+
+export class GLTFTextureDDSExtension {
+    constructor(parser) {
+        this.parser = parser;
+        this.name = 'MSFT_texture_dds';
+        this.ddsLoader = new DDSLoader(parser.options.manager);
+    }
+
+    loadTexture(textureIndex) {
+        const json = this.parser.json;
+        const textureDef = json.textures[textureIndex];
+
+        if (!textureDef.extensions || !textureDef.extensions[this.name]) {
+            return null;
+        }
+
+        if (!hasS3TC()) {
+            if (json.extensionsRequired && json.extensionsRequired.indexOf(this.name) >= 0) {
+                throw new Error('MSFT_texture_dds: S3TC is not supported and the asset has no PNG fallback');
+            }
+            return null; // Use the PNG fallback in textureDef.source
+        }
+
+        const extension = textureDef.extensions[this.name];
+        return this.parser.loadTextureImage(textureIndex, extension.source, this.ddsLoader);
+    }
+}
@@ -0,0 +1,52 @@
+import * as THREE from 'three';
+import { CONFIG } from './config.js';
+
+/**
+ * GLTFLoader plugin for MSFT_lod.
+ *
+ * Mesh glTFs from staticmesh_pipeline.py hold every LOD of a mesh: the scene
+ * references the LOD 0 node, which lists the lower LOD nodes in MSFT_lod.ids and
+ * their hand-over points in extras.MSFT_screencoverage. The LOD 0 node is replaced
+ * by a THREE.LOD so distant instances render the cheap geometry.
+ */
+
+export class GLTFMeshLodExtension {
+    constructor(parser) {
+        this.parser = parser;
+        this.name = 'MSFT_lod';
+    }
+
+    async afterRoot() {
+        const nodes = this.parser.json.nodes || [];
+        const pending = [];
+        nodes.forEach((nodeDef, nodeIndex) => {
+            if (nodeDef.extensions && nodeDef.extensions[this.name]) {
+                pending.push(this.buildLod(nodeIndex, nodeDef));
+            }
+        });
+        await Promise.all(pending);
+    }
+
+    async buildLod(nodeIndex, nodeDef) {
+        const ids = nodeDef.extensions[this.name].ids || [];
+        const coverage = (nodeDef.extras && nodeDef.extras.MSFT_screencoverage) || [];
+        const levels = await Promise.all(
+            [nodeIndex, ...ids].map(index => this.parser.getDependency('node', index))
+        );
+        const root = levels[0];
+        if (!root.parent) return;
+
+        // Screen-height coverage -> camera distance, using LOD 0's bounding sphere
+        const radius = new THREE.Box3().setFromObject(root).getBoundingSphere(new THREE.Sphere()).radius;
+        const tanHalfFov = Math.tan(THREE.MathUtils.degToRad(CONFIG.cameraFov) / 2);
+
+        const lod = new THREE.LOD();
+        lod.name = root.name;
+        root.parent.add(lod);
+        levels.forEach((level, i) => {
+            // LOD i takes over once coverage drops below coverage[i - 1]
+            const threshold = i > 0 ? coverage[i - 1] : 0;
+            lod.addLevel(level, threshold > 0 ? radius / (threshold * tanHalfFov) : 0);
+        });
+    }
+}
@@ -1,7 +1,7 @@
 import * as THREE from 'three';
 import { state } from './state.js';
 import { CONFIG } from './config.js';
-import { updateStats, updateChunkListUI, applyMeshFilters } from './ui.js';
+import { updateStats, updateChunkListUI, applyMeshFilters, loadTerrainChunks } from './ui.js';
 
 export function loadModel(fileOrUrl, isUrl = false) {
     const loading = document.getElementById('loading');
@@ -56,51 +56,67 @@ export function loadModel(fileOrUrl, isUrl = false) {
     }
 }
 
-// Resolve mesh_ref from objects.gltf and load actual mesh
-export async function resolveAndLoadMesh(node) {
-    const meshRef = node.userData.mesh_ref;
-    if (!meshRef || state.deletedMeshNames.has(meshRef)) return;
+// Mesh name -> glTF URL as recorded by staticmesh_pipeline.py in mesh_aliases.
+// Each glTF holds all LODs of its mesh (MSFT_lod), so there are no per-LOD files to pick.
+function loadMeshAssets() {
+    if (!state.meshAssets) {
+        state.meshAssets = fetch(`${CONFIG.apiBase}/mesh_assets`)
+            .then(res => (res.ok ? res.json() : []))
+            .catch(() => [])
+            .then(rows => {
+                const assets = new Map();
+                for (const row of rows) {
+                    const key = row.mesh.toLowerCase();
+                    if (!assets.has(key)) assets.set(key, row.url); // First package wins, as in meshList order
+                }
+                return assets;
+            });
+    }
+    return state.meshAssets;
+}
 
-    // Find best match in meshList
-    // Manifest contains paths like "PackageName/MeshName.gltf"
-    // mesh_ref is typically just "MeshName"
+// Resolve a mesh_ref to its glTF URL: mesh_aliases first, then meshList for
+// databases without mesh_aliases rows (e.g. --no-dedup or --export-only runs).
+// Returns null if the mesh wasn't exported.
+export async function resolveMeshUrl(meshRef) {
     const ref = meshRef.toLowerCase();
-    let bestMatch = null;
+    const assets = await loadMeshAssets();
+    if (assets.has(ref)) return assets.get(ref);
 
-    // 1. Look for mesh name at end of path (handles subdirectory structure)
-    bestMatch = state.meshList.find(m => {
-        const mLower = m.toLowerCase();
-        const fileName = mLower.split('/').pop().replace('.gltf', '');
-        return fileName === ref;
-    });
+    // Manifest contains paths like "PackageName/MeshName.gltf"
+    const fileName = m => m.toLowerCase().split('/').pop().replace('.gltf', '');
 
-    // 2. Try with LOD suffixes
-    if (!bestMatch) {
-        const lodSuffixes = ['_L0', '_L1', '_L2', '_ver01'];
-        for (const suffix of lodSuffixes) {
-            const candidate = ref + suffix.toLowerCase();
-            bestMatch = state.meshList.find(m => {
-                const mLower = m.toLowerCase();
-                const fileName = mLower.split('/').pop().replace('.gltf', '');
-                return fileName === candidate;
-            });
-            if (bestMatch) break;
-        }
+    // 1. Mesh name at end of path (handles subdirectory structure)
+    let match = state.meshList.find(m => fileName(m) === ref);
+
+    // 2. _ver01 variant export of the same mesh (not a LOD: LODs live inside
+    //    one glTF via MSFT_lod, so no _L0/_L1/_L2 files are probed)
+    if (!match) {
+        match = state.meshList.find(m => fileName(m) === ref + '_ver01');
     }
 
     // 3. Fuzzy match - mesh name contained in the full path
-    if (!bestMatch) {
-        bestMatch = state.meshList.find(m => m.toLowerCase().includes('/' + ref + '.gltf'));
+    if (!match) {
+        match = state.meshList.find(m => m.toLowerCase().includes('/' + ref + '.gltf'));
     }
 
-    if (!bestMatch) {
-        // No match found, can't resolve
+    return match ? CONFIG.meshPath + match : null;
+}
+
+// Resolve mesh_ref from objects.gltf and load actual mesh
+export async function resolveAndLoadMesh(node) {
+    const meshRef = node.userData.mesh_ref;
+    if (!meshRef || state.deletedMeshNames.has(meshRef)) return;
+
+    const path = await resolveMeshUrl(meshRef);
+    if (!path) {
+        // Not exported, can't resolve
         return;
     }
 
     // Check cache - add as child of the node (not to scene directly)
-    if (state.meshCache.has(bestMatch)) {
-        const cached = state.meshCache.get(bestMatch);
+    if (state.meshCache.has(path)) {
+        const cached = state.meshCache.get(path);
         const instance = cached.clone();
 
         // Reset position relative to parent actor node
@@ -124,17 +140,16 @@ export async function resolveAndLoadMesh(node) {
 
 
     // Load the mesh
-    const path = CONFIG.meshPath + bestMatch;
     try {
         const res = await fetch(path, { method: 'HEAD' });
         if (!res.ok) return;
 
         state.gltfLoader.load(path, (gltf) => {
             const meshModel = gltf.scene;
-            meshModel.name = bestMatch;
+            meshModel.name = path;
 
             // Cache the original model
-            state.meshCache.set(bestMatch, meshModel.clone());
+            state.meshCache.set(path, meshModel.clone());
 
             // Reset position relative to parent actor node
             meshModel.position.set(0, 0, 0);
@@ -154,9 +169,9 @@ export async function resolveAndLoadMesh(node) {
             state.loadedModels.push(meshModel);
             updateStats();
 
-            console.log(`Resolved mesh: ${meshRef} -> ${bestMatch}`);
+            console.log(`Resolved mesh: ${meshRef} -> ${path}`);
         }, undefined, (err) => {
-            console.warn(`Failed to parse glTF for ${bestMatch}:`, err);
+            console.warn(`Failed to parse glTF for ${path}:`, err);
         });
     } catch (e) {
         console.warn(`Failed to fetch mesh: ${meshRef}`);
@@ -197,14 +212,9 @@ export async function loadChunkMeshes() {
     for (const meshRef of state.chunkMeshRefs) {
         if (loading) loading.textContent = `Loading chunk meshes... ${loaded}/${total}`;
 
-        // Find matching mesh in meshList
-        const match = state.meshList.find(m => {
-            const fileName = m.split('/').pop().replace('.gltf', '').toLowerCase();
-            return fileName === meshRef;
-        });
-
-        if (match) {
-            await loadMeshAsync(match);
+        const url = await resolveMeshUrl(meshRef);
+        if (url) {
+            await loadMeshAsync(url);
             loaded++;
         }
     }
@@ -213,13 +223,12 @@ export async function loadChunkMeshes() {
     console.log(`Loaded ${loaded} chunk meshes`);
 }
 
-// Helper for async mesh loading
-async function loadMeshAsync(meshPath) {
+// Helper for async mesh loading (url from resolveMeshUrl)
+async function loadMeshAsync(url) {
     return new Promise((resolve) => {
-        const path = CONFIG.meshPath + meshPath;
-        state.gltfLoader.load(path, (gltf) => {
+        state.gltfLoader.load(url, (gltf) => {
             const model = gltf.scene;
-            model.name = meshPath;
+            model.name = url.split('/').pop().replace('.gltf', '');
 
             model.traverse((child) => {
                 if (child.isMesh && child.material) {
@@ -242,6 +251,51 @@ async function loadMeshAsync(meshPath) {
     });
 }
 
+// Chunk terrain from its /api/terrain_chunks record: the full mesh and its LOD
+// pyramid as one THREE.LOD. A LOD of size s takes over below 0.5 * s / grid_size
+// of the screen height, the triangle-count rule MSFT_lod uses for StaticMeshes.
+async function loadTerrainLod(record, timestamp) {
+    const sizes = Object.keys(record.lods || {}).map(Number).sort((a, b) => b - a);
+    const urls = [record.full, ...sizes.map(size => record.lods[size])];
+    let scenes;
+    try {
+        const levels = await Promise.all(urls.map(url => state.gltfLoader.loadAsync(`${url}?t=${timestamp}`)));
+        scenes = levels.map(gltf => gltf.scene);
+    } catch (error) {
+        console.error(`Error loading terrain for ${record.chunk}:`, error);
+        return;
+    }
+
+    scenes.forEach(scene => scene.traverse((child) => {
+        if (child.isMesh && child.material) {
+            const mats = Array.isArray(child.material) ? child.material : [child.material];
+            mats.forEach((mat) => {
+                mat.side = THREE.DoubleSide;
+                mat.wireframe = state.wireframeMode;
+            });
+        }
+    }));
+
+    // THREE.LOD measures camera distance from its own origin, so centre it on the chunk
+    const sphere = new THREE.Box3().setFromObject(scenes[0]).getBoundingSphere(new THREE.Sphere());
+    const tanHalfFov = Math.tan(THREE.MathUtils.degToRad(CONFIG.cameraFov) / 2);
+    const gridSize = record.grid_size || 512;
+
+    const lod = new THREE.LOD();
+    lod.name = `${record.chunk}_terrain`;
+    lod.position.copy(sphere.center);
+    scenes.forEach((scene, i) => {
+        scene.position.sub(sphere.center);
+        const coverage = i > 0 ? 0.5 * sizes[i - 1] / gridSize : 0;
+        lod.addLevel(scene, coverage > 0 ? sphere.radius / (coverage * tanHalfFov) : 0);
+    });
+
+    if (state.scene) state.scene.add(lod);
+    state.loadedModels.push(lod);
+    updateStats();
+    console.log(`Loaded: ${lod.name} (${scenes.length} levels)`);
+}
+
 export async function loadChunk(chunkName) {
     const loading = document.getElementById('loading');
     if (loading) {
@@ -276,9 +330,12 @@ export async function loadChunk(chunkName) {
         console.warn('Failed to extract mesh refs:', e);
     }
 
-    // Load terrain and objects
+    // Load terrain (LOD pyramid when the database has the chunk) and objects
+    const terrainRecord = (await loadTerrainChunks()).get(chunkName);
+    if (terrainRecord) await loadTerrainLod(terrainRecord, timestamp);
+
     const defaultFiles = [
-        `${CONFIG.terrainPath}${chunkName}_terrain.gltf?t=${timestamp}`,
+        ...(terrainRecord ? [] : [`${CONFIG.terrainPath}${chunkName}_terrain.gltf?t=${timestamp}`]),
         objectsUrl,
     ];
 
@@ -328,8 +385,11 @@ export async function loadDefaults() {
         console.warn('Failed to extract mesh refs:', e);
     }
 
+    const terrainRecord = (await loadTerrainChunks()).get(CONFIG.defaultChunk);
+    if (terrainRecord) await loadTerrainLod(terrainRecord, timestamp);
+
     const defaultFiles = [
-        `${CONFIG.terrainPath}${CONFIG.defaultChunk}_terrain.gltf?t=${timestamp}`,
+        ...(terrainRecord ? [] : [`${CONFIG.terrainPath}${CONFIG.defaultChunk}_terrain.gltf?t=${timestamp}`]),
         `${CONFIG.terrainPath}${CONFIG.defaultChunk}_bsp.gltf?t=${timestamp}`,
         objectsUrl,
     ];
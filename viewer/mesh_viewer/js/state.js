@@ -1,5 +1,11 @@
 import * as THREE from 'three';
 import { GLTFLoader } from 'three/addons/loaders/GLTFLoader.js';
+import { GLTFTextureDDSExtension } from './gltf_dds.js';
+import { GLTFMeshLodExtension } from './gltf_lod.js';
+
+// Mesh glTFs share content-addressed buffers (output/meshes/by_hash), so identical
+// geometry referenced from different packages is fetched once per session
+THREE.Cache.enabled = true;
 
 export const state = {
     // Three.js Core
@@ -34,6 +40,8 @@ export const state = {
 
     // Caches & Sets
     meshCache: new Map(),
+    meshAssets: null, // Promise of Map: lowercase mesh name -> glTF URL (/api/mesh_assets)
+    terrainChunks: null, // Promise of Map: chunk name -> /api/terrain_chunks record (full + LOD URLs)
     deletedMeshNames: new Set(),
     chunkMeshRefs: new Set(),
 
@@ -42,4 +50,6 @@ export const state = {
 
     // Loaders
     gltfLoader: new GLTFLoader()
+        .register(parser => new GLTFTextureDDSExtension(parser))
+        .register(parser => new GLTFMeshLodExtension(parser))
 };
@@ -58,25 +58,40 @@ export async function loadMeshList() {
     }
 }
 
+// Exported terrain chunks as recorded by extract_all_terrain.py in terrain_chunks
+// (empty Map without the data server, or before the terrain stage has run)
+export function loadTerrainChunks() {
+    if (!state.terrainChunks) {
+        state.terrainChunks = fetch(`${CONFIG.apiBase}/terrain_chunks`)
+            .then(res => (res.ok ? res.json() : []))
+            .catch(() => [])
+            .then(rows => new Map(rows.filter(row => row.full).map(row => [row.chunk, row])));
+    }
+    return state.terrainChunks;
+}
+
 export async function loadChunkList() {
     try {
-        const response = await fetch(CONFIG.terrainPath);
-        if (response.ok) {
+        let chunks = [...(await loadTerrainChunks()).keys()];
+        if (chunks.length === 0) {
+            // No terrain_chunks rows: fall back to the directory listing
+            const response = await fetch(CONFIG.terrainPath);
+            if (!response.ok) return;
             const html = await response.text();
             // Match terrain.gltf files to get chunk names
             const matches = html.match(/href="([^"]+_terrain\.gltf)"/g) || [];
-            const chunks = matches.map(m => {
+            chunks = matches.map(m => {
                 const file = m.match(/href="([^"]+)"/)[1];
                 return file.replace('_terrain.gltf', '');
             });
-            state.chunkList = [...new Set(chunks)].sort();
-            state.filteredChunkList = [...state.chunkList];
+        }
+        state.chunkList = [...new Set(chunks)].sort();
+        state.filteredChunkList = [...state.chunkList];
 
-            const countEl = document.getElementById('chunk-count');
-            if (countEl) countEl.textContent = state.chunkList.length;
+        const countEl = document.getElementById('chunk-count');
+        if (countEl) countEl.textContent = state.chunkList.length;
 
-            updateChunkListUI();
-        }
+        updateChunkListUI();
     } catch (error) {
         console.error('Failed to load chunk list:', error);
     }
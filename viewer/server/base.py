@@ -26,6 +26,9 @@ from .handlers import (
     handle_parse_status,
     handle_class_coverage,
     handle_parsed_exports,
+    handle_unknown_region,
+    handle_terrain_chunks,
+    handle_mesh_assets,
 )
 from .utils import send_json, send_error_json, get_db
 
@@ -71,10 +74,16 @@ class DataHandler(http.server.SimpleHTTPRequestHandler):
                 handle_class_coverage(self)
             elif parsed.path == "/api/parsed_exports":
                 handle_parsed_exports(self, parsed.query)
+            elif parsed.path == "/api/unknown_region":
+                handle_unknown_region(self, parsed.query)
             elif parsed.path == "/api/table_data":
                 handle_table_data(self, parsed.query)
             elif parsed.path == "/api/table_counts":
                 handle_table_counts(self)
+            elif parsed.path == "/api/terrain_chunks":
+                handle_terrain_chunks(self)
+            elif parsed.path == "/api/mesh_assets":
+                handle_mesh_assets(self)
             else:
                 super().do_GET()
         except Exception as e:
@@ -29,4 +29,13 @@ from .parsing import (
     handle_parse_status,
     handle_class_coverage,
     handle_parsed_exports,
+    handle_unknown_region,
+)
+
+from .terrain import (
+    handle_terrain_chunks,
+)
+
+from .meshes import (
+    handle_mesh_assets,
 )
@@ -0,0 +1,37 @@
+"""
+Mesh API handlers.
+"""
+
+from ..utils import send_json, get_db, asset_url
+
+
+def handle_mesh_assets(handler):
+    """
+    Exported StaticMesh glTFs by mesh name, from mesh_aliases. Each glTF holds
+    every LOD of its mesh (MSFT_lod), so the viewer loads this URL rather than
+    guessing per-LOD file names.
+    """
+    conn = get_db()
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mesh_aliases'").fetchone():
+        conn.close()
+        send_json(handler, [])
+        return
+    cursor = conn.execute("""
+        SELECT package, mesh_name, gltf_path, COUNT(*) AS lod_count
+        FROM mesh_aliases
+        WHERE gltf_path IS NOT NULL
+        GROUP BY package, mesh_name, gltf_path
+        ORDER BY package, mesh_name
+    """)
+    rows = []
+    for row in cursor.fetchall():
+        url = asset_url(row["gltf_path"])
+        if url:
+            rows.append({
+                "mesh": row["mesh_name"],
+                "package": row["package"],
+                "url": url,
+                "lod_count": row["lod_count"],
+            })
+    conn.close()
+    send_json(handler, rows)
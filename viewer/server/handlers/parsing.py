@@ -5,7 +5,7 @@ Parsing status and coverage API handlers.
 import sqlite3
 import os
 import urllib.parse
-from ..utils import send_json, send_error_json
+from ..utils import send_json, send_error_json, get_db
 
 
 # Alternative canonical DB path for parsing metrics
@@ -146,3 +146,53 @@ def handle_parsed_exports(handler, query_string):
         send_json(handler, {"status": "ok", "data": result, "count": len(result)})
     except Exception as e:
         send_error_json(handler, f"Error getting parsed exports: {e}")
+
+
+def handle_unknown_region(handler, query_string):
+    """
+    Return one unknown region with its bytes as hex, materialized on demand from the
+    stored zlib BLOB or the source package. ?id=<region id>&max_bytes=<cap, default 65536>.
+    """
+    from lib import region_store
+    try:
+        from config import ASSETS_PATH
+    except ImportError:
+        ASSETS_PATH = ""
+
+    params = urllib.parse.parse_qs(query_string)
+    try:
+        region_id = int(params.get("id", [""])[0])
+        max_bytes = int(params.get("max_bytes", [65536])[0])
+    except ValueError:
+        send_error_json(handler, "Region 'id' (and 'max_bytes') must be integers")
+        return
+
+    conn = get_db()
+    try:
+        row = conn.execute("""
+            SELECT r.id, r.parsed_export_id, r.context, r.offset_start, r.offset_end,
+                   r.abs_offset, r.size, f.file_path
+            FROM unknown_regions r
+            LEFT JOIN files f ON f.id = r.file_id
+            WHERE r.id = ?
+        """, (region_id,)).fetchone()
+        if row is None:
+            send_error_json(handler, f"Unknown region {region_id} not found", 404)
+            return
+        data, source = region_store.region_bytes(conn, region_id, ASSETS_PATH)
+    except Exception as e:
+        send_error_json(handler, f"Error reading region {region_id}: {e}")
+        return
+    finally:
+        conn.close()
+
+    send_json(handler, {
+        "status": "ok",
+        "data": {
+            **dict(row),
+            "size": len(data),
+            "source": source,
+            "truncated": len(data) > max_bytes,
+            "hex": data[:max_bytes].hex(),
+        },
+    })
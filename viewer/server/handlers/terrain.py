@@ -0,0 +1,44 @@
+"""
+Terrain API handlers.
+"""
+
+import json
+import re
+from ..utils import send_json, get_db, asset_url
+
+
+CHUNK_NAME_RE = re.compile(r"chunk_(n?\d+)_(n?\d+)")
+
+
+def _chunk_coord(token):
+    """Decode a chunk filename coordinate ('n25' -> -25)."""
+    return -int(token[1:]) if token.startswith("n") else int(token)
+
+
+def handle_terrain_chunks(handler):
+    """Get exported terrain chunks with their LOD asset URLs, for streaming in the viewer."""
+    conn = get_db()
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(terrain_chunks)")}
+    lod_column = "t.lod_paths" if "lod_paths" in columns else "NULL"
+    cursor = conn.execute(f"""
+        SELECT c.filename, t.grid_size, t.export_path, {lod_column} as lod_paths
+        FROM terrain_chunks t
+        JOIN chunks c ON c.id = t.chunk_id
+        WHERE t.gltf_exported = 1
+        ORDER BY c.filename
+    """)
+    rows = []
+    for row in cursor.fetchall():
+        chunk_name = row["filename"].replace(".vgr", "")
+        match = CHUNK_NAME_RE.match(chunk_name)
+        lods = json.loads(row["lod_paths"]) if row["lod_paths"] else {}
+        rows.append({
+            "chunk": chunk_name,
+            "x": _chunk_coord(match.group(1)) if match else None,
+            "y": _chunk_coord(match.group(2)) if match else None,
+            "grid_size": row["grid_size"],
+            "full": asset_url(row["export_path"]),
+            "lods": {size: asset_url(path) for size, path in lods.items()},
+        })
+    conn.close()
+    send_json(handler, rows)
@@ -31,6 +31,17 @@ def send_error_json(handler, message, status_code=400):
     handler.wfile.write(json.dumps({"error": message}).encode())
 
 
+def asset_url(path):
+    """Map an output file path to the /output/ URL served by DataHandler (None outside the project)."""
+    if not path:
+        return None
+    from . import PROJECT_ROOT
+    rel_path = os.path.relpath(os.path.abspath(path), PROJECT_ROOT)
+    if rel_path.startswith(".."):
+        return None
+    return "/" + rel_path.replace(os.sep, "/")
+
+
 def get_db():
     """Get database connection with Row factory."""
     conn = sqlite3.connect(DB_PATH)